@@ -1,15 +1,25 @@
-from flask import Flask, render_template, redirect, url_for, jsonify, request, flash
+from flask import Flask, render_template, redirect, url_for, jsonify, request, flash, g, stream_with_context
 import os
 import json
+import array
 import sqlite3
-import subprocess
 import glob
 import csv
 import io
-import uuid
 import datetime
+import hashlib
+import time
+from itertools import islice
 from werkzeug.utils import secure_filename
 from dotenv import load_dotenv
+from financial_db import DB_PATH, ConnectionPool, init_schema, normalize_symbol, get_data_version, bump_data_version, get_row_count
+from response_cache import VersionedCache
+from standardization_service import standardize_records_frame, insert_standardized_frame
+from job_queue import PipelineJobQueue
+from raw_archive import get_archive, archive_records
+from json_stream import iter_json_file
+import main_pipeline
+from response_streaming import negotiate_encoding, compress_stream, pack_float64, pack_int32, iter_base64
 
 # Load environment variables from .env file
 load_dotenv()
@@ -23,6 +33,74 @@ ALLOWED_EXTENSIONS = {'csv', 'json', 'xlsx', 'xls'}
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 
+# Verify the pipeline tables once at startup instead of on every request
+init_schema(DB_PATH)
+
+# Connections are reused across requests; size the pool to the server's thread count
+db_pool = ConnectionPool(DB_PATH, max_size=int(os.getenv("DB_POOL_SIZE", 8)))
+
+def get_db():
+    """
+    Get the database connection for the current request, taking it from the pool on first use.
+    
+    Returns:
+        sqlite3 connection with sqlite3.Row rows, returned to the pool at the end of the request
+    """
+    if 'db' not in g:
+        g.db = db_pool.acquire()
+    return g.db
+
+@app.teardown_appcontext
+def release_db(exception):
+    """
+    Return the request's database connection to the pool, if one was taken.
+    """
+    db = g.pop('db', None)
+    if db is not None:
+        db_pool.release(db)
+
+# Pipeline runs execute on a bounded worker pool in the process that queued them; job
+# state is kept in the database, so any server process can answer status polls
+pipeline_jobs = PipelineJobQueue(main_pipeline.run_pipeline, DB_PATH,
+                                 max_workers=int(os.getenv("PIPELINE_WORKERS", 2)))
+
+# Serialized chart responses, invalidated whenever the data version is bumped
+chart_data_cache = VersionedCache(max_entries=64)
+
+# pipeline_runs_history columns shown in run listings
+RUN_SUMMARY_COLUMNS = ['run_id', 'timestamp', 'status', 'run_type', 'symbol', 'data_type', 'records_processed',
+                       'duration_seconds', 'rows_per_second', 'error_count', 'error', 'source_bytes']
+
+def cached_json_response(cache, key, build_payload):
+    """
+    Serve a JSON payload from a versioned cache, with ETag/If-None-Match support.
+    
+    Args:
+        cache: VersionedCache holding serialized payloads
+        key: Cache key identifying the request (e.g. the query parameters)
+        build_payload: Function returning the payload dictionary on a cache miss
+        
+    Returns:
+        Flask response: 304 if the client's copy is current, otherwise the JSON payload
+    """
+    # Read the version before building so a concurrent write can only make us miss later
+    version = get_data_version(DB_PATH)
+    etag = hashlib.sha1(f"{version}:{key!r}".encode()).hexdigest()
+    
+    if etag in request.if_none_match:
+        response = app.response_class(status=304)
+    else:
+        payload = cache.get(key, version)
+        if payload is None:
+            payload = json.dumps(build_payload())
+            cache.set(key, version, payload)
+        response = app.response_class(payload, mimetype='application/json')
+    
+    # Let browsers keep the response but revalidate it on every load
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
 @app.route('/favicon.ico')
 def favicon():
     return app.send_static_file('favicon.ico')
@@ -90,7 +168,9 @@ def dashboard():
 
 def get_raw_data_sample(num_records=3):
     """
-    Get a sample of raw data from the most recent file in raw_data directory.
+    Get a sample of raw data from the most recently archived run.
+    
+    Falls back to the newest legacy JSON file in raw_data/ when the archive is empty.
     
     Args:
         num_records: Number of records to retrieve
@@ -99,6 +179,11 @@ def get_raw_data_sample(num_records=3):
         JSON string of raw data sample
     """
     try:
+        # One indexed manifest read; the head sample is stored with the newest run
+        sample = get_archive().sample(num_records)
+        if sample:
+            return json.dumps(sample, indent=2)
+        
         # Find the most recent raw data file
         raw_data_files = glob.glob("raw_data/*.json")
         
@@ -108,12 +193,8 @@ def get_raw_data_sample(num_records=3):
         # Sort by modification time (newest first)
         latest_file = max(raw_data_files, key=os.path.getmtime)
         
-        # Read the file
-        with open(latest_file, 'r') as f:
-            data = json.load(f)
-        
-        # Get a sample (first few records)
-        sample = data[:min(num_records, len(data))]
+        # Decode just the first few records instead of the whole file
+        sample = list(islice(iter_json_file(latest_file), num_records))
         
         return json.dumps(sample, indent=2)
     except Exception as e:
@@ -130,17 +211,7 @@ def get_standardized_data_sample(num_records=3):
         JSON string of standardized data sample
     """
     try:
-        # Connect to the database
-        conn = sqlite3.connect('data.db')
-        conn.row_factory = sqlite3.Row  # This enables column access by name
-        cursor = conn.cursor()
-        
-        # Check if table exists
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='standardized_financial_data'")
-        table_exists = cursor.fetchone()
-        
-        if not table_exists:
-            return json.dumps([{"error": "Database table 'standardized_financial_data' does not exist"}], indent=2)
+        cursor = get_db().cursor()
         
         # Get the most recent records
         cursor.execute("""
@@ -153,7 +224,6 @@ def get_standardized_data_sample(num_records=3):
         # Convert to list of dictionaries
         rows = cursor.fetchall()
         result = [dict(row) for row in rows]
-        conn.close()
         
         return json.dumps(result, indent=2)
     except Exception as e:
@@ -170,30 +240,19 @@ def get_pipeline_run_history(limit=10):
         List of dictionaries containing pipeline run history
     """
     try:
-        # Connect to the database
-        conn = sqlite3.connect('data.db')
-        conn.row_factory = sqlite3.Row  # This enables column access by name
-        cursor = conn.cursor()
-        
-        # Check if table exists
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='pipeline_runs_history'")
-        table_exists = cursor.fetchone()
-        
-        if not table_exists:
-            return []
+        cursor = get_db().cursor()
         
-        # Get the most recent pipeline runs
-        cursor.execute("""
-            SELECT run_id, timestamp, status, records_processed
+        # Get the most recent pipeline runs (run_ids increase with time)
+        cursor.execute(f"""
+            SELECT {', '.join(RUN_SUMMARY_COLUMNS)}
             FROM pipeline_runs_history
-            ORDER BY timestamp DESC
+            ORDER BY run_id DESC
             LIMIT ?
         """, (limit,))
         
         # Convert to list of dictionaries
         rows = cursor.fetchall()
         result = [dict(row) for row in rows]
-        conn.close()
         
         return result
     except Exception as e:
@@ -203,7 +262,10 @@ def get_pipeline_run_history(limit=10):
 @app.route('/run_pipeline', methods=['POST'])
 def run_pipeline():
     """
-    Run the data pipeline as a separate process.
+    Queue a data pipeline run on the job queue.
+    
+    Identical (symbol, data_type) requests already queued or running are attached to the
+    existing job instead of starting another run.
     
     Receives:
         data_type: Type of financial data to fetch (e.g., "Historical Prices", "Income Statement")
@@ -223,16 +285,239 @@ def run_pipeline():
                 "message": "Missing API key. Please check your .env file."
             })
         
-        # Start the pipeline as a non-blocking subprocess, passing data_type and symbol as arguments
-        process = subprocess.Popen(['python', 'main_pipeline.py', '--data_type', data_type, '--symbol', symbol])
+        # Queue the run (or attach to an identical one already in flight)
+        job, deduplicated = pipeline_jobs.submit(symbol, data_type)
+        
+        if deduplicated:
+            message = f"Pipeline already {job['status']} for {symbol} with data type: {data_type}"
+        else:
+            message = f"Pipeline started successfully for {symbol} with data type: {data_type}"
+        
         return jsonify({
             "status": "success",
-            "message": f"Pipeline started successfully for {symbol} with data type: {data_type}",
-            "pid": process.pid
+            "message": message,
+            "job_id": job["job_id"],
+            "job_status": job["status"],
+            "deduplicated": deduplicated,
+            "status_url": url_for('get_job_status', job_id=job["job_id"])
         })
     except Exception as e:
         return jsonify({"status": "error", "message": f"Failed to start pipeline: {str(e)}"})
 
+@app.route('/api/jobs/<job_id>')
+def get_job_status(job_id):
+    """
+    Get the status and timings of a pipeline job.
+    
+    Args:
+        job_id: ID returned by /run_pipeline
+        
+    Returns:
+        JSON response with the job's status, submit/start/finish times, queue and run
+        durations in seconds, and the pipeline result
+    """
+    job = pipeline_jobs.get(job_id)
+    if job is None:
+        return jsonify({"status": "error", "message": f"Unknown job: {job_id}"}), 404
+    return jsonify(job)
+
+@app.route('/api/jobs')
+def list_jobs():
+    """
+    List the most recent pipeline jobs, newest first.
+    
+    Query Parameters:
+        limit: Maximum number of jobs to return (default: 20)
+    """
+    limit = request.args.get('limit', 20, type=int)
+    return jsonify({"jobs": pipeline_jobs.list_jobs(limit)})
+
+@app.route('/api/pipeline_runs')
+def list_pipeline_runs():
+    """
+    List pipeline runs newest first, one page at a time.
+    
+    Pages are keyed on run_id, so each one is an index range scan however long the
+    history grows.
+    
+    Query Parameters:
+        limit: Runs per page (default: 50, at most 500)
+        before: Only runs older than this run_id (the previous page's next_before)
+        status: Only runs with this status (SUCCESS, PARTIAL or FAILURE)
+        symbol: Only single-symbol runs of this symbol
+        data_type: Only runs of this data type
+        run_type: Only single, batch or upload runs
+        details: 1 to include each run's JSON details (e.g. per-symbol batch stats)
+    
+    Returns:
+        JSON response with the runs, each with its parameters and per-stage metrics, and
+        next_before for the following page (null on the last page)
+    """
+    try:
+        limit = max(1, min(request.args.get('limit', 50, type=int), 500))
+        before = request.args.get('before', type=int)
+        include_details = request.args.get('details') == '1'
+        
+        clauses, params = [], []
+        for column in ('status', 'symbol', 'data_type', 'run_type'):
+            if request.args.get(column):
+                clauses.append(f"{column} = ?")
+                params.append(normalize_symbol(request.args[column]) if column == 'symbol' else request.args[column])
+        if before is not None:
+            clauses.append("run_id < ?")
+            params.append(before)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        
+        columns = RUN_SUMMARY_COLUMNS + ['parameters'] + (['details'] if include_details else [])
+        cursor = get_db().cursor()
+        cursor.execute(f"""
+            SELECT {', '.join(columns)}
+            FROM pipeline_runs_history
+            {where}
+            ORDER BY run_id DESC
+            LIMIT ?
+        """, params + [limit + 1])
+        rows = cursor.fetchall()
+        
+        runs = []
+        for row in rows[:limit]:
+            run = dict(row)
+            run['parameters'] = json.loads(run['parameters']) if run['parameters'] else None
+            if include_details:
+                run['details'] = json.loads(run['details']) if run['details'] else None
+            run['stages'] = {}
+            runs.append(run)
+        
+        # Stage metrics for the whole page in one primary key lookup
+        if runs:
+            by_id = {run['run_id']: run for run in runs}
+            cursor.execute(f"""
+                SELECT run_id, stage, seconds, wait_seconds, records_in, records_out, bytes,
+                       rows_per_second, process_peak_rss_mb
+                FROM pipeline_stage_metrics
+                WHERE run_id IN ({', '.join('?' * len(by_id))})
+                ORDER BY run_id, rowid
+            """, list(by_id))
+            for row in cursor.fetchall():
+                stage = dict(row)
+                by_id[stage.pop('run_id')]['stages'][stage.pop('stage')] = stage
+        
+        return jsonify({
+            "runs": runs,
+            "next_before": runs[-1]['run_id'] if len(rows) > limit else None
+        })
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/pipeline_runs/trends')
+def get_pipeline_run_trends():
+    """
+    Summarize recent pipeline performance by data type, to spot regressions.
+    
+    Query Parameters:
+        days: How many days of history to summarize (default: 30)
+        run_type: Only single, batch or upload runs
+    
+    Returns:
+        JSON response with, per data type: run and failure counts, p50/p95 duration and
+        throughput, p50/p95 seconds per stage, and daily p50/p95 durations
+    """
+    try:
+        days = max(1, request.args.get('days', 30, type=int))
+        return jsonify(build_pipeline_run_trends(days, request.args.get('run_type')))
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+def build_pipeline_run_trends(days, run_type=None):
+    """
+    Aggregate pipeline_runs_history and pipeline_stage_metrics behind /api/pipeline_runs/trends.
+    
+    Durations and throughput only count runs that loaded data (SUCCESS or PARTIAL), so
+    fast failures don't hide slowdowns.
+    
+    Args:
+        days: How many days of history to summarize
+        run_type: Optional run type filter
+        
+    Returns:
+        Dictionary with the window start and a list of per-data-type summaries
+    """
+    since = (datetime.datetime.now() - datetime.timedelta(days=days)).strftime("%Y-%m-%d %H:%M:%S")
+    run_filter = "AND run_type = ?" if run_type else ""
+    params = [since] + ([run_type] if run_type else [])
+    cursor = get_db().cursor()
+    
+    cursor.execute(f"""
+        SELECT run_id, timestamp, status, data_type, duration_seconds, rows_per_second, error_count
+        FROM pipeline_runs_history
+        WHERE timestamp >= ? {run_filter}
+    """, params)
+    runs = cursor.fetchall()
+    
+    cursor.execute(f"""
+        SELECT r.data_type, s.stage, s.seconds
+        FROM pipeline_runs_history AS r
+        JOIN pipeline_stage_metrics AS s ON s.run_id = r.run_id
+        WHERE r.timestamp >= ? AND r.status != 'FAILURE' {run_filter.replace('run_type', 'r.run_type')}
+    """, params)
+    stage_rows = cursor.fetchall()
+    
+    groups = {}
+    for run in runs:
+        group = groups.setdefault(run['data_type'], {"runs": 0, "failures": 0, "errors": 0,
+                                                     "durations": [], "throughput": [], "daily": {}})
+        group["runs"] += 1
+        group["failures"] += run['status'] == 'FAILURE'
+        group["errors"] += run['error_count'] or 0
+        if run['status'] != 'FAILURE' and run['duration_seconds'] is not None:
+            group["durations"].append(run['duration_seconds'])
+            group["daily"].setdefault(run['timestamp'][:10], []).append(run['duration_seconds'])
+            if run['rows_per_second'] is not None:
+                group["throughput"].append(run['rows_per_second'])
+    
+    stage_seconds = {}
+    for row in stage_rows:
+        stage_seconds.setdefault(row['data_type'], {}).setdefault(row['stage'], []).append(row['seconds'])
+    
+    data_types = []
+    for data_type, group in sorted(groups.items(), key=lambda item: -item[1]["runs"]):
+        data_types.append({
+            "data_type": data_type,
+            "runs": group["runs"],
+            "failures": group["failures"],
+            "errors": group["errors"],
+            "duration_p50": percentile(group["durations"], 50),
+            "duration_p95": percentile(group["durations"], 95),
+            "rows_per_second_p50": percentile(group["throughput"], 50),
+            "rows_per_second_p95": percentile(group["throughput"], 95),
+            "stages": {stage: {"seconds_p50": percentile(seconds, 50), "seconds_p95": percentile(seconds, 95)}
+                       for stage, seconds in stage_seconds.get(data_type, {}).items()},
+            "daily": [{"date": day, "runs": len(durations), "duration_p50": percentile(durations, 50),
+                       "duration_p95": percentile(durations, 95)}
+                      for day, durations in sorted(group["daily"].items())]
+        })
+    
+    return {"since": since, "days": days, "data_types": data_types}
+
+def percentile(values, q):
+    """
+    Linearly interpolated percentile of a list of numbers.
+    
+    Args:
+        values: Numbers (any order); None entries are ignored
+        q: Percentile, 0-100
+        
+    Returns:
+        The percentile rounded to 4 places, or None for no values
+    """
+    ordered = sorted(value for value in values if value is not None)
+    if not ordered:
+        return None
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return round(ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower), 4)
+
 @app.route('/api/chart_data')
 def get_chart_data():
     """
@@ -240,6 +525,8 @@ def get_chart_data():
     
     Query Parameters:
         data_type: Type of financial data to retrieve (e.g., "Historical Prices", "Income Statement")
+        bucket: Optional day|week|month|quarter to aggregate by time bucket instead of exact date;
+                adds mins, maxs, opens and closes arrays to the response
     
     Returns:
         JSON response with dates and values for charting
@@ -247,78 +534,282 @@ def get_chart_data():
     try:
         # Get data type from query parameter, default to Historical Prices
         data_type = request.args.get('data_type', 'Historical Prices')
+        bucket = request.args.get('bucket')
         
-        # Connect to the database
-        conn = sqlite3.connect('data.db')
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        # Check if table exists
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='standardized_financial_data'")
-        table_exists = cursor.fetchone()
-        
-        if not table_exists:
-            return jsonify({"error": "No data available"})
-        
-        # Get data aggregated by date for the specified data type
-        cursor.execute("""
-            SELECT date,
-                   SUM(value) as total_value,
-                   COUNT(*) as transaction_count,
-                   AVG(value) as average_value
-            FROM standardized_financial_data
-            WHERE data_type = ?
-            GROUP BY date
-            ORDER BY date ASC
-        """, (data_type,))
-        
-        rows = cursor.fetchall()
-        
-        # Get data by description type for pie chart, filtered by data_type
-        cursor.execute("""
-            SELECT description,
-                   SUM(value) as total_value,
-                   COUNT(*) as count
-            FROM standardized_financial_data
-            WHERE data_type = ?
-            GROUP BY description
-            ORDER BY total_value DESC
-        """, (data_type,))
-        
-        description_data = cursor.fetchall()
+        if bucket and bucket not in BUCKET_EXPRESSIONS:
+            return jsonify({"error": f"Invalid bucket '{bucket}'. Use one of: {', '.join(BUCKET_EXPRESSIONS)}"}), 400
         
-        # Format the data for charts
-        dates = []
-        values = []
-        counts = []
-        averages = []
+        return cached_json_response(chart_data_cache, ('chart_data', data_type, bucket),
+                                    lambda: build_chart_data(data_type, bucket))
+    except Exception as e:
+        return jsonify({"error": str(e)})
+
+def build_chart_data(data_type, bucket=None):
+    """
+    Query the date and description aggregates behind /api/chart_data.
+    
+    Args:
+        data_type: Type of financial data to aggregate
+        bucket: Optional key of BUCKET_EXPRESSIONS to group by time bucket
         
-        for row in rows:
-            dates.append(row['date'])
-            values.append(float(row['total_value']))
-            counts.append(int(row['transaction_count']))
-            averages.append(float(row['average_value']))
+    Returns:
+        Dictionary with dates and values for charting
+    """
+    cursor = get_db().cursor()
+    
+    if bucket:
+        return build_bucketed_chart_data(cursor, data_type, bucket)
+    
+    # Get data aggregated by date for the specified data type
+    cursor.execute("""
+        SELECT date,
+               SUM(value) as total_value,
+               COUNT(*) as transaction_count,
+               AVG(value) as average_value
+        FROM standardized_financial_data
+        WHERE data_type = ?
+        GROUP BY date
+        ORDER BY date ASC
+    """, (data_type,))
+    
+    rows = cursor.fetchall()
+    
+    # Get data by description type for pie chart, filtered by data_type
+    cursor.execute("""
+        SELECT description,
+               SUM(value) as total_value,
+               COUNT(*) as count
+        FROM standardized_financial_data
+        WHERE data_type = ?
+        GROUP BY description
+        ORDER BY total_value DESC
+    """, (data_type,))
+    
+    description_data = cursor.fetchall()
+    
+    # Format the data for charts
+    dates = []
+    values = []
+    counts = []
+    averages = []
+    
+    for row in rows:
+        dates.append(row['date'])
+        values.append(float(row['total_value']))
+        counts.append(int(row['transaction_count']))
+        averages.append(float(row['average_value']))
+    
+    # Format description data for pie chart
+    description_labels = []
+    description_values = []
+    
+    for row in description_data:
+        description_labels.append(row['description'])
+        description_values.append(float(row['total_value']))
+    
+    return {
+        "dates": dates,
+        "values": values,
+        "counts": counts,
+        "averages": averages,
+        "description_labels": description_labels,
+        "description_values": description_values
+    }
+
+def build_bucketed_chart_data(cursor, data_type, bucket):
+    """
+    Query /api/chart_data aggregates grouped by time bucket, with OHLC per bucket.
+    
+    Args:
+        cursor: Database cursor
+        data_type: Type of financial data to aggregate
+        bucket: Key of BUCKET_EXPRESSIONS
         
-        # Format description data for pie chart
-        description_labels = []
-        description_values = []
+    Returns:
+        Dictionary with bucket start dates, totals, counts, averages, min/max and open/close
+    """
+    source = "(SELECT date, value, data_type FROM standardized_financial_data WHERE data_type = :data_type)"
+    cursor.execute(bucket_aggregate_sql(source, bucket), {"data_type": data_type})
+    rows = cursor.fetchall()
+    
+    # Get data by description type for pie chart, filtered by data_type
+    cursor.execute("""
+        SELECT description,
+               SUM(value) as total_value
+        FROM standardized_financial_data
+        WHERE data_type = ?
+        GROUP BY description
+        ORDER BY total_value DESC
+    """, (data_type,))
+    description_data = cursor.fetchall()
+    
+    return {
+        "bucket": bucket,
+        "dates": [row['bucket'] for row in rows],
+        "values": [row['sum'] for row in rows],
+        "counts": [row['count'] for row in rows],
+        "averages": [row['mean'] for row in rows],
+        "mins": [row['min'] for row in rows],
+        "maxs": [row['max'] for row in rows],
+        "opens": [row['first'] for row in rows],
+        "closes": [row['last'] for row in rows],
+        "description_labels": [row['description'] for row in description_data],
+        "description_values": [float(row['total_value']) for row in description_data]
+    }
+
+# SQLite expressions mapping a YYYY-MM-DD date to the first day of its bucket
+BUCKET_EXPRESSIONS = {
+    'day': "date",
+    'week': "date(date, '-6 days', 'weekday 1')",  # Monday on or before the date
+    'month': "strftime('%Y-%m-01', date)",
+    'quarter': "printf('%s-%02d-01', strftime('%Y', date), ((CAST(strftime('%m', date) AS INTEGER) - 1) / 3) * 3 + 1)"
+}
+
+# Aggregates computed for every bucket
+BUCKET_AGGREGATES = ['sum', 'mean', 'min', 'max', 'first', 'last', 'count']
+
+def bucket_aggregate_sql(source, bucket):
+    """
+    Build a query aggregating (date, value) rows into time buckets.
+    
+    Args:
+        source: Table, CTE name or parenthesized subquery yielding date, value and data_type
+        bucket: Key of BUCKET_EXPRESSIONS
         
-        for row in description_data:
-            description_labels.append(row['description'])
-            description_values.append(float(row['total_value']))
+    Returns:
+        SQL returning one row per bucket, oldest first, with count, sum, mean, min, max,
+        first/last (open/close by date) and the first and last point dates
+    """
+    expr = BUCKET_EXPRESSIONS[bucket]
+    return f"""
+        SELECT bucket,
+               COUNT(*) AS count,
+               SUM(value) AS sum,
+               AVG(value) AS mean,
+               MIN(value) AS min,
+               MAX(value) AS max,
+               MAX(CASE WHEN first_rank = 1 THEN value END) AS first,
+               MAX(CASE WHEN last_rank = 1 THEN value END) AS last,
+               MIN(date) AS first_date,
+               MAX(date) AS last_date,
+               MAX(data_type) AS data_type
+        FROM (
+            SELECT {expr} AS bucket, date, value, data_type,
+                   ROW_NUMBER() OVER (PARTITION BY {expr} ORDER BY date ASC) AS first_rank,
+                   ROW_NUMBER() OVER (PARTITION BY {expr} ORDER BY date DESC) AS last_rank
+            FROM {source}
+        )
+        GROUP BY bucket
+        ORDER BY bucket ASC
+    """
+
+def symbol_series_sql(start_date=None, end_date=None):
+    """
+    Build the WITH clause resolving a symbol's series in one query.
+    
+    The match tier is picked best first:
+      1. exact symbol and data type
+      2. exact symbol, any data type
+      3. partial symbol match, resolved against the small financial_symbols table
+    Tiers 1 and 2 are index probes on (symbol, data_type, date), so unknown or partial
+    symbols never scan standardized_financial_data.
+    
+    Args:
+        start_date: Optional start date filter (binds :start_date)
+        end_date: Optional end date filter (binds :end_date)
         
-        conn.close()
+    Returns:
+        SQL defining a `points` CTE of (date, value, data_type) rows; expects :symbol and
+        :data_type parameters and must be followed by a SELECT
+    """
+    # Add date filters if provided
+    def date_filter(alias):
+        clause = ""
+        if start_date:
+            clause += f" AND {alias}.date >= :start_date"
+        if end_date:
+            clause += f" AND {alias}.date <= :end_date"
+        return clause
+    
+    return f"""
+        WITH matches(tier, symbol, data_type) AS (
+            SELECT 1, :symbol, :data_type
+            WHERE EXISTS (
+                SELECT 1 FROM standardized_financial_data e
+                WHERE e.symbol = :symbol AND e.data_type = :data_type{date_filter('e')}
+            )
+            UNION ALL
+            SELECT 2, :symbol, NULL
+            WHERE EXISTS (
+                SELECT 1 FROM standardized_financial_data e
+                WHERE e.symbol = :symbol{date_filter('e')}
+            )
+            UNION ALL
+            SELECT 3, s.symbol, NULL
+            FROM financial_symbols s
+            WHERE s.symbol != :symbol AND instr(s.symbol, :symbol) > 0
+        ),
+        points AS (
+            SELECT f.date, f.value, f.data_type
+            FROM matches m
+            JOIN standardized_financial_data f
+              ON f.symbol = m.symbol AND (m.data_type IS NULL OR f.data_type = m.data_type)
+            WHERE m.tier = (SELECT MIN(tier) FROM matches){date_filter('f')}
+        )
+    """
+
+def build_bucketed_series(symbol, data_type, params, bucket, agg):
+    """
+    Query a symbol's series aggregated into time buckets.
+    
+    Args:
+        symbol: Requested symbol, echoed in the response
+        data_type: Requested data type, used if no rows match
+        params: Query parameters (symbol, data_type, start_date, end_date, limit)
+        bucket: Key of BUCKET_EXPRESSIONS
+        agg: Aggregate reported as `values` (one of BUCKET_AGGREGATES)
         
-        return jsonify({
-            "dates": dates,
-            "values": values,
-            "counts": counts,
-            "averages": averages,
-            "description_labels": description_labels,
-            "description_values": description_values
-        })
-    except Exception as e:
-        return jsonify({"error": str(e)})
+    Returns:
+        Dictionary with bucket start dates, the selected aggregate as values, and
+        every aggregate as its own array
+    """
+    cursor = get_db().cursor()
+    query = symbol_series_sql(params['start_date'], params['end_date']) + \
+        bucket_aggregate_sql('points', bucket) + " LIMIT :limit"
+    cursor.execute(query, params)
+    rows = cursor.fetchall()
+    
+    series = {name: [row[name] for row in rows] for name in BUCKET_AGGREGATES}
+    total_count = sum(series['count'])
+    
+    stats = {}
+    if rows:
+        stats = {
+            "count": total_count,
+            "min": min(series['min']),
+            "max": max(series['max']),
+            "avg": sum(series['sum']) / total_count,
+            "first_date": rows[0]['first_date'],
+            "last_date": rows[-1]['last_date']
+        }
+    
+    return {
+        "symbol": symbol,
+        "bucket": bucket,
+        "agg": agg,
+        "dates": [row['bucket'] for row in rows],
+        "values": series[agg],
+        "open": series['first'],
+        "high": series['max'],
+        "low": series['min'],
+        "close": series['last'],
+        "sum": series['sum'],
+        "mean": series['mean'],
+        "count": series['count'],
+        "data_type": rows[-1]['data_type'] if rows else data_type,
+        "stats": stats,
+        "data_points": len(rows)
+    }
 
 @app.route('/api/historical_chart_data/<symbol>')
 def get_historical_chart_data(symbol):
@@ -332,10 +823,15 @@ def get_historical_chart_data(symbol):
         data_type: Type of financial data to retrieve (e.g., "Historical Prices", "Income Statement")
         start_date: Optional start date filter (YYYY-MM-DD)
         end_date: Optional end date filter (YYYY-MM-DD)
-        limit: Maximum number of data points to return (default: 500)
+        limit: Maximum number of data points (or buckets) to return (default: 500, 0 for no limit)
+        bucket: Optional day|week|month|quarter to aggregate points into time buckets
+        agg: Aggregate returned as `values` for bucketed series: sum, mean (default), min, max,
+             first, last or count. Open/high/low/close, sum, mean and count are always included.
+        format: Optional "columnar" to receive dates_b64 (int32 days since 1970-01-01) and
+                values_b64 (float64) instead of JSON arrays
         
     Returns:
-        JSON response with dates and values for charting
+        Streamed (gzip/brotli when accepted) JSON response with dates and values for charting
     """
     try:
         # Get query parameters
@@ -344,137 +840,56 @@ def get_historical_chart_data(symbol):
         end_date = request.args.get('end_date')
         limit = request.args.get('limit', 500, type=int)
         
-        # Connect to the database
-        conn = sqlite3.connect('data.db')
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        # Check if table exists
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='standardized_financial_data'")
-        table_exists = cursor.fetchone()
+        cursor = get_db().cursor()
         
-        if not table_exists:
-            return jsonify({
-                "error": "No data available",
-                "symbol": symbol,
-                "data_type": data_type,
-                "dates": [],
-                "values": []
-            })
+        params = {
+            "symbol": normalize_symbol(symbol),
+            "data_type": data_type,
+            "start_date": start_date,
+            "end_date": end_date,
+            "limit": limit if limit else -1  # SQLite treats a negative LIMIT as no limit
+        }
+        
+        # Aggregate into time buckets when requested
+        bucket = request.args.get('bucket')
+        if bucket:
+            if bucket not in BUCKET_EXPRESSIONS:
+                return jsonify({
+                    "error": f"Invalid bucket '{bucket}'. Use one of: {', '.join(BUCKET_EXPRESSIONS)}",
+                    "symbol": symbol,
+                    "data_type": data_type,
+                    "dates": [],
+                    "values": []
+                }), 400
+            
+            agg = request.args.get('agg', 'mean')
+            if agg not in BUCKET_AGGREGATES:
+                agg = 'mean'
+            
+            key = ('historical_chart_data', symbol, data_type, bucket, agg, start_date, end_date, limit)
+            return cached_json_response(chart_data_cache, key,
+                                        lambda: build_bucketed_series(symbol, data_type, params, bucket, agg))
         
-        # Build the query based on filters
-        query = """
+        query = symbol_series_sql(start_date, end_date) + """
             SELECT date, value, data_type
-            FROM standardized_financial_data
-            WHERE description = ? AND data_type = ?
+            FROM points
+            ORDER BY date ASC
+            LIMIT :limit
         """
-        params = [symbol, data_type]
         
-        # Add date filters if provided
-        if start_date:
-            query += " AND date >= ?"
-            params.append(start_date)
-        
-        if end_date:
-            query += " AND date <= ?"
-            params.append(end_date)
-        
-        # Add ordering and limit
-        query += " ORDER BY date ASC"
-        
-        if limit:
-            query += " LIMIT ?"
-            params.append(limit)
-        
-        # Execute the query
         cursor.execute(query, params)
-        rows = cursor.fetchall()
-        
-        # If no exact match, try with just the symbol
-        if not rows:
-            fallback_query = """
-                SELECT date, value, data_type
-                FROM standardized_financial_data
-                WHERE description = ?
-            """
-            fallback_params = [symbol]
-            
-            if start_date:
-                fallback_query += " AND date >= ?"
-                fallback_params.append(start_date)
-            
-            if end_date:
-                fallback_query += " AND date <= ?"
-                fallback_params.append(end_date)
-            
-            fallback_query += " ORDER BY date ASC"
-            
-            if limit:
-                fallback_query += " LIMIT ?"
-                fallback_params.append(limit)
-            
-            cursor.execute(fallback_query, fallback_params)
-            rows = cursor.fetchall()
-        
-        # If still no match, try a partial match
-        if not rows:
-            partial_query = """
-                SELECT date, value, data_type
-                FROM standardized_financial_data
-                WHERE description LIKE ?
-            """
-            partial_params = [f"%{symbol}%"]
-            
-            if start_date:
-                partial_query += " AND date >= ?"
-                partial_params.append(start_date)
-            
-            if end_date:
-                partial_query += " AND date <= ?"
-                partial_params.append(end_date)
-            
-            partial_query += " ORDER BY date ASC"
-            
-            if limit:
-                partial_query += " LIMIT ?"
-                partial_params.append(limit)
-            
-            cursor.execute(partial_query, partial_params)
-            rows = cursor.fetchall()
-        
-        # Format the data for the chart
-        dates = []
-        values = []
-        chart_data_type = data_type  # Store the actual data type of the returned data
-        
-        for row in rows:
-            dates.append(row['date'])
-            values.append(float(row['value']))
-            if 'data_type' in row.keys():
-                chart_data_type = row['data_type']
-        
-        # Get data statistics for insights
-        stats = {}
-        if values:
-            stats = {
-                "count": len(values),
-                "min": min(values),
-                "max": max(values),
-                "avg": sum(values) / len(values),
-                "first_date": dates[0] if dates else None,
-                "last_date": dates[-1] if dates else None
-            }
-        
-        conn.close()
         
-        return jsonify({
-            "symbol": symbol,
-            "dates": dates,
-            "values": values,
-            "data_type": chart_data_type,
-            "stats": stats,
-            "data_points": len(dates)
-        })
+        # Stream the JSON body, compressed if the client accepts it
+        columnar = request.args.get('format') == 'columnar'
+        encoding = negotiate_encoding(request.accept_encodings)
+        body = iter_historical_chart_json(cursor, symbol, data_type, columnar)
+        
+        response = app.response_class(stream_with_context(compress_stream(body, encoding)),
+                                      mimetype='application/json')
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        return response
     except Exception as e:
         return jsonify({
             "error": str(e),
@@ -484,6 +899,97 @@ def get_historical_chart_data(symbol):
             "values": []
         })
 
+# Day number of 1970-01-01, used to pack dates as days since the Unix epoch
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+def iter_historical_chart_json(cursor, symbol, data_type, columnar=False, batch_size=2000):
+    """
+    Stream the /api/historical_chart_data JSON body from an executed query.
+    
+    Rows are read in batches. Dates are written out as they arrive while values are kept in
+    a packed array (8 bytes each) until the dates are done, so no Python lists of the
+    whole series are built.
+    
+    Args:
+        cursor: Cursor with an executed query yielding (date, value, data_type) rows
+        symbol: Requested symbol, echoed in the response
+        data_type: Requested data type, used if the query returns no rows
+        columnar: Emit dates as base64 int32 day numbers and values as base64 float64
+        batch_size: Rows fetched per batch
+        
+    Yields:
+        JSON text fragments; the object has an "error" member if reading the rows failed
+    """
+    values = array.array('d')
+    day_numbers = array.array('i')
+    chart_data_type = data_type  # Store the actual data type of the returned data
+    first_date = last_date = None
+    error = None
+    
+    yield '{"symbol": ' + json.dumps(symbol)
+    if not columnar:
+        yield ', "dates": ['
+    
+    while True:
+        # The status line is already sent, so a failure (e.g. a malformed stored date) can't
+        # become an error response; the batch is dropped and the body still closes as valid
+        # JSON with an "error" member, which the dashboard checks
+        try:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            
+            batch_dates = [str(row['date']) for row in rows]
+            batch_values = [float(row['value']) for row in rows]
+            if columnar:
+                batch_days = [datetime.date.fromisoformat(date).toordinal() - EPOCH_ORDINAL
+                              for date in batch_dates]
+        except Exception as e:
+            error = f"Failed to read {symbol} {data_type} data: {e}"
+            break
+        
+        values.extend(batch_values)
+        chart_data_type = rows[-1]['data_type']
+        
+        if columnar:
+            day_numbers.extend(batch_days)
+        else:
+            yield (', ' if first_date is not None else '') + json.dumps(batch_dates)[1:-1]
+        
+        if first_date is None:
+            first_date = batch_dates[0]
+        last_date = batch_dates[-1]
+    
+    if columnar:
+        yield ', "encoding": "columnar", "dates_b64": "'
+        yield from iter_base64(pack_int32(day_numbers))
+        yield '", "values_b64": "'
+        yield from iter_base64(pack_float64(values))
+        yield '"'
+    else:
+        yield '], "values": ['
+        for offset in range(0, len(values), batch_size):
+            yield (', ' if offset else '') + json.dumps(values[offset:offset + batch_size].tolist())[1:-1]
+        yield ']'
+    
+    # Get data statistics for insights
+    stats = {}
+    if values:
+        stats = {
+            "count": len(values),
+            "min": min(values),
+            "max": max(values),
+            "avg": sum(values) / len(values),
+            "first_date": first_date,
+            "last_date": last_date
+        }
+    
+    yield ', "data_type": ' + json.dumps(chart_data_type)
+    yield ', "stats": ' + json.dumps(stats)
+    if error is not None:
+        yield ', "error": ' + json.dumps(error)
+    yield ', "data_points": ' + str(len(values)) + '}'
+
 @app.route('/process_uploaded_data', methods=['POST'])
 def process_uploaded_data():
     """
@@ -498,6 +1004,8 @@ def process_uploaded_data():
         JSON response with processing results
     """
     try:
+        started = time.perf_counter()
+        
         # Get data from form
         data_json = request.form.get('data')
         symbol = request.form.get('symbol', '').upper()
@@ -518,112 +1026,29 @@ def process_uploaded_data():
                 "message": "No data to process"
             }), 400
         
-        # Save raw data to file
-        timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"{symbol}_{category.lower().replace(' ', '_')}_{timestamp}.json"
-        
-        # Ensure raw_data directory exists
-        os.makedirs("raw_data", exist_ok=True)
-        
-        # Save to file
-        with open(os.path.join("raw_data", filename), 'w') as f:
-            json.dump(data, f, indent=2)
-        
-        # Standardize data
-        standardized_data = []
-        
-        for item in data:
-            # Generate a unique ID
-            record_id = str(uuid.uuid4())
-            
-            # Parse date
-            try:
-                date_str = item.get('date', '')
-                # Try different date formats
-                date_formats = [
-                    "%Y-%m-%d",    # YYYY-MM-DD
-                    "%m/%d/%Y",    # MM/DD/YYYY
-                    "%d-%b-%Y",    # DD-Mon-YYYY
-                    "%b %d, %Y"    # Mon DD, YYYY
-                ]
-                
-                parsed_date = None
-                for fmt in date_formats:
-                    try:
-                        parsed_date = datetime.datetime.strptime(date_str, fmt)
-                        break
-                    except ValueError:
-                        continue
-                
-                if parsed_date:
-                    standardized_date = parsed_date.strftime("%Y-%m-%d")
-                else:
-                    standardized_date = "1900-01-01"  # Default date
-            except Exception:
-                standardized_date = "1900-01-01"
-            
-            # Parse value
-            try:
-                value_str = item.get('value', '0')
-                # Remove currency symbols, commas, etc.
-                if isinstance(value_str, str):
-                    cleaned_value = ''.join(c for c in value_str if c.isdigit() or c == '.' or c == '-')
-                    standardized_value = float(cleaned_value)
-                else:
-                    standardized_value = float(value_str)
-            except Exception:
-                standardized_value = 0.0
-            
-            # Get description
-            description = item.get('description', symbol)
-            
-            # Create standardized record
-            standardized_record = {
-                "id": record_id,
-                "date": standardized_date,
-                "value": standardized_value,
-                "description": description,
-                "data_type": category
-            }
-            
-            standardized_data.append(standardized_record)
+        # Standardize the whole upload column-wise and write it in one transaction
+        standardized_data = standardize_records_frame(data, category, symbol)
         
-        # Save to database
-        conn = sqlite3.connect('data.db')
+        conn = get_db()
         cursor = conn.cursor()
+        insert_standardized_frame(conn, standardized_data)
         
-        # Create table if it doesn't exist
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS standardized_financial_data (
-            id TEXT PRIMARY KEY,
-            date TEXT,
-            value REAL,
-            description TEXT,
-            data_type TEXT
-        )
-        ''')
-        
-        # Insert records
-        for record in standardized_data:
-            cursor.execute('''
-            INSERT OR REPLACE INTO standardized_financial_data (id, date, value, description, data_type)
-            VALUES (?, ?, ?, ?, ?)
-            ''', (
-                record["id"],
-                record["date"],
-                record["value"],
-                record["description"],
-                record["data_type"]
-            ))
-        
-        # Commit changes and close connection
-        conn.commit()
+        # Invalidate cached chart responses
+        bump_data_version(DB_PATH)
         
-        # Get record count
-        cursor.execute("SELECT COUNT(*) FROM standardized_financial_data")
-        total_records = cursor.fetchone()[0]
+        # Archive the raw upload only once it is loaded, so failed uploads leave no segment.
+        # The rows are already committed, so an archive failure is logged with the run
+        # instead of failing the upload.
+        archive_error = None
+        try:
+            source_bytes = archive_records(data, symbol, category)["bytes"]
+        except Exception as e:
+            print(f"Warning: could not archive the raw upload for {symbol}: {e}")
+            archive_error = f"Raw archive failed: {e}"
+            source_bytes = None
         
-        conn.close()
+        # Get record count (tracked by triggers, no table scan)
+        total_records = get_row_count(conn)
         
         # Update status
         status_message = f"SUCCESS: {len(standardized_data)} user records processed"
@@ -632,28 +1057,16 @@ def process_uploaded_data():
             f.write(f"{status_message} at {timestamp}")
         
         # Log pipeline run
-        conn = sqlite3.connect('data.db')
-        cursor = conn.cursor()
-        
-        # Create table if it doesn't exist
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS pipeline_runs_history (
-            run_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            timestamp TEXT,
-            status TEXT,
-            records_processed INTEGER
-        )
-        ''')
-        
-        # Insert record
         timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        duration = time.perf_counter() - started
         cursor.execute('''
-        INSERT INTO pipeline_runs_history (timestamp, status, records_processed)
-        VALUES (?, ?, ?)
-        ''', (timestamp, "SUCCESS", len(standardized_data)))
+        INSERT INTO pipeline_runs_history (timestamp, status, records_processed, run_type, symbol, data_type,
+            duration_seconds, rows_per_second, error_count, error, source_bytes)
+        VALUES (?, ?, ?, 'upload', ?, ?, ?, ?, 0, ?, ?)
+        ''', (timestamp, "SUCCESS", len(standardized_data), symbol, category, round(duration, 4),
+              round(len(standardized_data) / duration, 1) if duration else None, archive_error, source_bytes))
         
         conn.commit()
-        conn.close()
         
         return jsonify({
             "status": "success",
@@ -678,17 +1091,7 @@ def get_data_types():
         JSON response with list of available data types
     """
     try:
-        # Connect to the database
-        conn = sqlite3.connect('data.db')
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        # Check if table exists
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='standardized_financial_data'")
-        table_exists = cursor.fetchone()
-        
-        if not table_exists:
-            return jsonify({"data_types": ["Historical Prices", "Income Statement"]})
+        cursor = get_db().cursor()
         
         # Get distinct data types
         cursor.execute("""
@@ -703,8 +1106,6 @@ def get_data_types():
         # If no data types found, return default ones
         if not data_types:
             data_types = ["Historical Prices", "Income Statement"]
-            
-        conn.close()
         
         return jsonify({
             "data_types": data_types
@@ -726,4 +1127,5 @@ def allowed_file(filename):
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    # Development server; use `gunicorn -c gunicorn.conf.py wsgi:app` in production
+    app.run(debug=True, threaded=True)
\ No newline at end of file
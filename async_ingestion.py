@@ -0,0 +1,341 @@
+import asyncio
+import json
+import os
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+import requests
+from http_client import DEFAULT_FMP_BASE_URL, is_error_payload
+from ingestion_service import generate_mock_income_statement, get_fmp_api_key
+from json_stream import JsonArrayDecoder
+
+try:
+    import aiohttp
+except ImportError:  # optional: requests on a thread pool is used instead
+    aiohttp = None
+
+# Requests per second allowed per host, matching provider quotas (FMP's starter plan
+# allows 300 requests/minute); FMP_RATE_LIMIT overrides the limit for the FMP base URL's host
+RATE_LIMITS = {"financialmodelingprep.com": 5.0}
+DEFAULT_RATE_LIMIT = 10.0
+
+# Statuses worth retrying: rate limited or a transient server error
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# FMP endpoint and response layout per data type: (path template, key of the array in
+# the response object, or None for a top-level array)
+ENDPOINTS = {
+    "Income Statement": ("income-statement/{symbol}", None),
+    "Historical Prices": ("historical-price-full/{symbol}", "historical")
+}
+
+class RateLimiter:
+    """
+    A token bucket limiting how often requests may start.
+
+    Allows bursts of up to burst requests, refilling at rate tokens per second.
+    """
+
+    def __init__(self, rate: float, burst: int = None):
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """
+        Wait until a request may start.
+        """
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                # Sleep off the deficit and take the token it refills, rather than checking
+                # again: float drift can leave the bucket a hair short of a whole token
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens = max(0.0, self._tokens - 1)
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+class AsyncIngestionClient:
+    """
+    Fetch market data for many symbols concurrently.
+
+    At most max_concurrency requests are in flight at once, each host is held to its
+    rate limit, and transient failures are retried with jittered exponential backoff.
+    Response bodies are decoded incrementally as they download. Uses aiohttp when it is
+    installed, otherwise requests on a thread pool.
+
+    Unlike http_client.HttpClient, responses are not cached: every fetch downloads the
+    full body, with this client's own retry policy, so a repeated batch re-downloads
+    statements the synchronous path would serve from its ETag cache.
+
+    Use as an async context manager:
+
+        async with AsyncIngestionClient() as client:
+            records = await client.fetch("AAPL", "Income Statement")
+    """
+
+    def __init__(self, base_url: str = None, api_key: str = None, max_concurrency: int = 16,
+                 rate_limits: dict = None, retries: int = 3, backoff_factor: float = 0.5,
+                 timeout: float = 30, read_size: int = 65536):
+        self.base_url = (base_url or os.getenv("FMP_BASE_URL") or DEFAULT_FMP_BASE_URL).rstrip("/")
+        self.api_key = api_key or get_fmp_api_key()
+        self.max_concurrency = max_concurrency
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+        self.read_size = read_size
+
+        self.rate_limits = dict(RATE_LIMITS if rate_limits is None else rate_limits)
+        if rate_limits is None and os.getenv("FMP_RATE_LIMIT"):
+            self.rate_limits[urlparse(self.base_url).hostname] = float(os.getenv("FMP_RATE_LIMIT"))
+        self._limiters = {}
+
+        self._semaphore = None
+        self._session = None
+        self._executor = None
+
+    async def __aenter__(self):
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        if aiohttp is not None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency),
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        else:
+            self._session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_maxsize=self.max_concurrency)
+            self._session.mount("http://", adapter)
+            self._session.mount("https://", adapter)
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        if aiohttp is not None:
+            await self._session.close()
+        else:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._session.close()
+
+    async def fetch(self, symbol: str, data_type: str, num_records: int = 100, fallback=None) -> list[dict]:
+        """
+        Fetch raw records for one symbol and data type.
+
+        Data types without an FMP endpoint, runs without a valid API key and empty
+        responses are handed to fallback (e.g. main_pipeline.ingest_data, which
+        generates mock data) on a worker thread.
+
+        Args:
+            symbol: Stock symbol (e.g., "AAPL")
+            data_type: Type of financial data
+            num_records: Number of days of prices (or mock records) to fetch
+            fallback: Callable (symbol, data_type, num_records) -> list of raw records
+
+        Returns:
+            List of raw records shaped like the synchronous ingestion output
+        """
+        if data_type in ENDPOINTS and self.api_key:
+            path, key = ENDPOINTS[data_type]
+            params = {"apikey": self.api_key}
+            if data_type == "Historical Prices":
+                params["timeseries"] = num_records
+            records = await self.fetch_json_array(path.format(symbol=symbol), params, key)
+
+            # FMP reports quota and key errors as HTTP 200 with an error message; fall back
+            # to mock data like fetch_income_statement_from_fmp, without asking FMP again
+            if is_error_payload(records):
+                print(f"Error fetching {data_type} data for {symbol}: {records['Error Message']}")
+                if data_type == "Income Statement":
+                    return await asyncio.to_thread(generate_mock_income_statement, symbol)
+                records = []
+
+            if data_type == "Historical Prices":
+                # Closing prices in the raw record shape the standardization rules expect
+                records = [{"date": day["date"], "value": day["close"], "description": symbol} for day in records]
+            if records or fallback is None:
+                return records
+
+        if fallback is None:
+            raise ValueError(f"No endpoint for data type {data_type!r} and no fallback given")
+        return await asyncio.to_thread(fallback, symbol, data_type, num_records)
+
+    async def fetch_json_array(self, path: str, params: dict = None, key: str = None) -> list:
+        """
+        GET an endpoint returning a JSON array, decoding it as it downloads.
+
+        Args:
+            path: Endpoint path relative to base_url
+            params: Query parameters
+            key: Top-level object key holding the array, if the response is an object
+
+        Returns:
+            Array elements, or FMP's {"Error Message": ...} object if the API answered
+            with one (see http_client.is_error_payload)
+
+        Raises:
+            RuntimeError: If the server answers with an error status (after retries)
+            ValueError: If the response isn't the expected JSON shape
+        """
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        limiter = self._limiter(urlparse(url).hostname or "")
+
+        for attempt in range(self.retries + 1):
+            async with self._semaphore:
+                await limiter.acquire()
+                try:
+                    if aiohttp is not None:
+                        status, retry_after, records = await self._get_aiohttp(url, params, key)
+                    else:
+                        status, retry_after, records = await asyncio.get_running_loop().run_in_executor(
+                            self._executor, self._get_blocking, url, params, key)
+                except (OSError, asyncio.TimeoutError, requests.RequestException,
+                        *((aiohttp.ClientError,) if aiohttp is not None else ())) as e:
+                    if attempt == self.retries:
+                        raise
+                    status, retry_after, records = None, None, e
+
+            if status == 200:
+                return records
+            if status is not None and (status not in RETRY_STATUSES or attempt == self.retries):
+                raise RuntimeError(f"HTTP {status} from {url}")
+
+            # Back off outside the semaphore so other symbols keep going
+            delay = self.backoff_factor * 2 ** attempt + random.uniform(0, self.backoff_factor)
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+            await asyncio.sleep(delay)
+
+    def _limiter(self, host: str) -> RateLimiter:
+        if host not in self._limiters:
+            rate = next((rate for domain, rate in self.rate_limits.items()
+                         if host == domain or host.endswith("." + domain)), DEFAULT_RATE_LIMIT)
+            self._limiters[host] = RateLimiter(rate)
+        return self._limiters[host]
+
+    async def _get_aiohttp(self, url: str, params: dict, key: str):
+        async with self._session.get(url, params=params) as response:
+            if response.status != 200:
+                return response.status, response.headers.get("Retry-After"), None
+            decoder = _ResponseDecoder(key)
+            async for chunk in response.content.iter_chunked(self.read_size):
+                decoder.feed(chunk)
+            return 200, None, decoder.close()
+
+    def _get_blocking(self, url: str, params: dict, key: str):
+        with self._session.get(url, params=params, stream=True, timeout=self.timeout) as response:
+            if response.status_code != 200:
+                return response.status_code, response.headers.get("Retry-After"), None
+            decoder = _ResponseDecoder(key)
+            for chunk in response.iter_content(self.read_size):
+                decoder.feed(chunk)
+            return 200, None, decoder.close()
+
+class _ResponseDecoder:
+    # Decodes a JSON array response as it downloads. The raw bytes are kept until the
+    # first element arrives, so an FMP error object that fails the array decode can
+    # still be returned whole.
+
+    def __init__(self, key: str = None):
+        self._decoder = JsonArrayDecoder(key)
+        self._head = bytearray()
+        self._error = None
+        self.records = []
+
+    def feed(self, chunk: bytes):
+        if self._head is not None:
+            self._head += chunk
+        if self._error is None:
+            try:
+                self.records.extend(self._decoder.feed(chunk))
+            except ValueError as e:
+                self._error = e
+        if self.records:
+            self._head = None
+
+    def close(self):
+        if self._error is None:
+            try:
+                self.records.extend(self._decoder.close())
+                return self.records
+            except ValueError as e:
+                self._error = e
+        if self._head is not None:
+            try:
+                body = json.loads(self._head)
+            except ValueError:
+                body = None
+            if is_error_payload(body):
+                return body
+        raise self._error
+
+def iter_ingested(pairs: list[tuple], num_records: int = 100, fallback=None, **client_options):
+    """
+    Fetch many (symbol, data type) pairs concurrently, yielding each as it completes.
+
+    The event loop runs on a background thread, so synchronous callers (e.g. the batch
+    pipeline) can hand each result to standardization while the rest are downloading.
+    Closing the generator early cancels outstanding requests.
+
+    Args:
+        pairs: (symbol, data_type) tuples to fetch
+        num_records: Number of days of prices (or mock records) per pair
+        fallback: Callable used for data types without an endpoint (see AsyncIngestionClient.fetch)
+        **client_options: Passed to AsyncIngestionClient (max_concurrency, rate_limits, ...)
+
+    Yields:
+        Tuples of (symbol, data_type, records, error, seconds); records is None and error
+        the exception if the pair failed
+    """
+    results = queue.Queue()
+    done = object()
+    loop = asyncio.new_event_loop()
+    main_task = []
+
+    async def fetch_all():
+        async with AsyncIngestionClient(**client_options) as client:
+            async def fetch_one(symbol, data_type):
+                start = time.perf_counter()
+                try:
+                    records = await client.fetch(symbol, data_type, num_records, fallback)
+                    results.put((symbol, data_type, records, None, time.perf_counter() - start))
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    results.put((symbol, data_type, None, e, time.perf_counter() - start))
+
+            await asyncio.gather(*(fetch_one(symbol, data_type) for symbol, data_type in pairs))
+
+    def run():
+        try:
+            main_task.append(loop.create_task(fetch_all()))
+            loop.run_until_complete(main_task[0])
+        except BaseException as e:
+            results.put(e)
+        finally:
+            results.put(done)
+            loop.close()
+
+    thread = threading.Thread(target=run, name="async-ingestion", daemon=True)
+    thread.start()
+    try:
+        while (item := results.get()) is not done:
+            if isinstance(item, BaseException):
+                if isinstance(item, asyncio.CancelledError):
+                    continue
+                raise item
+            yield item
+    finally:
+        if thread.is_alive() and main_task:
+            try:
+                loop.call_soon_threadsafe(main_task[0].cancel)
+            except RuntimeError:
+                pass  # loop already closed
+        thread.join()
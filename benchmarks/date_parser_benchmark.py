@@ -0,0 +1,98 @@
+"""
+Benchmark date_parser against the original strptime loop on the dates in raw_data/.
+
+Run from the repository root:
+
+    python -m benchmarks.date_parser_benchmark --repeat 200
+"""
+import argparse
+import datetime
+import glob
+import json
+import os
+import time
+import date_parser
+
+def legacy_parse_date(value: str):
+    # The per-record loop apply_standardization_rules used before date_parser
+    for fmt in date_parser.DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(value, fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    return None
+
+def load_raw_dates(raw_dir: str = "raw_data") -> list[str]:
+    """
+    Collect the date strings of every record in the raw data files.
+
+    Args:
+        raw_dir: Directory containing raw JSON files
+
+    Returns:
+        List of raw date strings
+    """
+    dates = []
+    for path in sorted(glob.glob(os.path.join(raw_dir, "*.json"))):
+        with open(path, "r") as f:
+            dates.extend(record["date"] for record in json.load(f) if isinstance(record.get("date"), str))
+    return dates
+
+def time_call(func, *args) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+def run_benchmark(dates: list[str]) -> dict:
+    """
+    Parse the dates with each implementation and check they agree.
+
+    Args:
+        dates: Raw date strings
+
+    Returns:
+        Dictionary with timings (seconds and dates per second) for each implementation
+    """
+    legacy_seconds, expected = time_call(lambda: [legacy_parse_date(value) for value in dates])
+
+    # Regex dispatch alone, without memoization
+    uncached = date_parser._parse_date_cached.__wrapped__
+    uncached_seconds, _ = time_call(lambda: [uncached(value) for value in dates])
+
+    date_parser.clear_cache()
+    cold_seconds, scalar = time_call(lambda: [date_parser.parse_date(value) for value in dates])
+    warm_seconds, _ = time_call(lambda: [date_parser.parse_date(value) for value in dates])
+
+    date_parser.clear_cache()
+    column_seconds, column = time_call(date_parser.parse_date_column, dates)
+
+    expected_column = [value or date_parser.DEFAULT_DATE for value in expected]
+    if scalar != expected or column.tolist() != expected_column:
+        raise AssertionError("date_parser results differ from the strptime loop")
+
+    def stats(seconds):
+        return {"seconds": round(seconds, 4), "dates_per_second": round(len(dates) / seconds)}
+
+    return {
+        "dates": len(dates),
+        "unique_dates": len(set(dates)),
+        "strptime_loop": stats(legacy_seconds),
+        "regex_dispatch_uncached": stats(uncached_seconds),
+        "parse_date_cold_cache": stats(cold_seconds),
+        "parse_date_warm_cache": stats(warm_seconds),
+        "parse_date_column": stats(column_seconds),
+        "speedup_cold": round(legacy_seconds / cold_seconds, 1),
+        "speedup_column": round(legacy_seconds / column_seconds, 1)
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark date parsing on the raw data files')
+    parser.add_argument('--raw_dir', type=str, default="raw_data",
+                        help='Directory containing raw JSON files')
+    parser.add_argument('--repeat', type=int, default=100,
+                        help='Number of times to repeat the raw dates (simulates larger runs)')
+
+    args = parser.parse_args()
+
+    dates = load_raw_dates(args.raw_dir) * args.repeat
+    print(json.dumps(run_benchmark(dates), indent=2))
@@ -0,0 +1,304 @@
+"""
+Benchmark feedback analysis per stage, with latency percentiles, at increasing corpus sizes.
+
+Run from the repository root:
+
+    python -m benchmarks.feedback_benchmark --sizes 100,1k,10k --output feedback_bench.json
+    python -m benchmarks.feedback_benchmark --openai_items 200 --openai_latency 0.3 --openai_jitter 0.1
+
+Corpora come from sample_data_generator.generate_sample_feedback_data with a fixed seed.
+Every FeedbackProcessor stage (cleaning, categorization, sentiment, strategic alignment,
+entity extraction) is timed item by item and reported as items per second with p50,
+p95 and p99 latencies; the end-to-end cases run process_feedback_batch followed by
+DatabaseManager.save_feedback_batch into a scratch database.
+
+The EnhancedFeedbackProcessor cases talk to a local mock OpenAI server
+(mock_openai_server.py) through OPENAI_BASE_URL, so they measure our side of each call
+plus the simulated model latency without network access or API costs. They are
+network-bound, so they only run on the first --openai_items items of each corpus.
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+import numpy as np
+from benchmarks.pipeline_benchmark import environment, parse_size, quiet
+from sample_data_generator import generate_sample_feedback_data
+
+DEFAULT_SIZES = "100,1k,10k"
+
+# Items sent through the mock OpenAI server per size; each one makes four API calls
+DEFAULT_OPENAI_ITEMS = 50
+
+# Simulated model latency in seconds (mean, and maximum deviation from it)
+DEFAULT_OPENAI_LATENCY = 0.05
+DEFAULT_OPENAI_JITTER = 0.02
+
+# Latency percentiles reported for every stage
+PERCENTILES = (50, 95, 99)
+
+# (stage name, FeedbackProcessor method); each runs on the cleaned text, like
+# process_single_feedback does
+FALLBACK_STAGES = [
+    ("categorize", "categorize_feedback"),
+    ("sentiment", "calculate_sentiment"),
+    ("strategic_alignment", "calculate_strategic_alignment"),
+    ("entity_extraction", "extract_key_entities")
+]
+
+# (stage name, EnhancedFeedbackProcessor method), one API call each
+OPENAI_STAGES = [
+    ("openai_categorize", "categorize_with_openai"),
+    ("openai_sentiment", "analyze_sentiment_with_openai"),
+    ("openai_strategic_alignment", "analyze_strategic_alignment_with_openai"),
+    ("openai_entity_extraction", "extract_entities_with_openai")
+]
+
+def feedback_corpus(size: int, seed: int):
+    """
+    Generate a repeatable feedback corpus.
+
+    Args:
+        size: Number of feedback items
+        seed: Random seed (generate_sample_feedback_data draws from the random module)
+
+    Returns:
+        DataFrame with feedback_text, source_type and date columns
+    """
+    random.seed(seed)
+    return generate_sample_feedback_data(size)
+
+def latency_stats(latencies: list[float]) -> dict:
+    """
+    Summarize per-item latencies.
+
+    Args:
+        latencies: Seconds per item
+
+    Returns:
+        Dictionary with total seconds, items per second and the PERCENTILES in ms
+    """
+    seconds = sum(latencies)
+    stats = {
+        "items": len(latencies),
+        "seconds": round(seconds, 4),
+        "items_per_second": round(len(latencies) / seconds, 1) if seconds else None
+    }
+    if latencies:
+        for q, value in zip(PERCENTILES, np.percentile(latencies, PERCENTILES)):
+            stats[f"p{q}_ms"] = round(float(value) * 1000, 3)
+        stats["max_ms"] = round(max(latencies) * 1000, 3)
+    return stats
+
+def time_items(items, run) -> list[float]:
+    """
+    Time run on each item separately.
+
+    Args:
+        items: Inputs
+        run: Callable taking one input
+
+    Returns:
+        Seconds per item
+    """
+    clock = time.perf_counter
+    latencies = []
+    with quiet():
+        for item in items:
+            began = clock()
+            run(item)
+            latencies.append(clock() - began)
+    return latencies
+
+def time_end_to_end(processor, df, db_path: str) -> dict:
+    """
+    Process a corpus as one batch and save it, as feedback_app does for an upload.
+
+    Args:
+        processor: FeedbackProcessor or EnhancedFeedbackProcessor
+        df: Feedback corpus
+        db_path: Scratch database for DatabaseManager
+
+    Returns:
+        Dictionary with process, save and total seconds and items per second
+    """
+    from database_manager import DatabaseManager
+
+    db_manager = DatabaseManager(db_path)
+    clock = time.perf_counter
+    with quiet():
+        began = clock()
+        processed = processor.process_feedback_batch(df)
+        processed_at = clock()
+        saved = db_manager.save_feedback_batch(processed)
+        finished = clock()
+    if not saved:
+        raise RuntimeError(f"save_feedback_batch failed for {len(processed)} items")
+
+    total = finished - began
+    return {
+        "items": len(processed),
+        "process_seconds": round(processed_at - began, 4),
+        "save_seconds": round(finished - processed_at, 4),
+        "seconds": round(total, 4),
+        "items_per_second": round(len(processed) / total, 1) if total else None,
+        "save_items_per_second": round(len(processed) / (finished - processed_at), 1) if finished > processed_at else None
+    }
+
+def run_fallback_cases(df, db_path: str) -> dict:
+    """
+    Time the FeedbackProcessor stages and its end-to-end batch.
+
+    Args:
+        df: Feedback corpus
+        db_path: Scratch database for the end-to-end case
+
+    Returns:
+        Dictionary of stage name to its measurements
+    """
+    from feedback_processor import FeedbackProcessor
+
+    processor = FeedbackProcessor()
+    texts = df["feedback_text"].astype(str).tolist()
+    cleaned = [processor.clean_text(text) for text in texts]
+    rows = list(zip(texts, df["source_type"].astype(str), df["date"]))
+
+    cases = {"clean": latency_stats(time_items(texts, processor.clean_text))}
+    for name, method in FALLBACK_STAGES:
+        cases[name] = latency_stats(time_items(cleaned, getattr(processor, method)))
+    cases["process_single_feedback"] = latency_stats(
+        time_items(rows, lambda row: processor.process_single_feedback(*row)))
+    cases["end_to_end"] = time_end_to_end(processor, df, db_path)
+    return cases
+
+def run_openai_cases(df, db_path: str, base_url: str) -> dict:
+    """
+    Time the EnhancedFeedbackProcessor API calls and its end-to-end batch against a mock server.
+
+    Args:
+        df: Feedback corpus (already cut to the items to send)
+        db_path: Scratch database for the end-to-end case
+        base_url: The mock server's OPENAI_BASE_URL
+
+    Returns:
+        Dictionary of stage name to its measurements
+    """
+    # The OpenAI client reads its endpoint from the environment when it is created
+    os.environ["OPENAI_BASE_URL"] = base_url
+    from enhanced_feedback_processor import EnhancedFeedbackProcessor
+
+    processor = EnhancedFeedbackProcessor(openai_api_key="benchmark")
+    cleaned = [processor.clean_text(text) for text in df["feedback_text"].astype(str)]
+
+    cases = {}
+    for name, method in OPENAI_STAGES:
+        cases[name] = latency_stats(time_items(cleaned, getattr(processor, method)))
+
+    rows = list(zip(df["feedback_text"].astype(str), df["source_type"].astype(str), df["date"]))
+    cases["openai_process_with_openai"] = latency_stats(
+        time_items(rows, lambda row: processor.process_with_openai(*row)))
+
+    # Short texts from non-support sources take the keyword fallback, as in production
+    cases["openai_end_to_end"] = time_end_to_end(processor, df, db_path)
+    cases["openai_end_to_end"]["openai_items"] = sum(
+        processor.should_use_openai(text, source) for text, source, _ in rows)
+    return cases
+
+def run_benchmark(sizes: list[int], seed: int = 42, openai_items: int = DEFAULT_OPENAI_ITEMS,
+                  openai_latency: float = DEFAULT_OPENAI_LATENCY, openai_jitter: float = DEFAULT_OPENAI_JITTER,
+                  workdir: str = None) -> dict:
+    """
+    Run every stage at every size.
+
+    Args:
+        sizes: Corpus sizes to benchmark
+        seed: Random seed for the corpora
+        openai_items: Items per size sent through the mock OpenAI server (0 skips those cases)
+        openai_latency: Mean simulated model latency in seconds
+        openai_jitter: Maximum deviation from openai_latency in seconds
+        workdir: Scratch directory for the databases (a temporary one by default)
+
+    Returns:
+        Dictionary with the environment and results[stage][size]
+    """
+    scratch = workdir or tempfile.mkdtemp(prefix="feedback_benchmark_")
+    os.makedirs(scratch, exist_ok=True)
+    results = {}
+    server = None
+    try:
+        if openai_items:
+            from mock_openai_server import start_server
+            server = start_server(latency=openai_latency, jitter=openai_jitter)
+
+        for size in sizes:
+            df = feedback_corpus(size, seed)
+            print(f"Benchmarking {size:,} feedback items...", flush=True)
+            cases = run_fallback_cases(df, os.path.join(scratch, f"feedback_{size}.db"))
+            if server is not None:
+                cases.update(run_openai_cases(df.head(openai_items), os.path.join(scratch, f"feedback_openai_{size}.db"),
+                                              server.base_url))
+            for case, measurement in cases.items():
+                results.setdefault(case, {})[str(size)] = measurement
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+        if workdir is None:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    return {
+        "environment": environment(),
+        "sizes": sizes,
+        "seed": seed,
+        "openai": {"items": openai_items, "latency": openai_latency, "jitter": openai_jitter,
+                   "requests_served": server.requests_served if server is not None else {}},
+        "results": results
+    }
+
+def summary(report: dict) -> str:
+    """
+    Format the results as a table, one row per stage and size.
+
+    Args:
+        report: Output of run_benchmark
+
+    Returns:
+        Multi-line string
+    """
+    lines = [f"{'stage':<28}{'size':>8}{'items/s':>12}" + "".join(f"{f'p{q} ms':>10}" for q in PERCENTILES)]
+    for case, by_size in report["results"].items():
+        for size, stats in by_size.items():
+            lines.append(f"{case:<28}{int(size):>8,}{stats['items_per_second'] or 0:>12,.1f}"
+                         + "".join(f"{stats[f'p{q}_ms']:>10.3f}" if f"p{q}_ms" in stats else f"{'-':>10}"
+                                   for q in PERCENTILES))
+    return "\n".join(lines)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark the feedback analysis stages')
+    parser.add_argument('--sizes', type=str, default=DEFAULT_SIZES,
+                        help='Comma-separated corpus sizes, e.g. 100,1k,10k,100k')
+    parser.add_argument('--seed', type=int, default=42,
+                        help='Random seed for the generated feedback')
+    parser.add_argument('--openai_items', type=int, default=DEFAULT_OPENAI_ITEMS,
+                        help='Items per size sent through the mock OpenAI server (0 skips those cases)')
+    parser.add_argument('--openai_latency', type=float, default=DEFAULT_OPENAI_LATENCY,
+                        help='Mean simulated OpenAI latency in seconds')
+    parser.add_argument('--openai_jitter', type=float, default=DEFAULT_OPENAI_JITTER,
+                        help='Maximum deviation from the simulated latency in seconds')
+    parser.add_argument('--workdir', type=str, default=None,
+                        help='Keep the benchmark databases in this directory')
+    parser.add_argument('--output', type=str, default=None,
+                        help='Write the results JSON here')
+
+    args = parser.parse_args()
+
+    report = run_benchmark([parse_size(size) for size in args.sizes.split(",")], args.seed, args.openai_items,
+                           args.openai_latency, args.openai_jitter, args.workdir)
+
+    print(summary(report))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
@@ -0,0 +1,375 @@
+"""
+Benchmark the pipeline stages and the chart endpoints at increasing data sizes.
+
+Run from the repository root:
+
+    python -m benchmarks.pipeline_benchmark --sizes 1k,10k,100k --output bench.json
+    python -m benchmarks.pipeline_benchmark --baseline benchmarks/pipeline_baseline.json
+    python -m benchmarks.pipeline_benchmark --sizes 1k,10k,100k --save_baseline benchmarks/pipeline_baseline.json
+
+Every case runs on the same seeded data. Sizes above CHUNK_ROWS are generated and timed
+in chunks, so 10M-row runs fit in memory; each size is loaded into its own database in
+a scratch directory, and the Flask endpoints are then timed against it with the test
+client. With --baseline, each case's seconds are compared with the baseline's and the
+run exits with status 1 if any is slower than its threshold allows.
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from financial_db import ConnectionPool, init_schema
+from ingestion_service import generate_mock_financial_data, generate_mock_income_statement
+from mock_data_generator import generate_mock_frame
+from standardization_service import (apply_standardization_rules, standardize_income_statement,
+                                     load_standardized_data_to_db)
+
+DEFAULT_SIZES = "1k,10k,100k"
+
+# Rows generated and timed per chunk (bounds memory for the 1M-10M sizes)
+CHUNK_ROWS = 250_000
+
+# Each symbol gets this many consecutive days, so (symbol, date) and record IDs stay
+# unique however many rows are generated
+DAYS_PER_SYMBOL = 3650
+
+# Allowed slowdown against the baseline (0.5 = 50% slower) unless the baseline sets a
+# per-case threshold. Best-of-5 timings on a shared single-CPU runner still drift by
+# about 30% between runs, so only bigger slowdowns fail the gate.
+DEFAULT_THRESHOLD = 0.5
+ENDPOINT_THRESHOLD = 0.5
+
+# Only sizes of at least this many rows, with baseline timings of at least this many
+# seconds, are gated; smaller cases are reported but too noisy to compare
+MIN_COMPARABLE_ROWS = 100_000
+MIN_COMPARABLE_SECONDS = 0.1
+
+# Runs per pipeline case (the fastest is reported)
+DEFAULT_REPEAT = 5
+
+# (case name, URL) of the chart endpoints, timed with an empty response cache
+ENDPOINTS = [
+    ("chart_data", "/api/chart_data?data_type=Historical%20Prices"),
+    ("chart_data_by_month", "/api/chart_data?data_type=Historical%20Prices&bucket=month"),
+    ("historical_chart_data", "/api/historical_chart_data/SYM0?data_type=Historical%20Prices&limit=500"),
+    ("historical_chart_data_by_month", "/api/historical_chart_data/SYM0?data_type=Historical%20Prices&bucket=month"),
+    ("data_types", "/api/data_types")
+]
+
+def parse_size(text: str) -> int:
+    """
+    Parse a row count like "10k" or "1m".
+
+    Args:
+        text: Count with an optional k/m suffix
+
+    Returns:
+        Number of rows
+    """
+    text = text.strip().lower()
+    multiplier = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    return int(float(text.rstrip("km")) * multiplier)
+
+def raw_frame(start: int, count: int, seed: int) -> pd.DataFrame:
+    """
+    Generate raw records start..start+count of a data set with unique record IDs.
+
+    Values come from mock_data_generator in mixed formats; descriptions and dates are
+    assigned so every record is a distinct (symbol, date) pair.
+
+    Args:
+        start: Index of the first record
+        count: Number of records
+        seed: Base random seed (the chunk's seed is derived from it and start)
+
+    Returns:
+        DataFrame with date, value and description columns
+    """
+    frame = generate_mock_frame(count, seed=seed + start, value_formats=["dollars", "thousands", "plain"])
+    position = np.arange(start, start + count)
+    dates = np.datetime64("2000-01-01") + (position % DAYS_PER_SYMBOL).astype("timedelta64[D]")
+    frame["date"] = dates.astype(str)
+    frame["description"] = "SYM" + pd.Series(position // DAYS_PER_SYMBOL).astype(str).to_numpy()
+    return frame[["date", "value", "description"]]
+
+def raw_records(start: int, count: int, seed: int) -> list[dict]:
+    return raw_frame(start, count, seed).to_dict("records")
+
+def standardized_records(start: int, count: int, seed: int) -> list[dict]:
+    with quiet():
+        records = apply_standardization_rules(raw_records(start, count, seed), "Historical Prices")
+    for record in records:
+        record["symbol"] = record["description"]
+    return records
+
+def income_statements(start: int, count: int, seed: int) -> list[dict]:
+    # Copies of the mock FMP statements; each one standardizes into four records, so
+    # size // 4 statements make size standardized rows
+    with quiet():
+        templates = generate_mock_income_statement("AAPL")
+    return [dict(templates[i % len(templates)]) for i in range(start, start + count)]
+
+@contextlib.contextmanager
+def quiet():
+    # The pipeline functions print progress; keep the benchmark output to the JSON
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+def time_chunked(size: int, make_input, run, seed: int) -> float:
+    """
+    Time run over a data set of size rows, generated (untimed) one chunk at a time.
+
+    Args:
+        size: Total rows
+        make_input: Callable (start, count, seed) -> the chunk's input
+        run: Callable taking one chunk's input
+        seed: Base random seed
+
+    Returns:
+        Seconds spent in run
+    """
+    seconds = 0.0
+    for start in range(0, size, CHUNK_ROWS):
+        data = make_input(start, min(CHUNK_ROWS, size - start), seed)
+        with quiet():
+            began = time.perf_counter()
+            run(data)
+            seconds += time.perf_counter() - began
+    return seconds
+
+def best_of(repeat: int, measure) -> float:
+    # The fastest of several runs is the least disturbed by other work on the machine
+    return min(measure() for _ in range(repeat))
+
+def throughput(size: int, seconds: float) -> dict:
+    return {"seconds": round(seconds, 4), "rows_per_second": round(size / seconds) if seconds else None}
+
+def run_pipeline_cases(size: int, repeat: int, seed: int, db_path: str) -> dict:
+    """
+    Time the pipeline functions on size rows.
+
+    Args:
+        size: Rows per case
+        repeat: Runs per case (the fastest is reported)
+        seed: Base random seed
+        db_path: Database the load cases write; left holding size rows for the endpoints
+
+    Returns:
+        Dictionary of case name to seconds and rows per second
+    """
+    def load(staging: bool):
+        def measure():
+            for path in (db_path, db_path + "-wal", db_path + "-shm"):
+                if os.path.exists(path):
+                    os.remove(path)
+            init_schema(db_path, force=True)
+            return time_chunked(size, standardized_records,
+                                lambda records: load_standardized_data_to_db(records, db_path, chunk_size=5000,
+                                                                             staging=staging), seed)
+        return best_of(repeat, measure)
+
+    return {
+        "generate_mock_financial_data": throughput(size, best_of(repeat, lambda: time_chunked(
+            size, lambda start, count, seed: count, generate_mock_financial_data, seed))),
+        "apply_standardization_rules": throughput(size, best_of(repeat, lambda: time_chunked(
+            size, raw_records, lambda records: apply_standardization_rules(records, "Historical Prices"), seed))),
+        "standardize_income_statement": throughput(size, best_of(repeat, lambda: time_chunked(
+            size // 4 or 1, income_statements, lambda records: standardize_income_statement(records, "Income Statement"),
+            seed))),
+        "load_standardized_data_to_db_staged": throughput(size, load(staging=True)),
+        "load_standardized_data_to_db": throughput(size, load(staging=False))
+    }
+
+def run_endpoint_cases(db_path: str, requests: int) -> dict:
+    """
+    Time the chart endpoints against a loaded database.
+
+    The response cache is cleared before every request, so each one runs its queries.
+
+    Args:
+        db_path: Database to serve
+        requests: Requests per endpoint
+
+    Returns:
+        Dictionary of case name to median (as seconds), p50 and p95 latency in ms
+    """
+    import app as flask_app
+
+    # Serve this size's database instead of the one app opened at import
+    flask_app.db_pool.close_all()
+    flask_app.DB_PATH = db_path
+    flask_app.db_pool = ConnectionPool(db_path, max_size=2)
+    client = flask_app.app.test_client()
+
+    results = {}
+    for name, url in ENDPOINTS:
+        latencies = []
+        for _ in range(requests):
+            flask_app.chart_data_cache.clear()
+            began = time.perf_counter()
+            response = client.get(url)
+            response.get_data()
+            latencies.append(time.perf_counter() - began)
+            if response.status_code != 200:
+                raise RuntimeError(f"{url} returned HTTP {response.status_code}")
+        latencies.sort()
+        median = statistics.median(latencies)
+        results[f"endpoint_{name}"] = {
+            "seconds": round(median, 5),
+            "p50_ms": round(median * 1000, 2),
+            "p95_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000, 2)
+        }
+    return results
+
+def environment() -> dict:
+    # Enough context to tell whether two result files are comparable
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "sqlite": sqlite3.sqlite_version
+    }
+
+def run_benchmark(sizes: list[int], repeat: int = DEFAULT_REPEAT, seed: int = 42, requests: int = 20,
+                  endpoints: bool = True, workdir: str = None) -> dict:
+    """
+    Run every case at every size.
+
+    Args:
+        sizes: Row counts to benchmark
+        repeat: Runs per pipeline case (the fastest is reported)
+        seed: Base random seed
+        requests: Requests per endpoint and size
+        endpoints: Also time the Flask endpoints
+        workdir: Scratch directory for the databases (a temporary one by default)
+
+    Returns:
+        Dictionary with the environment and results[case][size]
+    """
+    scratch = workdir or tempfile.mkdtemp(prefix="pipeline_benchmark_")
+    os.makedirs(scratch, exist_ok=True)
+    results = {}
+    cwd = os.getcwd()
+    try:
+        # app creates data.db, uploads/ and status files relative to the working directory
+        os.chdir(scratch)
+        for size in sizes:
+            db_path = os.path.join(scratch, f"bench_{size}.db")
+            print(f"Benchmarking {size:,} rows...", flush=True)
+            cases = run_pipeline_cases(size, repeat, seed, db_path)
+            if endpoints:
+                cases.update(run_endpoint_cases(db_path, requests))
+            for case, measurement in cases.items():
+                results.setdefault(case, {})[str(size)] = measurement
+    finally:
+        os.chdir(cwd)
+        if workdir is None:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    return {"environment": environment(), "sizes": sizes, "repeat": repeat, "seed": seed, "results": results}
+
+def compare(report: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> dict:
+    """
+    Compare a run's results with a baseline.
+
+    Args:
+        report: Output of run_benchmark
+        baseline: A previous report, optionally with "thresholds" mapping case names to
+                  their allowed slowdown
+        threshold: Allowed slowdown for cases without their own threshold
+
+    Returns:
+        Dictionary with regressions, improvements and the number of comparisons; each
+        entry has the case, size, baseline and current seconds and their ratio
+    """
+    thresholds = baseline.get("thresholds", {})
+    regressions, improvements, compared = [], [], 0
+    for case, by_size in report["results"].items():
+        default = ENDPOINT_THRESHOLD if case.startswith("endpoint_") else threshold
+        allowed = thresholds.get(case, default)
+        for size, measurement in by_size.items():
+            previous = baseline.get("results", {}).get(case, {}).get(size)
+            if (int(size) < MIN_COMPARABLE_ROWS or not previous or not measurement.get("seconds")
+                    or (previous.get("seconds") or 0) < MIN_COMPARABLE_SECONDS):
+                continue
+            compared += 1
+            ratio = measurement["seconds"] / previous["seconds"]
+            entry = {"case": case, "size": int(size), "baseline_seconds": previous["seconds"],
+                     "seconds": measurement["seconds"], "ratio": round(ratio, 3), "threshold": allowed}
+            if ratio > 1 + allowed:
+                regressions.append(entry)
+            elif ratio < 1 / (1 + allowed):
+                improvements.append(entry)
+    return {"compared": compared, "regressions": regressions, "improvements": improvements}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark the pipeline stages and chart endpoints')
+    parser.add_argument('--sizes', type=str, default=DEFAULT_SIZES,
+                        help='Comma-separated row counts, e.g. 1k,10k,100k,1m,10m')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                        help='Runs per pipeline case; the fastest is reported')
+    parser.add_argument('--requests', type=int, default=20,
+                        help='Requests per endpoint and size')
+    parser.add_argument('--seed', type=int, default=42,
+                        help='Random seed for the generated data')
+    parser.add_argument('--no_endpoints', action='store_true',
+                        help='Skip the Flask endpoint cases')
+    parser.add_argument('--workdir', type=str, default=None,
+                        help='Keep the benchmark databases in this directory')
+    parser.add_argument('--output', type=str, default=None,
+                        help='Write the results JSON here as well as to stdout')
+    parser.add_argument('--baseline', type=str, default=None,
+                        help='Baseline results JSON to compare against (exit 1 on regressions)')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Allowed slowdown against the baseline, e.g. 0.5 for 50%%')
+    parser.add_argument('--save_baseline', type=str, default=None,
+                        help='Write the results as a new baseline, keeping its thresholds')
+
+    args = parser.parse_args()
+
+    report = run_benchmark([parse_size(size) for size in args.sizes.split(",")], args.repeat, args.seed,
+                           args.requests, not args.no_endpoints, args.workdir)
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            report["comparison"] = compare(report, json.load(f), args.threshold)
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+
+    if args.save_baseline:
+        thresholds = {}
+        if os.path.exists(args.save_baseline):
+            with open(args.save_baseline, "r") as f:
+                thresholds = json.load(f).get("thresholds", {})
+        with open(args.save_baseline, "w") as f:
+            json.dump({**{key: value for key, value in report.items() if key != "comparison"},
+                       "thresholds": thresholds}, f, indent=2)
+
+    if report.get("comparison", {}).get("regressions"):
+        for entry in report["comparison"]["regressions"]:
+            print(f"REGRESSION {entry['case']} at {entry['size']:,} rows: {entry['seconds']}s vs "
+                  f"{entry['baseline_seconds']}s baseline ({entry['ratio']}x, allowed {1 + entry['threshold']:.2f}x)")
+        raise SystemExit(1)
@@ -0,0 +1,97 @@
+"""
+Benchmark value_parser against the original per-record cleaning on generated values.
+
+Run from the repository root:
+
+    python -m benchmarks.value_parser_benchmark --values 1000000
+"""
+import argparse
+import json
+import re
+import time
+import numpy as np
+import value_parser
+
+def legacy_parse_value(value_str: str) -> float:
+    # The per-record cleaning apply_standardization_rules used before value_parser
+    try:
+        return float(re.sub(r'[^\d.]', '', value_str.replace(',', '')))
+    except Exception:
+        return 0.0
+
+def generate_values(count: int, seed: int = 42) -> list[str]:
+    """
+    Generate raw values in the styles found in raw and uploaded data.
+
+    Args:
+        count: Number of values to generate
+        seed: Random seed, so runs are comparable
+
+    Returns:
+        List of raw value strings
+    """
+    rng = np.random.default_rng(seed)
+    amounts = rng.uniform(-5000000, 5000000, count)
+    styles = rng.integers(0, 6, count)
+
+    values = []
+    for amount, style in zip(amounts.tolist(), styles.tolist()):
+        if style == 0:
+            values.append(f"${amount:.2f}")
+        elif style == 1:
+            values.append(f"{int(amount):,}")
+        elif style == 2:
+            values.append(f"({abs(amount):,.2f})" if amount < 0 else f"{amount:,.2f}")
+        elif style == 3:
+            values.append(f"{amount / 1e6:.2f}M")
+        elif style == 4:
+            values.append(f"{amount / 1e3:.1f}K")
+        else:
+            values.append(f"{amount:.4f}")
+    return values
+
+def time_call(func, *args) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+def run_benchmark(values: list[str]) -> dict:
+    """
+    Parse the values with each implementation and check scalar and column modes agree.
+
+    Args:
+        values: Raw value strings
+
+    Returns:
+        Dictionary with timings (seconds and values per second) for each implementation
+    """
+    legacy_seconds, legacy = time_call(lambda: [legacy_parse_value(value) for value in values])
+    scalar_seconds, scalar = time_call(lambda: [value_parser.parse_value(value) for value in values])
+    column_seconds, column = time_call(value_parser.parse_value_column, values)
+
+    scalar = np.array(scalar, dtype=float)
+    if not np.allclose(scalar, column.to_numpy(), rtol=1e-12, equal_nan=True):
+        raise AssertionError("parse_value and parse_value_column disagree")
+
+    def stats(seconds):
+        return {"seconds": round(seconds, 4), "values_per_second": round(len(values) / seconds)}
+
+    return {
+        "values": len(values),
+        "legacy_regex_loop": stats(legacy_seconds),
+        "parse_value": stats(scalar_seconds),
+        "parse_value_column": stats(column_seconds),
+        "speedup_column": round(legacy_seconds / column_seconds, 1),
+        "legacy_wrong_values": int(np.sum(~np.isclose(np.array(legacy), scalar, rtol=1e-9)))
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark financial value parsing')
+    parser.add_argument('--values', type=int, default=1000000,
+                        help='Number of values to generate')
+    parser.add_argument('--seed', type=int, default=42,
+                        help='Random seed for value generation')
+
+    args = parser.parse_args()
+
+    print(json.dumps(run_benchmark(generate_values(args.values, args.seed)), indent=2))
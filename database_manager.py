@@ -2,17 +2,37 @@ import sqlite3
 import pandas as pd
 from datetime import datetime
 import json
+import os
+import threading
 
 class DatabaseManager:
+    # Database paths whose schema has already been initialized in this process
+    _initialized_paths = set()
+    _init_lock = threading.Lock()
+    
     def __init__(self, db_path='feedback.db'):
         self.db_path = db_path
-        self.init_database()
+        
+        # Run the schema DDL and default-goal inserts once per database per process
+        # (keyed on the absolute path, so a relative path isn't skipped after a chdir)
+        key = os.path.abspath(db_path)
+        with DatabaseManager._init_lock:
+            if key not in DatabaseManager._initialized_paths:
+                self.init_database()
+                DatabaseManager._initialized_paths.add(key)
+    
+    def _connect(self):
+        """Open a connection that waits for locks held by concurrent sessions"""
+        return sqlite3.connect(self.db_path, timeout=30)
     
     def init_database(self):
         """Initialize the database with required tables"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
+        # WAL lets dashboard reads proceed while another session is writing
+        cursor.execute('PRAGMA journal_mode=WAL')
+        
         # Create feedback table
         cursor.execute('''
         CREATE TABLE IF NOT EXISTS feedback_items (
@@ -74,7 +94,7 @@ class DatabaseManager:
     
     def save_feedback_batch(self, feedback_data):
         """Save a batch of processed feedback data"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         batch_id = f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
@@ -114,7 +134,7 @@ class DatabaseManager:
     
     def get_all_feedback(self):
         """Get all feedback data as a DataFrame"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         query = '''
         SELECT * FROM feedback_items 
         ORDER BY processed_date DESC
@@ -125,7 +145,7 @@ class DatabaseManager:
     
     def get_recent_feedback(self, limit=10):
         """Get recent feedback items"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         query = '''
         SELECT * FROM feedback_items 
         ORDER BY processed_date DESC 
@@ -137,7 +157,7 @@ class DatabaseManager:
     
     def get_category_distribution(self):
         """Get distribution of feedback by category"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         query = '''
         SELECT category, COUNT(*) as count 
         FROM feedback_items 
@@ -150,7 +170,7 @@ class DatabaseManager:
     
     def get_total_feedback_count(self):
         """Get total number of feedback items"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         cursor.execute('SELECT COUNT(*) FROM feedback_items')
         count = cursor.fetchone()[0]
@@ -159,7 +179,7 @@ class DatabaseManager:
     
     def get_average_priority(self):
         """Get average priority score"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         cursor.execute('SELECT AVG(priority_score) FROM feedback_items')
         avg = cursor.fetchone()[0]
@@ -168,7 +188,7 @@ class DatabaseManager:
     
     def get_feedback_processed_today(self):
         """Get number of feedback items processed today"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         today = datetime.now().strftime('%Y-%m-%d')
         cursor.execute('SELECT COUNT(*) FROM feedback_items WHERE date(processed_date) = ?', (today,))
@@ -178,7 +198,7 @@ class DatabaseManager:
     
     def get_strategic_goals(self):
         """Get all strategic goals"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         query = 'SELECT * FROM strategic_goals ORDER BY weight DESC'
         df = pd.read_sql_query(query, conn)
         conn.close()
@@ -186,7 +206,7 @@ class DatabaseManager:
     
     def add_strategic_goal(self, goal_name, description, weight):
         """Add a new strategic goal"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         try:
@@ -205,7 +225,7 @@ class DatabaseManager:
     
     def delete_strategic_goal(self, goal_id):
         """Delete a strategic goal"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         try:
@@ -221,7 +241,7 @@ class DatabaseManager:
     
     def get_feedback_by_category(self, category):
         """Get feedback items by category"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         query = '''
         SELECT * FROM feedback_items 
         WHERE category = ? 
@@ -233,7 +253,7 @@ class DatabaseManager:
     
     def get_feedback_by_source(self, source_type):
         """Get feedback items by source type"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         query = '''
         SELECT * FROM feedback_items 
         WHERE source_type = ? 
@@ -245,7 +265,7 @@ class DatabaseManager:
     
     def get_high_priority_feedback(self, min_priority=7.0):
         """Get high priority feedback items"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         query = '''
         SELECT * FROM feedback_items 
         WHERE priority_score >= ? 
@@ -257,7 +277,7 @@ class DatabaseManager:
     
     def get_processing_history(self):
         """Get processing history"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         query = '''
         SELECT * FROM processing_history 
         ORDER BY processing_date DESC
@@ -268,7 +288,7 @@ class DatabaseManager:
     
     def clear_all_data(self):
         """Clear all data from the database (for testing)"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         try:
@@ -0,0 +1,111 @@
+import datetime
+import re
+from functools import lru_cache
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+# Raw date formats we accept, in the order the standardization rules try them;
+# unparseable dates fall back to DEFAULT_DATE
+DATE_FORMATS = [
+    "%m/%d/%Y",    # MM/DD/YYYY
+    "%Y-%m-%d",    # YYYY-MM-DD
+    "%d-%b-%Y",    # DD-Mon-YYYY
+    "%b %d, %Y"    # Mon DD, YYYY
+]
+DEFAULT_DATE = "1900-01-01"
+
+MONTH_ABBREVIATIONS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12
+}
+
+# One precompiled pattern per format, each yielding (year, month, day) groups. The formats
+# use different separators, so at most one pattern can match a given string and at most
+# one strptime format could have accepted it.
+_DATE_PATTERNS = [
+    (re.compile(r"([0-9]{1,2})/([0-9]{1,2})/([0-9]{4})"), lambda m: (m[3], m[1], m[2])),
+    (re.compile(r"([0-9]{4})-([0-9]{1,2})-([0-9]{1,2})"), lambda m: (m[1], m[2], m[3])),
+    (re.compile(r"([0-9]{1,2})-([A-Za-z]{3})-([0-9]{4})"), lambda m: (m[3], m[2], m[1])),
+    (re.compile(r"([A-Za-z]{3})\s+([0-9]{1,2}),\s+([0-9]{4})"), lambda m: (m[3], m[1], m[2]))
+]
+
+def parse_date(value: str) -> Optional[str]:
+    """
+    Parse a raw date string in any of DATE_FORMATS to YYYY-MM-DD.
+
+    The format is picked with a regex dispatch instead of trying each strptime format
+    in turn, and results are memoized, since daily series repeat the same date strings
+    across symbols and runs.
+
+    Args:
+        value: Raw date string, e.g. "Jun 09, 2025", "16-Jan-2025" or "11/28/2024"
+
+    Returns:
+        YYYY-MM-DD string, or None if the value matches none of the formats
+
+    Raises:
+        TypeError: If value is not a string
+    """
+    if not isinstance(value, str):
+        raise TypeError(f"date must be str, not {type(value).__name__}")
+    return _parse_date_cached(value)
+
+@lru_cache(maxsize=65536)
+def _parse_date_cached(value: str) -> Optional[str]:
+    for pattern, fields in _DATE_PATTERNS:
+        match = pattern.fullmatch(value)
+        if match is None:
+            continue
+
+        year, month, day = fields(match)
+        month = int(month) if month.isdigit() else MONTH_ABBREVIATIONS.get(month.lower())
+        if month is None:
+            return None
+        try:
+            parsed = datetime.date(int(year), month, int(day))
+        except ValueError:
+            return None
+        return parsed.isoformat() if parsed.year >= 1000 else parsed.strftime("%Y-%m-%d")
+
+    # Rare spellings strptime accepts but the patterns don't (e.g. a space-padded day)
+    return _parse_date_strptime(value)
+
+def _parse_date_strptime(value: str) -> Optional[str]:
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(value, fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    return None
+
+def parse_date_column(dates, default: str = DEFAULT_DATE) -> pd.Series:
+    """
+    Parse a whole column of raw dates to YYYY-MM-DD.
+
+    Each distinct value is parsed once and the results are broadcast back over the
+    column, so the cost scales with the number of unique dates rather than rows.
+
+    Args:
+        dates: Sequence or Series of raw date values
+        default: Value used where a date can't be parsed (including non-strings)
+
+    Returns:
+        Series of YYYY-MM-DD strings
+    """
+    dates = pd.Series(dates, dtype=object)
+    codes, uniques = pd.factorize(dates, use_na_sentinel=True)
+
+    parsed = np.array(
+        [(_parse_date_cached(value) if isinstance(value, str) else None) or default for value in uniques]
+        + [default],  # missing values are coded -1, which indexes this last slot
+        dtype=object
+    )
+
+    return pd.Series(parsed[codes], index=dates.index, dtype=object)
+
+def clear_cache():
+    """
+    Drop memoized parse results (mainly useful for benchmarking cold runs).
+    """
+    _parse_date_cached.cache_clear()
@@ -16,11 +16,15 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Initialize session state
-if 'feedback_processor' not in st.session_state:
-    st.session_state.feedback_processor = FeedbackProcessor()
-if 'db_manager' not in st.session_state:
-    st.session_state.db_manager = DatabaseManager()
+@st.cache_resource
+def get_feedback_processor():
+    """Create the feedback processor shared by every session in this process"""
+    return FeedbackProcessor()
+
+@st.cache_resource
+def get_db_manager():
+    """Create the database manager shared by every session in this process"""
+    return DatabaseManager()
 
 def main():
     st.title("📊 Customer Feedback Analysis System")
@@ -45,9 +49,9 @@ def show_dashboard():
     st.header("📊 Feedback Dashboard")
     
     # Get summary statistics
-    total_feedback = st.session_state.db_manager.get_total_feedback_count()
-    categories = st.session_state.db_manager.get_category_distribution()
-    recent_feedback = st.session_state.db_manager.get_recent_feedback(5)
+    total_feedback = get_db_manager().get_total_feedback_count()
+    categories = get_db_manager().get_category_distribution()
+    recent_feedback = get_db_manager().get_recent_feedback(5)
     
     # Key metrics
     col1, col2, col3, col4 = st.columns(4)
@@ -56,7 +60,7 @@ def show_dashboard():
         st.metric("Total Feedback", total_feedback)
     
     with col2:
-        avg_priority = st.session_state.db_manager.get_average_priority()
+        avg_priority = get_db_manager().get_average_priority()
         st.metric("Avg Priority Score", f"{avg_priority:.2f}")
     
     with col3:
@@ -64,7 +68,7 @@ def show_dashboard():
         st.metric("Top Category", top_category)
     
     with col4:
-        processed_today = st.session_state.db_manager.get_feedback_processed_today()
+        processed_today = get_db_manager().get_feedback_processed_today()
         st.metric("Processed Today", processed_today)
     
     st.markdown("---")
@@ -115,10 +119,10 @@ def show_upload_page():
             if st.button("🚀 Process Feedback", type="primary"):
                 with st.spinner("Processing feedback..."):
                     # Process the feedback
-                    processed_data = st.session_state.feedback_processor.process_feedback_batch(df)
+                    processed_data = get_feedback_processor().process_feedback_batch(df)
                     
                     # Save to database
-                    st.session_state.db_manager.save_feedback_batch(processed_data)
+                    get_db_manager().save_feedback_batch(processed_data)
                     
                     st.success(f"✅ Successfully processed {len(processed_data)} feedback items!")
                     
@@ -162,7 +166,7 @@ def show_analysis_page():
     st.header("📈 Feedback Analysis")
     
     # Get all feedback data
-    all_feedback = st.session_state.db_manager.get_all_feedback()
+    all_feedback = get_db_manager().get_all_feedback()
     
     if all_feedback.empty:
         st.warning("No feedback data available. Please upload some data first.")
@@ -234,7 +238,7 @@ def show_settings_page():
     # Strategic goals management
     st.subheader("🎯 Strategic Goals")
     
-    goals = st.session_state.db_manager.get_strategic_goals()
+    goals = get_db_manager().get_strategic_goals()
     
     if not goals.empty:
         st.dataframe(goals, use_container_width=True)
@@ -247,7 +251,7 @@ def show_settings_page():
         
         if st.button("Add Goal"):
             if new_goal_name and new_goal_description:
-                st.session_state.db_manager.add_strategic_goal(
+                get_db_manager().add_strategic_goal(
                     new_goal_name, new_goal_description, new_goal_weight
                 )
                 st.success("✅ Goal added successfully!")
@@ -255,9 +259,9 @@ def show_settings_page():
     
     # System information
     st.subheader("ℹ️ System Information")
-    st.info(f"Database: {st.session_state.db_manager.db_path}")
-    st.info(f"Total feedback items: {st.session_state.db_manager.get_total_feedback_count()}")
-    st.info(f"Categories: {len(st.session_state.db_manager.get_category_distribution())}")
+    st.info(f"Database: {get_db_manager().db_path}")
+    st.info(f"Total feedback items: {get_db_manager().get_total_feedback_count()}")
+    st.info(f"Categories: {len(get_db_manager().get_category_distribution())}")
 
 if __name__ == "__main__":
     main()
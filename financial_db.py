@@ -0,0 +1,387 @@
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+
+# Default SQLite database shared by the pipeline and the Flask app
+DB_PATH = 'data.db'
+
+# Descriptions that are stock tickers (e.g. "AAPL", "BRK.B"); records without an
+# explicit symbol only fall back to their description when it matches
+TICKER_PATTERN = re.compile(r"^[A-Z][A-Z0-9]{0,9}(?:[.\-][A-Z0-9]{1,4})?$")
+
+# Per-connection pragmas applied to every connection we hand out
+CONNECTION_PRAGMAS = [
+    "PRAGMA synchronous=NORMAL",    # Safe with WAL, avoids an fsync per commit
+    "PRAGMA busy_timeout=5000",     # Wait for writers instead of failing with 'database is locked'
+    "PRAGMA cache_size=-20000",     # ~20 MB page cache
+    "PRAGMA temp_store=MEMORY",     # Keep GROUP BY/ORDER BY temp b-trees in memory
+    "PRAGMA mmap_size=268435456",   # Memory-map up to 256 MB of the database file
+    "PRAGMA recursive_triggers=ON"  # Rows deleted by INSERT OR REPLACE fire delete triggers (keeps table_stats exact)
+]
+
+# Tables whose row counts are tracked in table_stats by triggers
+TRACKED_TABLES = ["standardized_financial_data"]
+
+# pipeline_runs_history columns added after the original (run_id, timestamp, status,
+# records_processed); per-stage timings live in pipeline_stage_metrics
+RUN_HISTORY_COLUMNS = {
+    "details": "TEXT",            # JSON, e.g. per-symbol batch stats
+    "run_type": "TEXT",           # single, batch or upload
+    "symbol": "TEXT",             # NULL for batches (see parameters)
+    "data_type": "TEXT",          # Comma-separated for batches over several types
+    "parameters": "TEXT",         # JSON of the run's arguments
+    "duration_seconds": "REAL",
+    "rows_per_second": "REAL",
+    "error_count": "INTEGER",     # Failed runs or symbol/data type pairs
+    "error": "TEXT",
+    "source_bytes": "INTEGER"     # Raw input size (compressed archive bytes for pipeline runs)
+}
+
+# Database paths whose schema has already been verified in this process
+_initialized_paths = set()
+_init_lock = threading.Lock()
+
+def connect(db_path: str = DB_PATH, row_factory=None, check_same_thread: bool = True) -> sqlite3.Connection:
+    """
+    Open a SQLite connection with the tuned pragmas applied.
+
+    Args:
+        db_path: Path to the SQLite database file
+        row_factory: Optional row factory (e.g. sqlite3.Row)
+        check_same_thread: Set to False for connections handed between threads by a pool
+
+    Returns:
+        Configured sqlite3 connection
+    """
+    conn = sqlite3.connect(db_path, timeout=5, check_same_thread=check_same_thread)
+    if row_factory is not None:
+        conn.row_factory = row_factory
+
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+
+    return conn
+
+def init_schema(db_path: str = DB_PATH, force: bool = False):
+    """
+    Create the pipeline tables if they don't exist and switch the database to WAL mode.
+
+    This only touches the database the first time it is called for a given path in the
+    current process, so callers can invoke it freely at startup.
+
+    Args:
+        db_path: Path to the SQLite database file
+        force: Re-run the schema checks even if they already ran in this process
+    """
+    # Relative paths name a different file after a chdir, so remember absolute ones
+    initialized_key = os.path.abspath(db_path)
+    with _init_lock:
+        if initialized_key in _initialized_paths and not force:
+            return
+
+        conn = connect(db_path)
+        cursor = conn.cursor()
+
+        # WAL is persistent in the database file, so it only needs to be set once
+        cursor.execute("PRAGMA journal_mode=WAL")
+
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS standardized_financial_data (
+            id TEXT PRIMARY KEY,
+            date TEXT,
+            value REAL,
+            description TEXT,
+            data_type TEXT,
+            symbol TEXT,
+            content_hash TEXT
+        )
+        ''')
+
+        # Symbol dimension: one row per normalized symbol, so partial symbol lookups
+        # scan this small table instead of the fact table
+        symbols_table_exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='financial_symbols'"
+        ).fetchone()
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS financial_symbols (
+            symbol TEXT PRIMARY KEY
+        )
+        ''')
+
+        # Databases created before the symbol column existed: add and backfill it
+        columns = [row[1] for row in cursor.execute("PRAGMA table_info(standardized_financial_data)")]
+        if "symbol" not in columns:
+            cursor.execute("ALTER TABLE standardized_financial_data ADD COLUMN symbol TEXT")
+            # Only descriptions that are tickers become symbols; free text stays NULL
+            cursor.executemany(
+                "UPDATE standardized_financial_data SET symbol = ? WHERE rowid = ?",
+                [(symbol, rowid) for rowid, description in
+                 cursor.execute("SELECT rowid, description FROM standardized_financial_data").fetchall()
+                 if (symbol := description_symbol(description))]
+            )
+            symbols_table_exists = None
+
+        # Content hashes for incremental loads; rows loaded before this have none and
+        # are rewritten the next time they are loaded
+        if "content_hash" not in columns:
+            cursor.execute("ALTER TABLE standardized_financial_data ADD COLUMN content_hash TEXT")
+
+        if not symbols_table_exists:
+            cursor.execute('''
+            INSERT OR IGNORE INTO financial_symbols (symbol)
+            SELECT DISTINCT symbol FROM standardized_financial_data WHERE symbol IS NOT NULL
+            ''')
+
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_financial_data_symbol_type_date
+        ON standardized_financial_data (symbol, data_type, date)
+        ''')
+
+        # Row counts maintained by triggers, so loaders can report table sizes without a scan
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS table_stats (
+            table_name TEXT PRIMARY KEY,
+            row_count INTEGER NOT NULL
+        )
+        ''')
+
+        for table_name in TRACKED_TABLES:
+            cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table_name}_count_insert AFTER INSERT ON {table_name}
+            BEGIN
+                UPDATE table_stats SET row_count = row_count + 1 WHERE table_name = '{table_name}';
+            END
+            ''')
+            cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table_name}_count_delete AFTER DELETE ON {table_name}
+            BEGIN
+                UPDATE table_stats SET row_count = row_count - 1 WHERE table_name = '{table_name}';
+            END
+            ''')
+
+            # Seed the count once; the triggers already exist, so no concurrent insert is missed
+            cursor.execute(f'''
+            INSERT OR IGNORE INTO table_stats (table_name, row_count)
+            SELECT '{table_name}', COUNT(*) FROM {table_name}
+            ''')
+
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS pipeline_runs_history (
+            run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TEXT,
+            status TEXT,
+            records_processed INTEGER,
+            details TEXT
+        )
+        ''')
+
+        # Run details and the structured run columns were added after the table
+        columns = [row[1] for row in cursor.execute("PRAGMA table_info(pipeline_runs_history)")]
+        for column, column_type in RUN_HISTORY_COLUMNS.items():
+            if column not in columns:
+                cursor.execute(f"ALTER TABLE pipeline_runs_history ADD COLUMN {column} {column_type}")
+
+        # Run history pages are keyset-paginated on run_id, optionally filtered
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_pipeline_runs_data_type
+        ON pipeline_runs_history (data_type, run_id)
+        ''')
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_pipeline_runs_status
+        ON pipeline_runs_history (status, run_id)
+        ''')
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_pipeline_runs_symbol
+        ON pipeline_runs_history (symbol, run_id)
+        ''')
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_pipeline_runs_timestamp
+        ON pipeline_runs_history (timestamp)
+        ''')
+
+        # Per-stage timings and counters for each run (see pipeline_metrics.py)
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS pipeline_stage_metrics (
+            run_id INTEGER NOT NULL REFERENCES pipeline_runs_history(run_id),
+            stage TEXT NOT NULL,
+            seconds REAL,
+            wait_seconds REAL,
+            records_in INTEGER,
+            records_out INTEGER,
+            bytes INTEGER,
+            rows_per_second REAL,
+            process_peak_rss_mb REAL,
+            PRIMARY KEY (run_id, stage)
+        )
+        ''')
+
+        # Pipeline jobs queued from the web app (see job_queue.py), shared by all server
+        # processes; the partial unique index allows one in-flight job per symbol and data type
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS pipeline_jobs (
+            job_id TEXT PRIMARY KEY,
+            symbol TEXT NOT NULL,
+            data_type TEXT NOT NULL,
+            status TEXT NOT NULL,
+            submitted_at TEXT,
+            started_at TEXT,
+            finished_at TEXT,
+            queue_seconds REAL,
+            run_seconds REAL,
+            result TEXT,
+            error TEXT,
+            worker_pid INTEGER
+        )
+        ''')
+        cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_pipeline_jobs_in_flight
+        ON pipeline_jobs (symbol, data_type) WHERE status IN ('queued', 'running')
+        ''')
+
+        # The RSS column was first named peak_memory_mb, but it holds the process's lifetime
+        # peak rather than the stage's
+        columns = [row[1] for row in cursor.execute("PRAGMA table_info(pipeline_stage_metrics)")]
+        if "peak_memory_mb" in columns:
+            cursor.execute("ALTER TABLE pipeline_stage_metrics RENAME COLUMN peak_memory_mb TO process_peak_rss_mb")
+
+        conn.commit()
+        conn.close()
+
+        _initialized_paths.add(initialized_key)
+
+def get_row_count(conn: sqlite3.Connection, table_name: str = "standardized_financial_data") -> int:
+    """
+    Get the row count of a tracked table from table_stats instead of scanning it.
+
+    Args:
+        conn: Open database connection
+        table_name: One of TRACKED_TABLES
+
+    Returns:
+        Number of rows in the table
+    """
+    row = conn.execute("SELECT row_count FROM table_stats WHERE table_name = ?", (table_name,)).fetchone()
+    return row[0] if row else 0
+
+def normalize_symbol(value) -> str:
+    """
+    Normalize a ticker symbol for storage and lookup (trimmed, upper case).
+
+    Args:
+        value: Raw symbol, e.g. " aapl"
+
+    Returns:
+        Normalized symbol, e.g. "AAPL" (empty string for None)
+    """
+    return str(value or "").strip().upper()
+
+def description_symbol(description):
+    """
+    Get the symbol a description stands for, if it is a ticker.
+
+    Pipeline records carry the ticker in the description field when they have no
+    explicit symbol; free-text descriptions (e.g. "Travel expense") are not symbols.
+
+    Args:
+        description: Raw description, e.g. "MSFT" or "Net Income"
+
+    Returns:
+        The trimmed ticker, or None if the description isn't one
+    """
+    description = str(description or "").strip()
+    return description if TICKER_PATTERN.match(description) else None
+
+class ConnectionPool:
+    """
+    A small pool of configured connections reused across requests.
+
+    Reusing connections keeps SQLite's page cache and prepared statement cache warm,
+    which a fresh connection per request would throw away.
+    """
+
+    def __init__(self, db_path: str = DB_PATH, max_size: int = 8, row_factory=sqlite3.Row):
+        self.db_path = db_path
+        self.row_factory = row_factory
+        self._idle = queue.LifoQueue(maxsize=max_size)
+
+    def acquire(self) -> sqlite3.Connection:
+        """
+        Take an idle connection from the pool, or open a new one if none is idle.
+        """
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return connect(self.db_path, row_factory=self.row_factory, check_same_thread=False)
+
+    def release(self, conn: sqlite3.Connection):
+        """
+        Return a connection to the pool, closing it if the pool is already full.
+        """
+        # Never hand a connection with an open transaction to the next request
+        if conn.in_transaction:
+            conn.rollback()
+
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def close_all(self):
+        """
+        Close every idle connection in the pool.
+        """
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+def _data_version_path(db_path: str) -> str:
+    return f"{db_path}.version"
+
+def get_data_version(db_path: str = DB_PATH) -> str:
+    """
+    Get the current data version stamp for a database.
+
+    The stamp lives in a small file next to the database so that readers can check it
+    without touching SQLite, and so bumps made by pipeline subprocesses are visible to
+    the web server.
+
+    Args:
+        db_path: Path to the SQLite database file
+
+    Returns:
+        Opaque version string ("0" if the data has never been written)
+    """
+    try:
+        with open(_data_version_path(db_path), "r") as f:
+            return f.read().strip() or "0"
+    except FileNotFoundError:
+        return "0"
+
+def bump_data_version(db_path: str = DB_PATH) -> str:
+    """
+    Record that standardized data in the database has changed.
+
+    Call this after committing writes to standardized_financial_data so that cached
+    responses built from the old data are invalidated.
+
+    Args:
+        db_path: Path to the SQLite database file
+
+    Returns:
+        The new version string
+    """
+    version = str(time.time_ns())
+    version_path = _data_version_path(db_path)
+    tmp_path = f"{version_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+    # Write then rename so readers never see a partially written stamp
+    with open(tmp_path, "w") as f:
+        f.write(version)
+    os.replace(tmp_path, version_path)
+
+    return version
@@ -0,0 +1,22 @@
+import multiprocessing
+import os
+
+# Gunicorn settings for serving the Flask dashboard: `gunicorn -c gunicorn.conf.py wsgi:app`
+bind = os.getenv("BIND", "127.0.0.1:5000")
+
+# One process per core, each with a pool of threads. Requests are mostly SQLite reads,
+# which release the GIL, so threads give cheap concurrency inside each worker.
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", 8))
+
+# Each worker runs up to PIPELINE_WORKERS pipeline jobs. Job state is stored in SQLite, so
+# /api/jobs/<id> answers from any worker; a job whose worker is recycled before it finishes
+# is reported as failed.
+
+# Recycle workers periodically to bound memory growth
+max_requests = 5000
+max_requests_jitter = 500
+
+timeout = 120
+keepalive = 5
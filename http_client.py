@@ -0,0 +1,194 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from urllib.parse import urlencode
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Base URL of the Financial Modeling Prep API; set FMP_BASE_URL to point the client
+# elsewhere (e.g. at mock_fmp_server.py for local runs)
+DEFAULT_FMP_BASE_URL = "https://financialmodelingprep.com/api/v3"
+
+# On-disk response cache, shared across pipeline runs and processes (HTTP_CACHE_DIR overrides)
+DEFAULT_CACHE_DIR = ".http_cache"
+
+# Seconds a cached response is served without contacting the server, per endpoint
+# (first path segment). Statements only change quarterly; quotes go stale quickly.
+CACHE_TTLS = {
+    "income-statement": 24 * 3600,
+    "balance-sheet-statement": 24 * 3600,
+    "cash-flow-statement": 24 * 3600,
+    "profile": 6 * 3600,
+    "historical-price-full": 3600,
+    "quote": 60
+}
+DEFAULT_CACHE_TTL = 300
+
+# Query parameters left out of cache keys so changing credentials doesn't drop the cache
+_UNCACHED_PARAMS = {"apikey"}
+
+def is_error_payload(body) -> bool:
+    """
+    Check whether a decoded FMP response is an error message rather than data.
+
+    Args:
+        body: Decoded JSON body
+
+    Returns:
+        True for {"Error Message": ...} objects
+    """
+    return isinstance(body, dict) and "Error Message" in body
+
+class HttpClient:
+    """
+    A pooled, retrying HTTP client with an on-disk conditional-request cache.
+
+    One requests Session is shared by every call, so keep-alive connections (and their
+    TLS sessions) are reused across symbols. Failed requests are retried with
+    exponential backoff plus jitter. Responses are cached on disk with their ETag and
+    Last-Modified headers: within the endpoint's TTL they are served without a request,
+    and after it they are revalidated with If-None-Match/If-Modified-Since, so an
+    unchanged statement costs a 304 instead of a full download.
+    """
+
+    def __init__(self, base_url: str = None, cache_dir: str = None, cache_ttls: dict = None,
+                 pool_size: int = 16, retries: int = 3, backoff_factor: float = 0.5, timeout: float = 10):
+        # Environment overrides are read here rather than at import, after .env is loaded
+        self.base_url = (base_url or os.getenv("FMP_BASE_URL") or DEFAULT_FMP_BASE_URL).rstrip("/")
+        self.cache_dir = cache_dir or os.getenv("HTTP_CACHE_DIR") or DEFAULT_CACHE_DIR
+        self.cache_ttls = CACHE_TTLS if cache_ttls is None else cache_ttls
+        self.timeout = timeout
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            backoff_jitter=backoff_factor,        # spreads out retries from concurrent workers
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET"],
+            respect_retry_after_header=True,
+            raise_on_status=False                 # hand the final response back instead of raising
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get_json(self, path: str, params: dict = None, ttl: float = None):
+        """
+        GET a JSON endpoint, using the on-disk cache where possible.
+
+        Args:
+            path: Endpoint path relative to base_url, e.g. "income-statement/AAPL"
+            params: Query parameters
+            ttl: Seconds a cached response stays fresh (defaults to the endpoint's TTL)
+
+        Returns:
+            Decoded JSON body
+
+        Raises:
+            requests.HTTPError: If the server answers with an error status after retries
+            requests.RequestException: On connection failures and timeouts
+        """
+        params = params or {}
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        if ttl is None:
+            ttl = self.cache_ttls.get(path.strip("/").split("/")[0], DEFAULT_CACHE_TTL)
+
+        cache_path = self._cache_path(url, params)
+        entry = self._read_cache(cache_path)
+        if entry is not None and time.time() - entry["fetched_at"] < ttl:
+            self.hits += 1
+            return entry["body"]
+
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+
+        if response.status_code == 304 and entry is not None:
+            self.revalidated += 1
+            entry["fetched_at"] = time.time()
+            self._write_cache(cache_path, entry)
+            return entry["body"]
+
+        response.raise_for_status()
+        self.misses += 1
+        body = response.json()
+
+        # FMP reports some errors (quota exhausted, bad symbol) as HTTP 200 with an error
+        # object; caching one would serve the error for the endpoint's whole TTL
+        if is_error_payload(body):
+            return body
+
+        self._write_cache(cache_path, {
+            "url": url,
+            "fetched_at": time.time(),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "body": body
+        })
+        return body
+
+    def clear_cache(self):
+        """
+        Delete every cached response.
+        """
+        if not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".json"):
+                os.remove(os.path.join(self.cache_dir, name))
+
+    def close(self):
+        """
+        Close the pooled connections.
+        """
+        self.session.close()
+
+    def _cache_path(self, url: str, params: dict) -> str:
+        query = urlencode(sorted((k, v) for k, v in params.items() if k not in _UNCACHED_PARAMS))
+        key = hashlib.sha256(f"{url}?{query}".encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _read_cache(self, cache_path: str):
+        try:
+            with open(cache_path, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _write_cache(self, cache_path: str, entry: dict):
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        # Write then rename so concurrent readers never see a partial entry
+        tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entry, f, separators=(",", ":"))
+        os.replace(tmp_path, cache_path)
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_client() -> HttpClient:
+    """
+    Get the process-wide HTTP client, creating it on first use.
+
+    Returns:
+        Shared HttpClient for the configured FMP base URL
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
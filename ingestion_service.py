@@ -4,13 +4,28 @@ import random
 import datetime
 import uuid
 import requests
-import math
 from typing import List, Dict, Any, Optional
 from dotenv import load_dotenv
+from http_client import get_client, is_error_payload
+from mock_data_generator import frame_records, generate_mock_frame, iter_mock_records
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Mock records are spread one per day over this many days ending today (further ahead
+# when there are more records than days)
+MOCK_DATA_DAYS = 365
+
+# Records generated per NumPy batch when streaming mock data
+MOCK_CHUNK_SIZE = 10000
+
+def _mock_data_options(num_records: int) -> dict:
+    # Dates start MOCK_DATA_DAYS ago, one record per day when there are more records than
+    # days; IDs get a per-call prefix so records from different runs never share one
+    days = max(MOCK_DATA_DAYS, num_records)
+    end_date = datetime.date.today() + datetime.timedelta(days=days - MOCK_DATA_DAYS)
+    return {"end_date": end_date, "days": days, "id_prefix": f"{uuid.uuid4().hex}-"}
+
 def generate_mock_financial_data(num_records: int, category: str = "Historical Prices") -> list[dict]:
     """
     Generate mock financial data records.
@@ -22,91 +37,46 @@ def generate_mock_financial_data(num_records: int, category: str = "Historical P
     Returns:
         List of dictionaries containing mock financial records
     """
-    records = []
-    
-    # Sample descriptions based on category
-    if category == "Revenue":
-        descriptions = [
-            "Product Sales", "Service Revenue", "Subscription Income",
-            "Licensing Fees", "Advertising Revenue"
-        ]
-        value_range = (100000, 5000000)  # Higher values for revenue
-    elif category == "Expenses":
-        descriptions = [
-            "Operating Expenses", "Marketing Costs", "R&D Expenses",
-            "Administrative Costs", "Infrastructure Expenses"
-        ]
-        value_range = (50000, 2000000)  # Moderate values for expenses
-    else:
-        # Default to historical prices
-        descriptions = [
-            "Stock Price", "Market Value", "Trading Price",
-            "Share Value", "Equity Price"
-        ]
-        value_range = (10, 1000)  # Lower values for stock prices
-    
-    # Date formats - standardize to YYYY-MM-DD for better consistency
-    date_formats = [
-        "%Y-%m-%d",    # YYYY-MM-DD
-    ]
-    
-    # Generate sequential dates within the last year for better visualization
-    end_date = datetime.datetime.now()
-    start_date = end_date - datetime.timedelta(days=365)
-    date_range = (end_date - start_date).days
+    if num_records <= 0:
+        return []
+    return frame_records(generate_mock_frame(num_records, category, **_mock_data_options(num_records)))
+
+def iter_mock_financial_data(num_records: int, category: str = "Historical Prices"):
+    """
+    Lazily generate mock financial data records.
     
-    # Create evenly distributed dates
-    date_step = max(1, date_range // num_records)
+    Produces the same kind of records as generate_mock_financial_data, built
+    MOCK_CHUNK_SIZE at a time, without holding them all in memory.
     
-    for i in range(num_records):
-        # Generate sequential date
-        days_offset = i * date_step
-        current_date = start_date + datetime.timedelta(days=days_offset)
-        date_format = date_formats[0]  # Use consistent format
-        date_str = current_date.strftime(date_format)
-        
-        # Generate value with trend and some randomness
-        base_value = random.uniform(*value_range)
-        
-        # Add trend component based on category
-        if category == "Revenue":
-            # Upward trend for revenue with seasonal variations
-            trend_factor = 1.0 + (i / num_records) * 0.5  # 50% growth over the period
-            seasonal = 0.2 * math.sin(i * (2 * math.pi / (num_records / 4)))  # Quarterly seasonality
-            value = base_value * trend_factor * (1 + seasonal)
-        elif category == "Expenses":
-            # Slightly upward trend for expenses with less variation
-            trend_factor = 1.0 + (i / num_records) * 0.3  # 30% growth over the period
-            seasonal = 0.1 * math.sin(i * (2 * math.pi / (num_records / 2)))  # Biannual seasonality
-            value = base_value * trend_factor * (1 + seasonal)
-        else:
-            # More volatile for stock prices with overall upward trend
-            trend_factor = 1.0 + (i / num_records) * 0.4  # 40% growth over the period
-            volatility = 0.3 * (random.random() - 0.5)  # Random volatility
-            value = base_value * trend_factor * (1 + volatility)
-        
-        # Format with different styles
-        if random.choice([True, False]):
-            value_str = f"${value:.2f}"
-        else:
-            value_str = f"{int(value):,}"
-        
-        # Create record
-        record = {
-            "id": str(uuid.uuid4()),
-            "date": date_str,
-            "value": value_str,
-            "description": random.choice(descriptions)
-        }
+    Args:
+        num_records: Number of records to generate
+        category: Type of financial data to generate ("Historical Prices", "Revenue", "Expenses")
         
-        records.append(record)
+    Yields:
+        Dictionaries containing mock financial records
+    """
+    yield from iter_mock_records(num_records, category, chunk_size=MOCK_CHUNK_SIZE,
+                                 **_mock_data_options(num_records))
+
+def get_fmp_api_key() -> Optional[str]:
+    """
+    Get the Financial Modeling Prep API key from the environment.
     
-    return records
+    Returns:
+        The API key, or None if it is missing or still a placeholder
+    """
+    api_key = os.getenv("FMP_API_KEY")
+    if not api_key or api_key in ["your_api_key_here", "test_financial_pipeline_key_123456"]:
+        return None
+    return api_key
 
 def fetch_income_statement_from_fmp(symbol: str, period: str = 'annual') -> List[Dict[str, Any]]:
     """
     Fetch income statement data from Financial Modeling Prep API.
     
+    Requests go through the shared pooled HTTP client, which retries transient errors
+    and serves statements from its on-disk cache (revalidating them once stale).
+    
     Args:
         symbol: Stock symbol (e.g., 'AAPL')
         period: Data period ('annual' or 'quarter')
@@ -115,39 +85,39 @@ def fetch_income_statement_from_fmp(symbol: str, period: str = 'annual') -> List
         List of dictionaries containing income statement data
     """
     # API key for Financial Modeling Prep from environment variable
-    api_key = os.getenv("FMP_API_KEY")
+    api_key = get_fmp_api_key()
     
     # Check if API key is valid
-    if not api_key or api_key in ["your_api_key_here", "test_financial_pipeline_key_123456"]:
+    if not api_key:
         print("Warning: Invalid or missing API key. Using mock data instead.")
         print("Please update your .env file with a valid FMP API key from https://financialmodelingprep.com/developer/docs/pricing")
         return generate_mock_income_statement(symbol, period)
     
-    # FMP API endpoint for income statements
-    url = f"https://financialmodelingprep.com/api/v3/income-statement/{symbol}?period={period}&apikey={api_key}"
-    
     try:
-        # Make API request
-        response = requests.get(url, timeout=10)
+        # FMP API endpoint for income statements (base URL configurable via FMP_BASE_URL)
+        data = get_client().get_json(f"income-statement/{symbol}", params={"period": period, "apikey": api_key})
         
-        # Check if request was successful
-        if response.status_code == 200:
-            data = response.json()
-            
-            # Check if data is empty
-            if not data:
-                print(f"No income statement data found for symbol: {symbol}")
-                # Generate mock income statement data for demo purposes
-                return generate_mock_income_statement(symbol, period)
-                
-            print(f"Successfully fetched income statement data for {symbol}: {len(data)} periods")
-            return data
-        else:
-            print(f"Error fetching income statement data: HTTP {response.status_code}")
-            print(f"Response: {response.text}")
+        # Check if data is empty
+        if not data:
+            print(f"No income statement data found for symbol: {symbol}")
+            # Generate mock income statement data for demo purposes
+            return generate_mock_income_statement(symbol, period)
+        
+        # FMP reports quota and key errors as HTTP 200 with an error message
+        if is_error_payload(data):
+            print(f"Error fetching income statement data: {data['Error Message']}")
             # Generate mock income statement data for demo purposes
             return generate_mock_income_statement(symbol, period)
             
+        print(f"Successfully fetched income statement data for {symbol}: {len(data)} periods")
+        return data
+    
+    except requests.HTTPError as e:
+        print(f"Error fetching income statement data: HTTP {e.response.status_code}")
+        print(f"Response: {e.response.text}")
+        # Generate mock income statement data for demo purposes
+        return generate_mock_income_statement(symbol, period)
+            
     except Exception as e:
         print(f"Exception while fetching income statement data: {str(e)}")
         # Generate mock income statement data for demo purposes
@@ -262,6 +232,9 @@ def save_raw_data(data: List[Dict[str, Any]], filename: str, data_type: str = "H
     """
     Save generated data to a JSON file in the raw_data directory.
     
+    Pipeline runs archive raw records with raw_archive instead; this writes a
+    standalone, human-readable file.
+    
     Args:
         data: List of dictionaries containing financial records
         filename: Name of the file to save data to
@@ -0,0 +1,250 @@
+import datetime
+import json
+import os
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from financial_db import DB_PATH, ConnectionPool, init_schema, normalize_symbol
+
+# Attempts at recording a job's final state before giving up on it
+FINISH_ATTEMPTS = 3
+
+# IDs of jobs queued or running in this process, by any queue. A row whose worker_pid is
+# this process but whose ID isn't here was left behind by an earlier process that had
+# the same PID (e.g. PID 1 in a restarted container).
+_local_jobs = set()
+_local_jobs_lock = threading.Lock()
+
+# Columns of pipeline_jobs returned as a job snapshot
+JOB_COLUMNS = ["job_id", "symbol", "data_type", "status", "submitted_at", "started_at", "finished_at",
+               "queue_seconds", "run_seconds", "result", "error"]
+
+class PipelineJobQueue:
+    """
+    Queue running pipeline jobs on a bounded pool of worker threads.
+
+    Job state lives in the pipeline_jobs table, so every web server process sees every
+    job: a status poll can land on any gunicorn worker, not just the one that queued
+    the run. Identical (symbol, data_type) requests that are already queued or running,
+    in any process, are deduplicated onto the existing job by a partial unique index,
+    so a burst of clicks results in one run. Jobs run in the process that queued them.
+    """
+
+    def __init__(self, run_func, db_path: str = DB_PATH, max_workers: int = 2, max_history: int = 500):
+        """
+        Args:
+            run_func: Function called as run_func(**params) for each job; its return value
+                      is stored as the job result
+            db_path: Path to the SQLite database holding the pipeline_jobs table
+            max_workers: Maximum number of jobs running at the same time in this process
+            max_history: Number of finished jobs kept for status lookups
+        """
+        self.run_func = run_func
+        self.max_history = max_history
+        init_schema(db_path)
+        self._pool = ConnectionPool(db_path, max_size=max_workers + 1)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pipeline-job")
+        self._submitted = {}
+        self._lock = threading.Lock()
+
+    def submit(self, symbol: str, data_type: str, **params) -> tuple[dict, bool]:
+        """
+        Queue a pipeline run, or attach to an identical run already in flight.
+
+        Args:
+            symbol: Stock symbol to run the pipeline for (normalized, so "aapl " and
+                    "AAPL" share a job)
+            data_type: Type of financial data to fetch
+            **params: Extra keyword arguments for run_func
+
+        Returns:
+            Tuple of (job snapshot, whether an in-flight job was reused)
+        """
+        symbol = normalize_symbol(symbol)
+        job_id = uuid.uuid4().hex
+
+        with _local_jobs_lock:
+            _local_jobs.add(job_id)  # before the row is visible, so it is never taken for orphaned
+        conn = self._pool.acquire()
+        try:
+            while True:
+                try:
+                    with conn:
+                        conn.execute('''
+                        INSERT INTO pipeline_jobs (job_id, symbol, data_type, status, submitted_at, worker_pid)
+                        VALUES (?, ?, ?, 'queued', ?, ?)
+                        ''', (job_id, symbol, data_type, _now(), os.getpid()))
+                        self._trim_history(conn)
+                    break
+                except sqlite3.IntegrityError:
+                    # An identical job is already queued or running
+                    existing = conn.execute('''
+                    SELECT * FROM pipeline_jobs
+                    WHERE symbol = ? AND data_type = ? AND status IN ('queued', 'running')
+                    ''', (symbol, data_type)).fetchone()
+                    if existing is not None and not self._fail_if_orphaned(conn, existing):
+                        _discard_local_job(job_id)
+                        return _snapshot(existing), True
+                    # It finished (or was found orphaned) in the meantime, so try again
+            with self._lock:
+                self._submitted[job_id] = time.perf_counter()
+            snapshot = self._get(conn, job_id)
+            self._executor.submit(self._run, job_id, dict(params, symbol=symbol, data_type=data_type))
+        except BaseException:
+            _discard_local_job(job_id)
+            raise
+        finally:
+            self._pool.release(conn)
+
+        return snapshot, False
+
+    def get(self, job_id: str):
+        """
+        Get the current state of a job.
+
+        Args:
+            job_id: ID returned by submit
+
+        Returns:
+            Job snapshot dictionary, or None if the job is unknown
+        """
+        conn = self._pool.acquire()
+        try:
+            return self._get(conn, job_id)
+        finally:
+            self._pool.release(conn)
+
+    def list_jobs(self, limit: int = 20) -> list[dict]:
+        """
+        Get the most recently submitted jobs, newest first.
+
+        Args:
+            limit: Maximum number of jobs to return
+
+        Returns:
+            List of job snapshot dictionaries
+        """
+        conn = self._pool.acquire()
+        try:
+            rows = conn.execute("SELECT * FROM pipeline_jobs ORDER BY rowid DESC LIMIT ?", (limit,)).fetchall()
+            return [_snapshot(row) for row in rows]
+        finally:
+            self._pool.release(conn)
+
+    def shutdown(self, wait: bool = True):
+        """
+        Stop accepting jobs and optionally wait for running ones to finish.
+        """
+        self._executor.shutdown(wait=wait)
+        self._pool.close_all()
+
+    def _run(self, job_id: str, params: dict):
+        # Whatever fails (including the database updates), the job ends in a terminal state
+        result, status, error = None, "failed", None
+        start = time.perf_counter()
+        try:
+            with self._lock:
+                submitted = self._submitted.pop(job_id)
+            self._update(job_id, status="running", started_at=_now(),
+                         queue_seconds=round(time.perf_counter() - submitted, 3))
+
+            start = time.perf_counter()
+            result = self.run_func(**params)
+            status = "succeeded"
+            # run_pipeline reports failures in its result instead of raising
+            if isinstance(result, dict) and result.get("status") == "FAILURE":
+                status, error = "failed", result.get("error")
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            print(traceback.format_exc())
+        finally:
+            self._finish(job_id, status=status, finished_at=_now(), run_seconds=round(time.perf_counter() - start, 3),
+                         result=json.dumps(result, default=str), error=error)
+
+    def _finish(self, job_id: str, **fields):
+        # Record the final state, retrying (e.g. on "database is locked"), then as a last
+        # resort just the failure. Once the job leaves _local_jobs, a row still left in
+        # flight is reported as orphaned by the next lookup.
+        try:
+            for attempt in range(FINISH_ATTEMPTS):
+                try:
+                    self._update(job_id, **fields)
+                    return
+                except sqlite3.Error as e:
+                    print(f"Could not record the result of job {job_id} (attempt {attempt + 1}): {e}")
+                    time.sleep(0.1 * 2 ** attempt)
+            try:
+                self._update(job_id, status="failed", finished_at=fields.get("finished_at"),
+                             error="Could not record the job's result")
+            except sqlite3.Error as e:
+                print(f"Could not mark job {job_id} failed: {e}")
+        finally:
+            _discard_local_job(job_id)
+
+    def _update(self, job_id: str, **fields):
+        conn = self._pool.acquire()
+        try:
+            with conn:
+                conn.execute(f"UPDATE pipeline_jobs SET {', '.join(f'{name} = ?' for name in fields)} WHERE job_id = ?",
+                             (*fields.values(), job_id))
+        finally:
+            self._pool.release(conn)
+
+    def _get(self, conn: sqlite3.Connection, job_id: str):
+        row = conn.execute("SELECT * FROM pipeline_jobs WHERE job_id = ?", (job_id,)).fetchone()
+        if row is not None and self._fail_if_orphaned(conn, row):
+            row = conn.execute("SELECT * FROM pipeline_jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return _snapshot(row) if row else None
+
+    @staticmethod
+    def _fail_if_orphaned(conn: sqlite3.Connection, row: sqlite3.Row) -> bool:
+        # Mark an in-flight job failed if the process running it exited (e.g. a recycled
+        # worker), since it will never finish; returns whether it did
+        if row["status"] not in ("queued", "running") or _job_alive(row["job_id"], row["worker_pid"]):
+            return False
+        with conn:
+            conn.execute('''
+            UPDATE pipeline_jobs SET status = 'failed', finished_at = ?, error = ?
+            WHERE job_id = ? AND status IN ('queued', 'running')
+            ''', (_now(), "Worker process exited before the job finished", row["job_id"]))
+        return True
+
+    def _trim_history(self, conn: sqlite3.Connection):
+        # Drop the oldest finished jobs once the history is full (caller holds a transaction)
+        conn.execute('''
+        DELETE FROM pipeline_jobs
+        WHERE status IN ('succeeded', 'failed')
+        AND rowid <= (SELECT rowid FROM pipeline_jobs ORDER BY rowid DESC LIMIT 1 OFFSET ?)
+        ''', (self.max_history,))
+
+def _snapshot(row: sqlite3.Row) -> dict:
+    job = {column: row[column] for column in JOB_COLUMNS}
+    if job["result"] is not None:
+        job["result"] = json.loads(job["result"])
+    return job
+
+def _discard_local_job(job_id: str):
+    with _local_jobs_lock:
+        _local_jobs.discard(job_id)
+
+def _job_alive(job_id: str, pid) -> bool:
+    # Whether a queued or running job can still finish: jobs run in the process that
+    # queued them, so it must be known to this process, or that process must be running
+    if pid is None:
+        return False
+    if pid == os.getpid():
+        with _local_jobs_lock:
+            return job_id in _local_jobs
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+def _now() -> str:
+    return datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -0,0 +1,214 @@
+import codecs
+import json
+from typing import Iterable, Iterator, Optional
+
+_WHITESPACE = " \t\n\r"
+
+# Characters that can continue a number split across chunks
+_NUMBER_CHARACTERS = set("0123456789.eE+-")
+
+# Bytes read from a file per decoder feed
+FILE_CHUNK_SIZE = 1 << 20
+
+class JsonArrayDecoder:
+    """
+    Incrementally decode the elements of a JSON array as its bytes arrive.
+
+    Feed the document in chunks of any size; each call returns the array elements that
+    became complete, so a large response can be processed while it is still downloading
+    without ever holding the whole body (or its decoded list) in memory.
+
+    With key set, the document is an object and the array is the value of that
+    top-level key (e.g. "historical" in {"symbol": "AAPL", "historical": [...]}); other
+    members are decoded and kept in extra.
+    """
+
+    def __init__(self, key: Optional[str] = None):
+        self.key = key
+        self.extra = {}
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._state = "start"
+        self._member = None
+        self._array_done = False
+
+    def feed(self, data) -> list:
+        """
+        Add the next chunk of the document.
+
+        Args:
+            data: Next chunk (bytes or str)
+
+        Returns:
+            Array elements completed by this chunk
+
+        Raises:
+            ValueError: If the document isn't the expected JSON shape
+        """
+        if isinstance(data, bytes):
+            data = self._text.decode(data)
+        self._buffer = self._buffer[self._pos:] + data
+        self._pos = 0
+        return self._parse(final=False)
+
+    def close(self) -> list:
+        """
+        Signal the end of the document.
+
+        Returns:
+            Any elements still pending
+
+        Raises:
+            ValueError: If the document ended before the array was complete
+        """
+        self._buffer = self._buffer[self._pos:] + self._text.decode(b"", final=True)
+        self._pos = 0
+        elements = self._parse(final=True)
+        if self._state != "end":
+            raise ValueError("JSON document ended before the array was complete")
+        return elements
+
+    def _skip_whitespace(self) -> bool:
+        # Advance past whitespace; False if the buffer ran out
+        buffer, pos = self._buffer, self._pos
+        while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+            pos += 1
+        self._pos = pos
+        return pos < len(buffer)
+
+    def _expect(self, characters: str) -> Optional[str]:
+        # Consume one of the given structural characters; None if more data is needed
+        if not self._skip_whitespace():
+            return None
+        character = self._buffer[self._pos]
+        if character not in characters:
+            raise ValueError(f"Expected one of {characters!r} at offset {self._pos}, got {character!r}")
+        self._pos += 1
+        return character
+
+    def _decode_value(self, final: bool):
+        # Decode one complete JSON value; (value, True) or (None, False) if it is still partial
+        if not self._skip_whitespace():
+            return None, False
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return None, False
+        # A number running to the end of the buffer may continue in the next chunk; raw_decode
+        # also stops before a trailing ".", "e" or sign, as in "456." or "1.5e"
+        if not final and isinstance(value, (int, float)) and not isinstance(value, bool):
+            if all(character in _NUMBER_CHARACTERS for character in self._buffer[end:]):
+                return None, False
+        self._pos = end
+        return value, True
+
+    def _parse(self, final: bool) -> list:
+        elements = []
+        while True:
+            state = self._state
+            if state == "start":
+                if self._expect("{" if self.key else "[") is None:
+                    break
+                self._state = "member" if self.key else "first_element"
+            elif state == "member":
+                member, complete = self._decode_value(final)
+                if not complete:
+                    break
+                if not isinstance(member, str):
+                    raise ValueError(f"Expected an object key before offset {self._pos}")
+                self._member = member
+                self._state = "colon"
+            elif state == "colon":
+                if self._expect(":") is None:
+                    break
+                self._state = "array" if self._member == self.key else "value"
+            elif state == "array":
+                if self._expect("[") is None:
+                    break
+                self._state = "first_element"
+            elif state == "value":
+                value, complete = self._decode_value(final)
+                if not complete:
+                    break
+                self.extra[self._member] = value
+                self._state = "member_separator"
+            elif state == "member_separator":
+                character = self._expect(",}")
+                if character is None:
+                    break
+                if character == ",":
+                    self._state = "member"
+                elif self._array_done:
+                    self._state = "end"
+                else:
+                    raise ValueError(f"JSON object has no {self.key!r} array")
+            elif state == "first_element":
+                if not self._skip_whitespace():
+                    break
+                if self._buffer[self._pos] == "]":
+                    self._pos += 1
+                    self._end_array()
+                else:
+                    self._state = "element"
+            elif state == "element":
+                element, complete = self._decode_value(final)
+                if not complete:
+                    break
+                elements.append(element)
+                self._state = "separator"
+            elif state == "separator":
+                character = self._expect(",]")
+                if character is None:
+                    break
+                if character == ",":
+                    self._state = "element"
+                else:
+                    self._end_array()
+            else:  # end
+                if self._skip_whitespace():
+                    raise ValueError(f"Unexpected data after the JSON document at offset {self._pos}")
+                break
+        return elements
+
+    def _end_array(self):
+        # Members after the array are still decoded, so extra is complete at the end
+        self._array_done = True
+        self._state = "member_separator" if self.key else "end"
+
+def iter_json_array(chunks: Iterable, key: Optional[str] = None) -> Iterator:
+    """
+    Stream the elements of a JSON array from an iterable of chunks.
+
+    Args:
+        chunks: Iterable of bytes or str chunks (e.g. response.iter_content() or a file read loop)
+        key: Top-level object key holding the array, if the document is an object
+
+    Yields:
+        Array elements in order
+    """
+    decoder = JsonArrayDecoder(key)
+    for chunk in chunks:
+        yield from decoder.feed(chunk)
+    yield from decoder.close()
+
+def iter_json_file(path: str, key: Optional[str] = None, chunk_size: int = FILE_CHUNK_SIZE) -> Iterator:
+    """
+    Stream the elements of a JSON array stored in a file.
+
+    The file is read chunk_size bytes at a time, so memory stays constant however large
+    the file is, and taking the first few elements only reads the start of the file.
+
+    Args:
+        path: Path of the JSON file
+        key: Top-level object key holding the array, if the document is an object
+        chunk_size: Bytes to read per chunk
+
+    Yields:
+        Array elements in order
+    """
+    with open(path, "rb") as f:
+        yield from iter_json_array(iter(lambda: f.read(chunk_size), b""), key)
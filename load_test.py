@@ -0,0 +1,86 @@
+import argparse
+import json
+import time
+import urllib.request
+import urllib.error
+from concurrent.futures import ThreadPoolExecutor
+
+# Read-only endpoints hit by the dashboard on every load
+DEFAULT_PATHS = [
+    "/api/chart_data?data_type=Historical%20Prices",
+    "/api/historical_chart_data/AAPL?data_type=Historical%20Prices",
+    "/api/data_types",
+    "/dashboard"
+]
+
+def fetch(url: str) -> tuple[float, bool]:
+    """
+    Fetch a single URL.
+
+    Args:
+        url: Full URL to request
+
+    Returns:
+        Tuple of (latency in seconds, whether the request succeeded)
+    """
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, timeout=30) as response:
+            response.read()
+            ok = response.status == 200
+    except (urllib.error.URLError, OSError):
+        ok = False
+    return time.perf_counter() - start, ok
+
+def run_load_test(base_url: str, paths: list[str], total_requests: int, concurrency: int) -> dict:
+    """
+    Send requests round-robin over the given paths and measure throughput.
+
+    Args:
+        base_url: Server root, e.g. http://127.0.0.1:5000
+        paths: Endpoint paths to cycle through
+        total_requests: Total number of requests to send
+        concurrency: Number of concurrent client threads
+
+    Returns:
+        Dictionary with requests per second and latency percentiles
+    """
+    urls = [base_url.rstrip('/') + paths[i % len(paths)] for i in range(total_requests)]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(fetch, urls))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for latency, _ in results)
+    errors = sum(1 for _, ok in results if not ok)
+
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+    return {
+        "requests": total_requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "elapsed_seconds": round(elapsed, 3),
+        "requests_per_second": round(total_requests / elapsed, 1),
+        "p50_ms": round(percentile(0.50), 2),
+        "p95_ms": round(percentile(0.95), 2),
+        "p99_ms": round(percentile(0.99), 2)
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Load test the Flask dashboard API')
+    parser.add_argument('--base_url', type=str, default="http://127.0.0.1:5000",
+                        help='Root URL of the running server')
+    parser.add_argument('--requests', type=int, default=2000,
+                        help='Total number of requests to send')
+    parser.add_argument('--concurrency', type=int, default=16,
+                        help='Number of concurrent client threads')
+    parser.add_argument('--path', action='append', dest='paths',
+                        help='Endpoint path to hit (repeatable, defaults to the dashboard API)')
+
+    args = parser.parse_args()
+
+    result = run_load_test(args.base_url, args.paths or DEFAULT_PATHS, args.requests, args.concurrency)
+    print(json.dumps(result, indent=2))
@@ -3,9 +3,19 @@ import os
 import traceback
 import sqlite3
 import argparse
+import json
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from contextlib import closing
 from dotenv import load_dotenv
-from ingestion_service import generate_mock_financial_data, save_raw_data, fetch_income_statement_from_fmp
-from standardization_service import load_raw_data, apply_standardization_rules, load_standardized_data_to_db
+from financial_db import init_schema
+from ingestion_service import iter_mock_financial_data, fetch_income_statement_from_fmp
+from async_ingestion import iter_ingested
+from raw_archive import archive_records, iter_archive_records
+from pipeline_metrics import PipelineMetrics, PipelineProfiler
+from standardization_service import apply_standardization_rules, iter_standardized_records, load_standardized_data_to_db
 
 # Load environment variables from .env file
 load_dotenv()
@@ -22,106 +32,277 @@ def update_status(message: str):
         f.write(f"{message} at {timestamp}")
     print(message)
     
-def log_pipeline_run(status: str, records_processed: int, db_path: str = 'data.db'):
+def log_pipeline_run(status: str, records_processed: int, db_path: str = 'data.db', details: dict = None,
+                     metrics: PipelineMetrics = None, run_type: str = "single", symbol: str = None,
+                     data_type: str = None, parameters: dict = None, error_count: int = None, error: str = None):
     """
     Log pipeline run details to the database.
     
     Args:
-        status: Status of the pipeline run (SUCCESS or FAILURE)
+        status: Status of the pipeline run (SUCCESS, PARTIAL or FAILURE)
         records_processed: Number of records processed
         db_path: Path to the SQLite database file
+        details: Optional run details (e.g. per-symbol stats for batch runs), stored as JSON
+        metrics: Optional stage measurements, stored in pipeline_stage_metrics; also
+                 supplies the run's duration, throughput and source bytes
+        run_type: "single" or "batch"
+        symbol: Stock symbol of a single run
+        data_type: Data type(s) processed
+        parameters: The run's arguments, stored as JSON
+        error_count: Number of failed units (defaults to 1 for FAILURE, otherwise 0)
+        error: Error message, if any
+    
+    Returns:
+        The run's ID in pipeline_runs_history, or None if it couldn't be logged
     """
     try:
+        # Create table if it doesn't exist
+        init_schema(db_path)
+        
         # Connect to SQLite database
         conn = sqlite3.connect(db_path)
         cursor = conn.cursor()
         
-        # Create table if it doesn't exist
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS pipeline_runs_history (
-            run_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            timestamp TEXT,
-            status TEXT,
-            records_processed INTEGER
-        )
-        ''')
-        
         # Insert record
         timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        duration = round(metrics.elapsed_seconds, 4) if metrics is not None else None
+        if error_count is None:
+            error_count = 1 if status == "FAILURE" else 0
         cursor.execute('''
-        INSERT INTO pipeline_runs_history (timestamp, status, records_processed)
-        VALUES (?, ?, ?)
-        ''', (timestamp, status, records_processed))
+        INSERT INTO pipeline_runs_history (timestamp, status, records_processed, details, run_type, symbol,
+            data_type, parameters, duration_seconds, rows_per_second, error_count, error, source_bytes)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (timestamp, status, records_processed, json.dumps(details) if details else None, run_type, symbol,
+              data_type, json.dumps(parameters) if parameters else None, duration,
+              round(records_processed / duration, 1) if duration else None, error_count, error,
+              metrics.bytes_written if metrics is not None else None))
+        run_id = cursor.lastrowid
+        
+        if metrics is not None:
+            metrics.save(cursor, run_id)
         
         # Commit changes and close connection
         conn.commit()
         conn.close()
         
         print(f"Pipeline run logged: {status}, {records_processed} records at {timestamp}")
+        return run_id
     except Exception as e:
         print(f"Error logging pipeline run: {str(e)}")
+        return None
+
+def ingest_data(symbol: str, data_type: str, num_records: int = 100) -> list[dict]:
+    """
+    Fetch or generate raw records for one symbol and data type.
+    
+    Args:
+        symbol: Stock symbol to fetch data for (e.g., "AAPL")
+        data_type: Type of financial data to fetch
+        num_records: Number of mock records to generate (for mock data types)
+        
+    Returns:
+        List of raw records
+    """
+    return list(iter_ingest_data(symbol, data_type, num_records))
+
+def iter_ingest_data(symbol: str, data_type: str, num_records: int = 100):
+    """
+    Lazily fetch or generate raw records for one symbol and data type.
+    
+    Mock data is generated one record at a time; API responses arrive whole and are
+    passed through.
+    
+    Args:
+        symbol: Stock symbol to fetch data for (e.g., "AAPL")
+        data_type: Type of financial data to fetch
+        num_records: Number of mock records to generate (for mock data types)
+        
+    Yields:
+        Raw records
+    """
+    if data_type == "Income Statement":
+        # Fetch income statement data
+        yield from fetch_income_statement_from_fmp(symbol)
+        return
+    
+    if data_type == "Revenue" or data_type == "Expenses":
+        # Generate specialized mock data for Revenue or Expenses
+        data = iter_mock_financial_data(num_records, category=data_type)
+    else:
+        # Default to historical prices (mock data)
+        data = iter_mock_financial_data(num_records)
+    
+    # Ensure the description field is set to the symbol for proper querying
+    for record in data:
+        record["description"] = symbol
+        yield record
+
+def tag_standardized_records(standardized_data: list[dict], symbol: str) -> list[dict]:
+    """
+    Ensure all records have the correct symbol in the description and symbol fields.
+    
+    Args:
+        standardized_data: Standardized records (modified in place)
+        symbol: Stock symbol the records belong to
+        
+    Returns:
+        The same list, for convenience
+    """
+    for _ in iter_tagged_records(standardized_data, symbol):
+        pass
+    return standardized_data
+
+def iter_tagged_records(standardized_records, symbol: str):
+    """
+    Streaming version of tag_standardized_records.
+    
+    Args:
+        standardized_records: Iterable of standardized records (modified in place)
+        symbol: Stock symbol the records belong to
+        
+    Yields:
+        The tagged records
+    """
+    for record in standardized_records:
+        if "description" not in record or not record["description"]:
+            record["description"] = symbol
+        if not record.get("symbol"):
+            record["symbol"] = symbol
+        yield record
+
+def prefetch(records, chunk_size: int = 5000, max_chunks: int = 4):
+    """
+    Run an iterator on a background thread, a bounded number of chunks ahead of the consumer.
+    
+    This lets ingestion and standardization overlap with database writes. The bounded
+    queue provides backpressure: once max_chunks are waiting, the producer blocks until
+    the consumer catches up, so at most about (max_chunks + 2) * chunk_size records are
+    in memory regardless of run size.
+    
+    Args:
+        records: Iterable to consume on the background thread
+        chunk_size: Records handed over per queue item
+        max_chunks: Maximum number of chunks buffered ahead of the consumer
+        
+    Yields:
+        The records of the input iterable, in order (exceptions raised by the input are
+        re-raised in the consumer)
+    """
+    chunks = queue.Queue(maxsize=max_chunks)
+    stop = threading.Event()
+    done = object()
+    
+    def put(item):
+        # Give up if the consumer went away, instead of blocking forever on a full queue
+        while not stop.is_set():
+            try:
+                chunks.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def produce():
+        try:
+            chunk = []
+            for record in records:
+                chunk.append(record)
+                if len(chunk) >= chunk_size:
+                    if not put(chunk):
+                        return
+                    chunk = []
+            if chunk and not put(chunk):
+                return
+            put(done)
+        except BaseException as e:
+            put(e)
+    
+    producer = threading.Thread(target=produce, name="pipeline-prefetch", daemon=True)
+    producer.start()
+    try:
+        while True:
+            chunk = chunks.get()
+            if chunk is done:
+                break
+            if isinstance(chunk, BaseException):
+                raise chunk
+            yield from chunk
+    finally:
+        stop.set()
+        producer.join()
 
-def run_pipeline(data_type: str = "Historical Prices", num_records: int = 100, symbol: str = "AAPL"):
+def run_pipeline(data_type: str = "Historical Prices", num_records: int = 100, symbol: str = "AAPL",
+                 save_raw: bool = True, chunk_size: int = 5000, staged_load: bool = False,
+                 incremental: bool = False, profile: bool = False):
     """
     Run the complete data pipeline.
     
+    The stages are chained generators: records flow from ingestion through the raw
+    archive writer and standardization to the database loader one at a time. Ingestion
+    and standardization run a few chunks ahead on a background thread, and the loader
+    commits every chunk_size records, so memory use does not grow with num_records.
+    
     Args:
         data_type: Type of financial data to fetch ("Historical Prices", "Income Statement", "Revenue", "Expenses")
         num_records: Number of mock records to generate (for Historical Prices)
         symbol: Stock symbol to fetch data for (e.g., "AAPL")
+        save_raw: Archive the raw records in the raw archive (raw_data/archive/)
+        chunk_size: Records per database commit (and per hand-off between threads)
+        staged_load: Merge each chunk through a temporary staging table (faster for large runs)
+        incremental: Skip records already stored with the same content
+        profile: Write cProfile and tracemalloc reports for the run to profiles/
+        
+    Returns:
+        Dictionary with the run status ("SUCCESS" or "FAILURE"), records processed,
+        error message (None on success) and per-stage metrics
     """
+    timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+    if profile:
+        with PipelineProfiler(f"{timestamp}_{symbol}_{data_type.lower().replace(' ', '_')}"):
+            return run_pipeline(data_type, num_records, symbol, save_raw, chunk_size, staged_load, incremental)
+    
     records_processed = 0
+    metrics = PipelineMetrics()
+    run_info = {"symbol": symbol, "data_type": data_type, "parameters": {
+        "num_records": num_records, "save_raw": save_raw, "chunk_size": chunk_size,
+        "staged_load": staged_load, "incremental": incremental}}
     try:
         print("Starting pipeline...")
         
-        # Step 1: Generate and save mock data
+        # Step 1: Ingestion, archiving raw records as they stream past
         print(f"\n--- Step 1: Data Ingestion for {data_type} ---")
-        timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
-        
-        if data_type == "Income Statement":
-            # Fetch income statement data
-            data = fetch_income_statement_from_fmp(symbol)
-            filename = f"{symbol}_{data_type.lower().replace(' ', '_')}_{timestamp}.json"
-        elif data_type == "Revenue" or data_type == "Expenses":
-            # Generate specialized mock data for Revenue or Expenses
-            data = generate_mock_financial_data(num_records, category=data_type)
-            filename = f"{symbol}_{data_type.lower().replace(' ', '_')}_{timestamp}.json"
-            
-            # Ensure the description field is set to the symbol for proper querying
-            for record in data:
-                record["description"] = symbol
-        else:
-            # Default to historical prices (mock data)
-            data = generate_mock_financial_data(num_records)
-            filename = f"{symbol}_{data_type.lower().replace(' ', '_')}_{timestamp}.json"
-            
-            # Ensure the description field is set to the symbol for proper querying
-            for record in data:
-                record["description"] = symbol
+        raw_records = metrics.iter_stage("ingest", iter_ingest_data(symbol, data_type, num_records))
+        last_stage = "ingest"
         
-        save_raw_data(data, filename, data_type)
+        archived = {}
+        if save_raw:
+            raw_records = metrics.iter_stage(
+                "archive", iter_archive_records(raw_records, symbol, data_type, timestamp, archived), upstream="ingest")
+            last_stage = "archive"
         
-        # Step 2: Load, standardize, and save to DB
+        # Step 2: Standardize and save to DB in chunks
         print("\n--- Step 2: Data Standardization ---")
-        raw_data = load_raw_data(filename)
-        standardized_data = apply_standardization_rules(raw_data, data_type)
+        standardized_records = metrics.iter_stage(
+            "standardize", iter_tagged_records(iter_standardized_records(raw_records, data_type), symbol),
+            upstream=last_stage)
         
-        # Ensure all records have the correct symbol in the description field
-        for record in standardized_data:
-            if "description" not in record or not record["description"]:
-                record["description"] = symbol
-        
-        load_standardized_data_to_db(standardized_data)
-        
-        # Set records processed count
-        records_processed = len(standardized_data)
+        # The loader's time excludes waiting on the prefetch thread for records
+        with metrics.stage("load") as load, closing(prefetch(standardized_records, chunk_size)) as records:
+            load.records_out = records_processed = load_standardized_data_to_db(
+                metrics.iter_input("load", records), chunk_size=chunk_size, staging=staged_load, incremental=incremental)
+        if "segment" in archived:
+            metrics.get("archive").bytes = archived["segment"]["bytes"]
         
         # Update status
         status_message = f"SUCCESS: {records_processed} records processed"
         update_status(status_message)
+        print(metrics.summary())
         
         # Log pipeline run
-        log_pipeline_run("SUCCESS", records_processed)
+        log_pipeline_run("SUCCESS", records_processed, metrics=metrics, **run_info)
+        
+        return {"status": "SUCCESS", "records_processed": records_processed, "error": None,
+                "stages": metrics.as_dict()}
         
     except Exception as e:
         error_message = f"FAILURE: {str(e)}"
@@ -130,7 +311,192 @@ def run_pipeline(data_type: str = "Historical Prices", num_records: int = 100, s
         update_status(error_message)
         
         # Log pipeline run failure
-        log_pipeline_run("FAILURE", records_processed)
+        log_pipeline_run("FAILURE", records_processed, metrics=metrics, error=str(e), **run_info)
+        
+        return {"status": "FAILURE", "records_processed": records_processed, "error": str(e),
+                "stages": metrics.as_dict()}
+
+def load_watchlist(path: str) -> list[str]:
+    """
+    Read symbols from a watchlist file.
+    
+    The file may list one symbol per line and/or comma-separated symbols; blank lines and
+    anything after a '#' are ignored.
+    
+    Args:
+        path: Path to the watchlist file
+        
+    Returns:
+        List of unique symbols in file order
+    """
+    symbols = []
+    with open(path, "r") as f:
+        for line in f:
+            for symbol in line.split("#", 1)[0].split(","):
+                symbol = symbol.strip().upper()
+                if symbol and symbol not in symbols:
+                    symbols.append(symbol)
+    return symbols
+
+def _ingest_task(symbol: str, data_type: str, num_records: int, timestamp: str, save_raw: bool = True) -> dict:
+    # Thread pool task: fetch/generate raw records and archive them
+    start = time.perf_counter()
+    data = ingest_data(symbol, data_type, num_records)
+    raw_bytes = archive_records(data, symbol, data_type, timestamp)["bytes"] if save_raw else 0
+    return {"raw_data": data, "ingest_seconds": time.perf_counter() - start, "raw_bytes": raw_bytes}
+
+def _iter_ingested(pairs: list[tuple], num_records: int, timestamp: str, save_raw: bool = True,
+                   ingest_workers: int = 8, async_ingest: bool = False):
+    # Yield (symbol, data_type, raw_data, error, seconds, raw_bytes) for each pair as it
+    # finishes ingesting, either from a thread pool or from the asyncio client
+    if async_ingest:
+        for symbol, data_type, raw_data, error, seconds in iter_ingested(
+                pairs, num_records, fallback=ingest_data, max_concurrency=ingest_workers):
+            raw_bytes = 0
+            if error is None and save_raw:
+                raw_bytes = archive_records(raw_data, symbol, data_type, timestamp)["bytes"]
+            yield symbol, data_type, raw_data, error, seconds, raw_bytes
+        return
+    
+    with ThreadPoolExecutor(max_workers=ingest_workers) as executor:
+        futures = {executor.submit(_ingest_task, *pair, num_records, timestamp, save_raw): pair for pair in pairs}
+        for future in as_completed(futures):
+            symbol, data_type = futures[future]
+            try:
+                result = future.result()
+                yield symbol, data_type, result["raw_data"], None, result["ingest_seconds"], result["raw_bytes"]
+            except Exception as e:
+                yield symbol, data_type, None, e, None, 0
+
+def _standardize_task(symbol: str, data_type: str, raw_data: list[dict]) -> tuple[list[dict], float]:
+    # Process pool task: standardize one symbol's records (module-level so it can be pickled)
+    start = time.perf_counter()
+    standardized_data = tag_standardized_records(apply_standardization_rules(raw_data, data_type), symbol)
+    return standardized_data, time.perf_counter() - start
+
+def run_batch_pipeline(symbols: list[str], data_types: list[str], num_records: int = 100,
+                       ingest_workers: int = 8, standardize_workers: int = None, db_path: str = 'data.db',
+                       save_raw: bool = True, incremental: bool = False, async_ingest: bool = False,
+                       profile: bool = False):
+    """
+    Run the pipeline for many symbols and data types as one batch.
+    
+    Ingestion (network/mock generation and raw archiving) fans out over a thread pool, or
+    over the asyncio client with async_ingest, and each pair is handed to a process pool
+    for standardization as soon as it arrives. All standardized records are then written
+    in one bulk database load, and the batch is logged as a single pipeline_runs_history
+    entry with per-symbol stats. Ingestion and standardization stage times are summed
+    across workers, so they can exceed the batch's wall time.
+    
+    Args:
+        symbols: Stock symbols to process
+        data_types: Types of financial data to fetch for every symbol
+        num_records: Number of mock records to generate per symbol (for mock data types)
+        ingest_workers: Threads used for ingestion (maximum concurrent requests with async_ingest)
+        standardize_workers: Processes used for standardization (defaults to the CPU count;
+                             1 standardizes in the current process)
+        db_path: Path to the SQLite database file
+        save_raw: Archive the raw records in the raw archive (raw_data/archive/)
+        incremental: Skip records already stored with the same content
+        async_ingest: Fetch with the asyncio client (bounded concurrency, per-host rate
+                      limits, streamed JSON decoding); pairs without an FMP endpoint or
+                      API key still use the mock generators. It bypasses the HTTP
+                      client's on-disk cache, so every run re-downloads
+        profile: Write cProfile and tracemalloc reports for the batch to profiles/
+                 (standardization in worker processes is not profiled)
+        
+    Returns:
+        Dictionary with the batch status ("SUCCESS", "PARTIAL" or "FAILURE"), records
+        processed, error message, per-symbol stats and per-stage metrics
+    """
+    timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+    if profile:
+        with PipelineProfiler(f"{timestamp}_batch"):
+            return run_batch_pipeline(symbols, data_types, num_records, ingest_workers, standardize_workers,
+                                      db_path, save_raw, incremental, async_ingest)
+    
+    pairs = [(symbol, data_type) for symbol in symbols for data_type in data_types]
+    stats = {symbol: {} for symbol in symbols}
+    metrics = PipelineMetrics()
+    run_info = {"run_type": "batch", "data_type": ",".join(data_types), "parameters": {
+        "symbols": symbols, "data_types": data_types, "num_records": num_records, "ingest_workers": ingest_workers,
+        "standardize_workers": standardize_workers, "save_raw": save_raw, "incremental": incremental,
+        "async_ingest": async_ingest}}
+    records_processed = 0
+    
+    try:
+        print(f"Starting batch pipeline for {len(symbols)} symbols x {len(data_types)} data types...")
+        
+        # Step 1: Ingest every (symbol, data type) pair concurrently, standardizing each in
+        # parallel processes as soon as it arrives
+        print("\n--- Step 1: Data Ingestion and Standardization ---")
+        standardize_workers = standardize_workers or os.cpu_count() or 1
+        standardized_data = []
+        
+        if standardize_workers > 1 and len(pairs) > 1:
+            executor = ProcessPoolExecutor(max_workers=standardize_workers)
+        else:
+            executor = ThreadPoolExecutor(max_workers=1)
+        
+        with executor:
+            futures = {}
+            for symbol, data_type, raw_data, error, seconds, raw_bytes in _iter_ingested(
+                    pairs, num_records, timestamp, save_raw, ingest_workers, async_ingest):
+                if error is not None:
+                    stats[symbol][data_type] = {"error": f"ingestion: {str(error)}"}
+                    continue
+                stats[symbol][data_type] = {"raw_records": len(raw_data), "ingest_seconds": round(seconds, 3)}
+                metrics.add("ingest", seconds=seconds, records_out=len(raw_data), bytes_written=raw_bytes)
+                futures[(symbol, data_type)] = executor.submit(_standardize_task, symbol, data_type, raw_data)
+            
+            for (symbol, data_type), future in futures.items():
+                try:
+                    records, seconds = future.result()
+                    standardized_data.extend(records)
+                    stats[symbol][data_type].update({
+                        "standardized_records": len(records),
+                        "standardize_seconds": round(seconds, 3)
+                    })
+                    metrics.add("standardize", seconds=seconds, records_in=stats[symbol][data_type]["raw_records"],
+                                records_out=len(records))
+                except Exception as e:
+                    stats[symbol][data_type]["error"] = f"standardization: {str(e)}"
+        
+        # Step 2: One bulk load for the whole batch
+        print("\n--- Step 2: Database Load ---")
+        with metrics.stage("load") as load:
+            load.records_in = len(standardized_data)
+            load.records_out = load_standardized_data_to_db(standardized_data, db_path, incremental=incremental)
+        records_processed = len(standardized_data)
+        
+        failed = sum(1 for symbol in stats for entry in stats[symbol].values() if "error" in entry)
+        status = "SUCCESS" if failed == 0 else ("FAILURE" if failed == len(pairs) else "PARTIAL")
+        
+        status_message = f"{status}: {records_processed} records processed for {len(symbols)} symbols"
+        if failed:
+            status_message += f" ({failed} of {len(pairs)} symbol/data type pairs failed)"
+        update_status(status_message)
+        print(metrics.summary())
+        
+        log_pipeline_run(status, records_processed, db_path, details={"batch": True, "symbols": stats}, metrics=metrics,
+                         error_count=failed, error=None if failed == 0 else f"{failed} of {len(pairs)} pairs failed",
+                         **run_info)
+        
+        return {"status": status, "records_processed": records_processed,
+                "error": None if failed == 0 else f"{failed} of {len(pairs)} pairs failed", "symbols": stats,
+                "stages": metrics.as_dict()}
+        
+    except Exception as e:
+        error_message = f"FAILURE: {str(e)}"
+        print(f"Error in batch pipeline: {error_message}")
+        print(traceback.format_exc())
+        update_status(error_message)
+        
+        log_pipeline_run("FAILURE", records_processed, db_path, details={"batch": True, "symbols": stats},
+                         metrics=metrics, error=str(e), **run_info)
+        
+        return {"status": "FAILURE", "records_processed": records_processed, "error": str(e), "symbols": stats,
+                "stages": metrics.as_dict()}
 
 if __name__ == "__main__":
     # Parse command line arguments
@@ -141,12 +507,59 @@ if __name__ == "__main__":
                         help='Stock symbol to fetch data for (e.g., AAPL)')
     parser.add_argument('--num_records', type=int, default=100,
                         help='Number of records to generate (for Historical Prices)')
+    parser.add_argument('--symbols', type=str,
+                        help='Comma-separated symbols to run as one batch (e.g., AAPL,MSFT,GOOGL)')
+    parser.add_argument('--watchlist', type=str,
+                        help='File of symbols (one per line or comma-separated) to run as one batch')
+    parser.add_argument('--data_types', type=str,
+                        help='Comma-separated data types for batch runs (defaults to --data_type)')
+    parser.add_argument('--ingest_workers', type=int, default=8,
+                        help='Threads (or concurrent requests with --async_ingest) used for ingestion in batch runs')
+    parser.add_argument('--async_ingest', action='store_true',
+                        help='Fetch batch runs with the asyncio client (rate limited, streamed decoding; '
+                             'always re-downloads, bypassing the HTTP response cache)')
+    parser.add_argument('--standardize_workers', type=int, default=None,
+                        help='Processes used for standardization in batch runs (defaults to CPU count)')
+    parser.add_argument('--no_raw_save', action='store_true',
+                        help='Skip archiving raw records to raw_data/archive/')
+    parser.add_argument('--chunk_size', type=int, default=5000,
+                        help='Records per database commit when streaming a single run')
+    parser.add_argument('--staged_load', action='store_true',
+                        help='Merge each chunk into the database through a temporary staging table')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only write records that are new or changed since the last load')
+    parser.add_argument('--profile', action='store_true',
+                        help='Write cProfile and tracemalloc reports for the run to profiles/')
     
     args = parser.parse_args()
     
-    # Run the pipeline with the specified arguments
-    run_pipeline(
-        data_type=args.data_type,
-        num_records=args.num_records,
-        symbol=args.symbol
-    )
\ No newline at end of file
+    if args.symbols or args.watchlist:
+        # Batch mode: every symbol x data type in one run
+        symbols = load_watchlist(args.watchlist) if args.watchlist else []
+        if args.symbols:
+            symbols += [s.strip().upper() for s in args.symbols.split(",") if s.strip() and s.strip().upper() not in symbols]
+        data_types = [t.strip() for t in args.data_types.split(",")] if args.data_types else [args.data_type]
+        
+        run_batch_pipeline(
+            symbols=symbols,
+            data_types=data_types,
+            num_records=args.num_records,
+            ingest_workers=args.ingest_workers,
+            standardize_workers=args.standardize_workers,
+            save_raw=not args.no_raw_save,
+            incremental=args.incremental,
+            async_ingest=args.async_ingest,
+            profile=args.profile
+        )
+    else:
+        # Run the pipeline with the specified arguments
+        run_pipeline(
+            data_type=args.data_type,
+            num_records=args.num_records,
+            symbol=args.symbol,
+            save_raw=not args.no_raw_save,
+            chunk_size=args.chunk_size,
+            staged_load=args.staged_load,
+            incremental=args.incremental,
+            profile=args.profile
+        )
\ No newline at end of file
@@ -0,0 +1,210 @@
+"""
+A local stand-in for the Financial Modeling Prep API, for development runs that must
+not depend on the network.
+
+    python mock_fmp_server.py --port 8765 --fail_every 3
+    FMP_BASE_URL=http://127.0.0.1:8765/api/v3 FMP_API_KEY=dev python main_pipeline.py --data_type "Income Statement"
+
+Income statements (/income-statement/<symbol>) and daily prices
+(/historical-price-full/<symbol>?timeseries=N) are generated once per request shape
+and then served unchanged with an ETag and Last-Modified header, so conditional
+requests get 304 Not Modified. Injected failures (503, or --fail_status, with
+Retry-After) exercise the clients' retries, and --error_every answers with the HTTP 200
+{"Error Message": ...} body FMP sends when a plan's quota is exhausted.
+"""
+import argparse
+import datetime
+import hashlib
+import json
+import random
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from ingestion_service import generate_mock_income_statement
+
+class MockFMPServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server serving mock FMP endpoints.
+
+    Attributes:
+        requests_served: Counts of responses by status code
+        max_in_flight: Most requests handled at the same time so far
+    """
+    daemon_threads = True
+
+    def __init__(self, address: tuple, fail_every: int = 0, latency: float = 0.0, fail_status: int = 503,
+                 error_every: int = 0):
+        super().__init__(address, MockFMPHandler)
+        self.fail_every = fail_every
+        self.fail_status = fail_status
+        self.error_every = error_every
+        self.latency = latency
+        self.requests_served = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._documents = {}
+        self._request_count = 0
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/api/v3"
+
+    def next_request(self) -> int:
+        # Number the request, so failures can be injected every Nth one
+        with self._lock:
+            self._request_count += 1
+            return self._request_count
+
+    def document(self, key: tuple, build) -> tuple[bytes, str, str]:
+        # (body, ETag, Last-Modified) for a response, built on first request
+        with self._lock:
+            if key not in self._documents:
+                body = json.dumps(build()).encode("utf-8")
+                etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+                self._documents[key] = (body, etag, formatdate(time.time(), usegmt=True))
+            return self._documents[key]
+
+    def track(self, delta: int):
+        # Count requests being handled, to check clients' concurrency limits
+        with self._lock:
+            self.in_flight += delta
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def record(self, status: int):
+        with self._lock:
+            self.requests_served[status] = self.requests_served.get(status, 0) + 1
+
+class MockFMPHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+    def do_GET(self):
+        self.server.track(1)
+        try:
+            self._handle_get()
+        finally:
+            self.server.track(-1)
+
+    def _handle_get(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        parts = url.path.strip("/").split("/")
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        number = self.server.next_request()
+        if self.server.fail_every and number % self.server.fail_every == 0:
+            return self._send(self.server.fail_status, b'{"error": "temporarily unavailable"}', {"Retry-After": "0"})
+        if self.server.error_every and number % self.server.error_every == 0:
+            return self._send(200, b'{"Error Message": "Limit Reach . Please upgrade your plan."}')
+
+        if not query.get("apikey"):
+            return self._send(401, b'{"Error Message": "Invalid API KEY."}')
+
+        if len(parts) != 4 or parts[:2] != ["api", "v3"] or parts[2] not in ("income-statement", "historical-price-full"):
+            return self._send(404, b'{"Error Message": "Unknown endpoint."}')
+
+        symbol = parts[3].upper()
+        if parts[2] == "income-statement":
+            period = query.get("period", ["annual"])[0]
+            body, etag, last_modified = self.server.document(
+                (parts[2], symbol, period), lambda: generate_mock_income_statement(symbol, period))
+        else:
+            days = int(query.get("timeseries", ["100"])[0])
+            body, etag, last_modified = self.server.document(
+                (parts[2], symbol, days), lambda: {"symbol": symbol, "historical": mock_price_history(symbol, days)})
+
+        headers = {"ETag": etag, "Last-Modified": last_modified}
+        if self.headers.get("If-None-Match") == etag:
+            return self._send(304, b"", headers)
+        self._send(200, body, headers)
+
+    def _send(self, status: int, body: bytes, headers: dict = None):
+        self.server.record(status)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # keep test output readable
+
+def mock_price_history(symbol: str, days: int) -> list[dict]:
+    """
+    Generate a repeatable daily price history for a symbol, newest day first like FMP.
+
+    Args:
+        symbol: Stock symbol (seeds the random walk)
+        days: Number of trading days
+
+    Returns:
+        List of daily OHLCV dictionaries
+    """
+    rng = random.Random(symbol)
+    price = rng.uniform(20, 500)
+    day = datetime.date(2025, 6, 30)
+    history = []
+    while len(history) < days:
+        if day.weekday() < 5:
+            history.append({
+                "date": day.isoformat(),
+                "open": round(price * rng.uniform(0.98, 1.02), 2),
+                "high": round(price * rng.uniform(1.0, 1.03), 2),
+                "low": round(price * rng.uniform(0.97, 1.0), 2),
+                "close": round(price, 2),
+                "volume": rng.randint(100000, 50000000)
+            })
+            price *= rng.uniform(0.97, 1.03)
+        day -= datetime.timedelta(days=1)
+    return history
+
+def start_server(port: int = 0, fail_every: int = 0, latency: float = 0.0, fail_status: int = 503,
+                 error_every: int = 0) -> MockFMPServer:
+    """
+    Start a mock FMP server on a background thread.
+
+    Args:
+        port: Port to listen on (0 picks a free port)
+        fail_every: Answer every Nth request with fail_status (0 never fails)
+        latency: Seconds to sleep before answering each request
+        fail_status: Status of the injected failures, e.g. 429 or 503
+        error_every: Answer every Nth request with an HTTP 200 FMP error message (0 never)
+
+    Returns:
+        The running server; use server.base_url as FMP_BASE_URL and server.shutdown() to stop it
+    """
+    server = MockFMPServer(("127.0.0.1", port), fail_every=fail_every, latency=latency, fail_status=fail_status,
+                           error_every=error_every)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Serve mock Financial Modeling Prep API responses')
+    parser.add_argument('--port', type=int, default=8765,
+                        help='Port to listen on')
+    parser.add_argument('--fail_every', type=int, default=0,
+                        help='Answer every Nth request with --fail_status to exercise retries')
+    parser.add_argument('--fail_status', type=int, default=503,
+                        help='HTTP status of the injected failures, e.g. 429 or 503')
+    parser.add_argument('--error_every', type=int, default=0,
+                        help='Answer every Nth request with an HTTP 200 FMP error message')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='Seconds to sleep before answering each request')
+
+    args = parser.parse_args()
+
+    server = MockFMPServer(("127.0.0.1", args.port), fail_every=args.fail_every, latency=args.latency,
+                           fail_status=args.fail_status, error_every=args.error_every)
+    print(f"Mock FMP API listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,185 @@
+"""
+A local stand-in for the OpenAI chat completions API, for benchmarking and developing
+EnhancedFeedbackProcessor without network access or API costs.
+
+    python mock_openai_server.py --port 8766 --latency 0.3 --jitter 0.1
+    OPENAI_BASE_URL=http://127.0.0.1:8766/v1 OPENAI_API_KEY=dev streamlit run feedback_app.py
+
+POST /v1/chat/completions sleeps for the configured latency (plus random jitter) and
+answers in the shape each EnhancedFeedbackProcessor prompt asks for: "category,
+confidence" for categorization, a JSON array for entity extraction, prose for insights
+and a 0-10 score otherwise. Answers are derived from the prompt text, so the same
+feedback always gets the same analysis.
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Categories listed in the categorization prompt
+CATEGORIES = [
+    'User Interface', 'Performance', 'Functionality', 'Data & Analytics', 'User Experience',
+    'Technical Issues', 'Mobile', 'Integration', 'Security', 'Support'
+]
+
+class MockOpenAIServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server answering chat completion requests after a simulated delay.
+
+    Attributes:
+        requests_served: Counts of responses by status code
+    """
+    daemon_threads = True
+
+    def __init__(self, address: tuple, latency: float = 0.0, jitter: float = 0.0, fail_every: int = 0):
+        super().__init__(address, MockOpenAIHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.fail_every = fail_every
+        self.requests_served = {}
+        self._request_count = 0
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def delay(self) -> float:
+        # Seconds to hold this request, like model inference time
+        return max(0.0, self.latency + random.uniform(-self.jitter, self.jitter))
+
+    def next_request_fails(self) -> bool:
+        with self._lock:
+            self._request_count += 1
+            return bool(self.fail_every) and self._request_count % self.fail_every == 0
+
+    def record(self, status: int):
+        with self._lock:
+            self.requests_served[status] = self.requests_served.get(status, 0) + 1
+
+class MockOpenAIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+        if self.path.rstrip("/") != "/v1/chat/completions":
+            return self._send(404, {"error": {"message": "Unknown endpoint.", "type": "invalid_request_error"}})
+
+        if not self.headers.get("Authorization", "").startswith("Bearer "):
+            return self._send(401, {"error": {"message": "Missing API key.", "type": "invalid_request_error"}})
+
+        try:
+            request = json.loads(body or b"{}")
+            prompt = request["messages"][-1]["content"]
+        except (ValueError, KeyError, IndexError, TypeError):
+            return self._send(400, {"error": {"message": "Invalid request body.", "type": "invalid_request_error"}})
+
+        time.sleep(self.server.delay())
+
+        if self.server.next_request_fails():
+            return self._send(500, {"error": {"message": "The server had an error.", "type": "server_error"}})
+
+        content = mock_completion(prompt)
+        prompt_tokens = len(prompt.split())
+        completion_tokens = len(content.split())
+        self._send(200, {
+            "id": f"chatcmpl-{hashlib.sha256(body).hexdigest()[:24]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "gpt-3.5-turbo"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        })
+
+    def _send(self, status: int, document: dict):
+        self.server.record(status)
+        body = json.dumps(document).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # keep benchmark output readable
+
+def mock_completion(prompt: str) -> str:
+    """
+    Answer an EnhancedFeedbackProcessor prompt in the format it parses.
+
+    Args:
+        prompt: The user message sent to the chat completions endpoint
+
+    Returns:
+        Completion text
+    """
+    match = re.search(r'Feedback: "(.*)"', prompt)
+    feedback = match.group(1) if match else prompt
+    rng = random.Random(hashlib.sha256(feedback.encode("utf-8")).digest())
+
+    if "Categorize this feedback" in prompt:
+        return f"{rng.choice(CATEGORIES)}, {rng.uniform(5, 10):.1f}"
+
+    if "JSON array" in prompt:
+        words = [word for word in re.findall(r"[a-z]+", feedback.lower()) if len(word) > 3]
+        return json.dumps(sorted(set(words))[:5])
+
+    if "actionable insights" in prompt:
+        return ("1. **Top 3 Priority Issues**\n- Performance\n- Usability\n- Reliability\n"
+                "2. **Common Themes**\n- Loading times\n"
+                "3. **Actionable Recommendations**\n- Profile the slowest pages\n"
+                "4. **Business Impact**\n- Higher retention")
+
+    return f"{rng.uniform(0, 10):.1f}"
+
+def start_server(port: int = 0, latency: float = 0.0, jitter: float = 0.0, fail_every: int = 0) -> MockOpenAIServer:
+    """
+    Start a mock OpenAI server on a background thread.
+
+    Args:
+        port: Port to listen on (0 picks a free port)
+        latency: Mean seconds to sleep before answering each request
+        jitter: Maximum random deviation from latency, in seconds
+        fail_every: Answer every Nth request with 500 (0 never fails)
+
+    Returns:
+        The running server; use server.base_url as OPENAI_BASE_URL and server.shutdown() to stop it
+    """
+    server = MockOpenAIServer(("127.0.0.1", port), latency=latency, jitter=jitter, fail_every=fail_every)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Serve mock OpenAI chat completion responses')
+    parser.add_argument('--port', type=int, default=8766,
+                        help='Port to listen on')
+    parser.add_argument('--latency', type=float, default=0.3,
+                        help='Mean seconds to sleep before answering each request')
+    parser.add_argument('--jitter', type=float, default=0.1,
+                        help='Maximum random deviation from the latency, in seconds')
+    parser.add_argument('--fail_every', type=int, default=0,
+                        help='Answer every Nth request with 500 to exercise the fallbacks')
+
+    args = parser.parse_args()
+
+    server = MockOpenAIServer(("127.0.0.1", args.port), latency=args.latency, jitter=args.jitter,
+                              fail_every=args.fail_every)
+    print(f"Mock OpenAI API listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
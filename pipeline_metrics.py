@@ -0,0 +1,327 @@
+"""
+Stage timers, counters and optional profiling for pipeline runs.
+
+    metrics = PipelineMetrics()
+    raw = metrics.iter_stage("ingest", iter_ingest_data(...))
+    standardized = metrics.iter_stage("standardize", iter_standardized_records(raw), upstream="ingest")
+    with metrics.stage("load") as load:
+        load.records_out = load_standardized_data_to_db(metrics.iter_input("load", standardized))
+
+Each stage records its time, records in and out, bytes and the process's peak RSS so far;
+log_pipeline_run saves them to pipeline_stage_metrics, keyed by the run's
+pipeline_runs_history row. PipelineProfiler additionally writes cProfile and tracemalloc
+reports for a run (main_pipeline.py --profile).
+"""
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # not available on Windows: peak memory is not recorded
+    resource = None
+
+# Directory profiling reports are written to
+PROFILE_DIR = "profiles"
+
+# Functions and allocation sites listed in the text reports
+PROFILE_TOP = 40
+
+# Held while a run is profiled: the thread profile hook and tracemalloc are process-wide
+_profiling = threading.Lock()
+
+def process_peak_rss_mb():
+    """
+    Get the process's peak resident memory so far.
+
+    This is the high-water mark for the process's whole lifetime, not for a stage or a
+    run: in a long-lived web worker it only rises when a stage sets a new record.
+
+    Returns:
+        Peak RSS in MB, or None where the resource module is unavailable
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+class StageMetrics:
+    """
+    Timer and counters for one pipeline stage.
+
+    Attributes:
+        seconds: Time spent in the stage, including waits and upstream stages it pulled from
+        wait_seconds: Time spent waiting for input from another thread
+        records_in: Records consumed
+        records_out: Records produced
+        bytes: Bytes written (e.g. compressed archive size)
+        process_peak_rss_mb: Process lifetime peak RSS when the stage finished (see process_peak_rss_mb())
+        upstream: Stage whose time is nested inside this one's (generator chains)
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.seconds = 0.0
+        self.wait_seconds = 0.0
+        self.records_in = 0
+        self.records_out = 0
+        self.bytes = 0
+        self.process_peak_rss_mb = None
+        self.upstream = None
+
+    @property
+    def busy_seconds(self) -> float:
+        # Exclusive time: minus waits and the upstream generator's share of each next()
+        upstream_seconds = self.upstream.seconds if self.upstream is not None else 0.0
+        return max(0.0, self.seconds - self.wait_seconds - upstream_seconds)
+
+    def as_dict(self) -> dict:
+        busy = self.busy_seconds
+        records_in = self.records_in or (self.upstream.records_out if self.upstream is not None else 0)
+        return {
+            "seconds": round(busy, 4),
+            "wait_seconds": round(self.wait_seconds, 4),
+            "records_in": records_in,
+            "records_out": self.records_out,
+            "bytes": self.bytes,
+            "rows_per_second": round(self.records_out / busy, 1) if busy > 0 else None,
+            "process_peak_rss_mb": self.process_peak_rss_mb
+        }
+
+class PipelineMetrics:
+    """
+    Per-stage timers and counters for one pipeline run.
+
+    Stages are created on first use and reported in that order. Each stage should only
+    be updated from one thread (the prefetch thread for ingestion and standardization,
+    the main thread for the load).
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self._started = time.perf_counter()
+
+    @property
+    def elapsed_seconds(self) -> float:
+        # Wall time since the run started
+        return time.perf_counter() - self._started
+
+    @property
+    def bytes_written(self) -> int:
+        return sum(stage.bytes for stage in self.stages.values())
+
+    def get(self, name: str) -> StageMetrics:
+        if name not in self.stages:
+            self.stages[name] = StageMetrics(name)
+        return self.stages[name]
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Time a block of work as a stage.
+
+        Args:
+            name: Stage name
+
+        Yields:
+            The stage's StageMetrics, for the block to update its counters
+        """
+        metrics = self.get(name)
+        start = time.perf_counter()
+        try:
+            yield metrics
+        finally:
+            metrics.seconds += time.perf_counter() - start
+            metrics.process_peak_rss_mb = process_peak_rss_mb()
+
+    def iter_stage(self, name: str, records, upstream: str = None):
+        """
+        Time and count a streaming stage as its records are pulled through.
+
+        Args:
+            name: Stage name
+            records: The stage's output iterable
+            upstream: Name of the stage records pulls from, whose time is subtracted
+
+        Returns:
+            Generator yielding the records unchanged
+        """
+        # Register the stage now, so stages are reported in pipeline order
+        metrics = self.get(name)
+        if upstream is not None:
+            metrics.upstream = self.get(upstream)
+        return self._iter_timed(metrics, records, "seconds", "records_out")
+
+    def iter_input(self, name: str, records):
+        """
+        Count a stage's input and time how long it waits for it.
+
+        Args:
+            name: Stage name
+            records: Iterable the stage consumes (e.g. a prefetch queue)
+
+        Returns:
+            Generator yielding the records unchanged
+        """
+        return self._iter_timed(self.get(name), records, "wait_seconds", "records_in")
+
+    def add(self, name: str, seconds: float = 0.0, records_in: int = 0, records_out: int = 0, bytes_written: int = 0):
+        """
+        Add measurements taken elsewhere (e.g. by pool workers) to a stage.
+        """
+        metrics = self.get(name)
+        metrics.seconds += seconds
+        metrics.records_in += records_in
+        metrics.records_out += records_out
+        metrics.bytes += bytes_written
+        metrics.process_peak_rss_mb = process_peak_rss_mb()
+
+    def _iter_timed(self, metrics: StageMetrics, records, timer: str, counter: str):
+        # Add the time spent in each next() to the timer attribute and count the records
+        clock = time.perf_counter
+        iterator = iter(records)
+        count = 0
+        elapsed = 0.0
+        try:
+            while True:
+                start = clock()
+                try:
+                    record = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    elapsed += clock() - start
+                count += 1
+                yield record
+        finally:
+            setattr(metrics, timer, getattr(metrics, timer) + elapsed)
+            setattr(metrics, counter, getattr(metrics, counter) + count)
+            metrics.process_peak_rss_mb = process_peak_rss_mb()
+
+    def as_dict(self) -> dict:
+        """
+        Returns:
+            Dictionary of stage name to its measurements, in stage order
+        """
+        return {name: stage.as_dict() for name, stage in self.stages.items()}
+
+    def summary(self) -> str:
+        """
+        Format the stages as a table for the run log.
+
+        Returns:
+            Multi-line string
+        """
+        lines = [f"{'stage':<14}{'seconds':>10}{'wait':>9}{'in':>10}{'out':>10}{'rows/s':>12}{'bytes':>12}{'peak RSS':>10}"]
+        for name, stage in self.as_dict().items():
+            lines.append(
+                f"{name:<14}{stage['seconds']:>10.3f}{stage['wait_seconds']:>9.3f}{stage['records_in']:>10}"
+                f"{stage['records_out']:>10}{stage['rows_per_second'] or 0:>12,.0f}{stage['bytes']:>12}"
+                f"{stage['process_peak_rss_mb'] if stage['process_peak_rss_mb'] is not None else '-':>10}"
+            )
+        lines.append(f"Total wall time: {self.elapsed_seconds:.3f}s")
+        return "\n".join(lines)
+
+    def save(self, conn, run_id: int):
+        """
+        Store the stage measurements for a pipeline run.
+
+        Args:
+            conn: Open connection (or cursor) on the pipeline database
+            run_id: The run's pipeline_runs_history row
+        """
+        conn.executemany('''
+        INSERT OR REPLACE INTO pipeline_stage_metrics
+            (run_id, stage, seconds, wait_seconds, records_in, records_out, bytes, rows_per_second, process_peak_rss_mb)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [(run_id, name, stage["seconds"], stage["wait_seconds"], stage["records_in"], stage["records_out"],
+               stage["bytes"], stage["rows_per_second"], stage["process_peak_rss_mb"])
+              for name, stage in self.as_dict().items()])
+
+class PipelineProfiler:
+    """
+    Profile one pipeline run with cProfile and tracemalloc.
+
+    cProfile only sees the thread that enables it, so a profiler is also started in every
+    thread created while profiling (the prefetch thread, ingestion workers) and the
+    results are merged. Work in process pools is not profiled.
+
+    The thread hook and tracemalloc are process-wide, so only one run per process can be
+    profiled at a time and entering a second profiler raises RuntimeError. Profiling is
+    meant for command-line runs (main_pipeline.py --profile); the web app never enables it,
+    since other requests' threads would be profiled too.
+
+    On exit, writes to directory:
+        <label>.prof: merged cProfile stats (pstats / snakeviz)
+        <label>_cpu.txt: top functions by cumulative time
+        <label>_memory.txt: peak traced memory and the top allocation sites
+    """
+
+    def __init__(self, label: str, directory: str = PROFILE_DIR):
+        self.label = label
+        self.directory = directory
+        self.paths = []
+        self._profiles = []
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        if not _profiling.acquire(blocking=False):
+            raise RuntimeError("Another pipeline run is already being profiled in this process")
+        tracemalloc.start()
+        threading.setprofile(self._profile_thread)
+        profile = cProfile.Profile()
+        self._profiles.append(profile)
+        profile.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        try:
+            self._profiles[0].disable()
+            threading.setprofile(None)
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        finally:
+            _profiling.release()
+        self._write(snapshot, peak)
+
+    def _profile_thread(self, frame, event, arg):
+        # Runs once as each new thread starts; enabling replaces this hook for the thread
+        profile = cProfile.Profile()
+        with self._lock:
+            self._profiles.append(profile)
+        profile.enable()
+
+    def _write(self, snapshot, peak: int):
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, self.label)
+
+        with self._lock:
+            profiles = list(self._profiles)
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+        stats.dump_stats(f"{base}.prof")
+
+        report = io.StringIO()
+        pstats.Stats(f"{base}.prof", stream=report).sort_stats("cumulative").print_stats(PROFILE_TOP)
+        with open(f"{base}_cpu.txt", "w") as f:
+            f.write(f"{len(profiles)} threads profiled\n")
+            f.write(report.getvalue())
+
+        snapshot = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+        with open(f"{base}_memory.txt", "w") as f:
+            f.write(f"Peak traced memory: {peak / (1024 * 1024):.1f} MB\n\n")
+            f.write(f"Top {PROFILE_TOP} allocation sites still held at the end of the run:\n")
+            for stat in snapshot.statistics("lineno")[:PROFILE_TOP]:
+                f.write(f"{stat}\n")
+
+        self.paths = [f"{base}.prof", f"{base}_cpu.txt", f"{base}_memory.txt"]
+        print(f"Profile written to {base}.prof ({base}_cpu.txt, {base}_memory.txt)")
@@ -0,0 +1,648 @@
+"""
+Compressed, indexed archive of raw records.
+
+Each archived run is a newline-delimited JSON segment (gzip, or zstd when the
+zstandard package is installed and requested) under raw_data/archive/<SYMBOL>/<type>/,
+and a SQLite manifest indexes the segments by symbol, data type and run timestamp. Reads
+stream records a line at a time, and compaction merges the small per-run segments of a
+symbol and data type into one segment per day (or month). The manifest also keeps the
+newest run per symbol and data type with a head sample of its records, so showing the
+latest raw data is one indexed lookup however large the archive grows.
+
+    python raw_archive.py import            # move raw_data/*.json into the archive
+    python raw_archive.py compact --period month
+    python raw_archive.py stats
+"""
+import argparse
+import datetime
+import glob
+import gzip
+import io
+import json
+import os
+import re
+import threading
+import uuid
+from itertools import islice
+from typing import Optional
+from financial_db import connect, normalize_symbol
+from json_stream import iter_json_file
+
+try:
+    import zstandard
+except ImportError:  # optional: gzip is used unless zstd is requested
+    zstandard = None
+
+# Default archive location, next to the legacy per-run JSON files
+ARCHIVE_DIR = os.path.join("raw_data", "archive")
+
+# Run timestamps use the pipeline's YYYYMMDD_HHMMSS format, which sorts chronologically
+TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+
+# Level 5 compresses NDJSON several times faster than gzip's default 9 for ~15% more bytes
+GZIP_LEVEL = 5
+ZSTD_LEVEL = 3
+
+# Records of each run kept in the manifest as its head sample
+HEAD_SAMPLE_SIZE = 10
+
+# Slices of the run timestamp that compaction groups segments by
+COMPACTION_PERIODS = {"day": 8, "month": 6, "all": 0}
+
+_EXTENSIONS = {"gzip": ".ndjson.gz", "zstd": ".ndjson.zst"}
+
+class RawArchive:
+    """
+    A directory of compressed NDJSON segments plus a SQLite manifest indexing them.
+
+    Writers add one segment per run; segments are written under a temporary name and
+    only registered in the manifest once complete, so readers never see partial runs.
+    """
+
+    def __init__(self, root: str = ARCHIVE_DIR, compression: str = "gzip"):
+        if compression not in _EXTENSIONS:
+            raise ValueError(f"Unsupported compression {compression!r} (use 'gzip' or 'zstd')")
+        if compression == "zstd" and zstandard is None:
+            raise ImportError("zstandard is required for zstd compression (pip install zstandard)")
+
+        self.root = root
+        self.compression = compression
+        self.manifest_path = os.path.join(root, "manifest.db")
+        self._schema_ready = False
+        self._lock = threading.Lock()
+
+    def write_segment(self, records, symbol: str, data_type: str, timestamp: str = None) -> dict:
+        """
+        Archive one run's records as a new segment.
+
+        Args:
+            records: Iterable of raw record dictionaries
+            symbol: Stock symbol the records belong to
+            data_type: Type of financial data
+            timestamp: Run timestamp (YYYYMMDD_HHMMSS, defaults to now)
+
+        Returns:
+            The segment's manifest entry
+        """
+        result = {}
+        for _ in self._write_segment(records, symbol, data_type, timestamp, result):
+            pass
+        return result["segment"]
+
+    def iter_write_segment(self, records, symbol: str, data_type: str, timestamp: str = None, result: dict = None):
+        """
+        Archive a stream of records as a new segment while passing them through.
+
+        The segment is registered in the manifest once the input is exhausted; if the
+        generator is closed early or the input raises, nothing is archived.
+
+        Args:
+            records: Iterable of raw record dictionaries
+            symbol: Stock symbol the records belong to
+            data_type: Type of financial data
+            timestamp: Run timestamp (YYYYMMDD_HHMMSS, defaults to now)
+            result: Dictionary that receives the segment's manifest entry under "segment"
+
+        Yields:
+            The input records, unchanged
+        """
+        return self._write_segment(records, symbol, data_type, timestamp, {} if result is None else result)
+
+    def _write_segment(self, records, symbol: str, data_type: str, timestamp: str, result: dict):
+        symbol = normalize_symbol(symbol)
+        timestamp = timestamp or datetime.datetime.now().strftime(TIMESTAMP_FORMAT)
+        path = self._new_segment_path(symbol, data_type, timestamp)
+
+        count = 0
+        head = []
+        tmp_path = f"{path}.tmp"
+        try:
+            with self._open_write(tmp_path) as f:
+                for record in records:
+                    line = json.dumps(record, separators=(",", ":"))
+                    f.write(line)
+                    f.write("\n")
+                    if count < HEAD_SAMPLE_SIZE:
+                        head.append(line)
+                    count += 1
+                    yield record
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        result["segment"] = self._register(path, symbol, data_type, timestamp, timestamp, count, runs=1,
+                                           head=f"[{','.join(head)}]")
+        print(f"Archived {count} records of {data_type} data for {symbol} to {path}")
+
+    def segments(self, symbol: str = None, data_type: str = None, since: str = None, until: str = None) -> list[dict]:
+        """
+        List archived segments, oldest first.
+
+        Args:
+            symbol: Only segments for this symbol
+            data_type: Only segments of this data type
+            since: Only segments with runs at or after this timestamp (YYYYMMDD_HHMMSS or a prefix)
+            until: Only segments with runs at or before this timestamp (or prefix)
+
+        Returns:
+            List of manifest entries (path, symbol, data_type, first_timestamp,
+            last_timestamp, records, bytes, runs)
+        """
+        clauses, params = [], []
+        if symbol is not None:
+            clauses.append("symbol = ?")
+            params.append(normalize_symbol(symbol))
+        if data_type is not None:
+            clauses.append("data_type = ?")
+            params.append(data_type)
+        if since is not None:
+            clauses.append("last_timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            # A prefix like "20250701" should include every run that day
+            clauses.append("first_timestamp <= ?")
+            params.append(until + "\uffff")
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        conn = self._connect()
+        try:
+            rows = conn.execute(f'''
+            SELECT path, symbol, data_type, first_timestamp, last_timestamp, records, bytes, runs
+            FROM raw_segments {where}
+            ORDER BY first_timestamp, id
+            ''', params).fetchall()
+        finally:
+            conn.close()
+
+        columns = ["path", "symbol", "data_type", "first_timestamp", "last_timestamp", "records", "bytes", "runs"]
+        return [dict(zip(columns, row)) for row in rows]
+
+    def iter_records(self, symbol: str = None, data_type: str = None, since: str = None, until: str = None):
+        """
+        Stream archived records, oldest run first, one line at a time.
+
+        Filters select whole segments (see segments()); after compaction the time
+        filters are only as fine as the compaction period.
+
+        Args:
+            symbol, data_type, since, until: Segment filters, as for segments()
+
+        Yields:
+            Raw record dictionaries
+        """
+        for segment in self.segments(symbol, data_type, since, until):
+            yield from self.iter_segment(segment["path"])
+
+    def iter_segment(self, path: str):
+        """
+        Stream the records of one segment file.
+
+        Args:
+            path: Segment path (as listed in the manifest)
+
+        Yields:
+            Raw record dictionaries
+        """
+        with self._open_read(path) as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def latest(self, symbol: str = None, data_type: str = None) -> Optional[dict]:
+        """
+        Look up the newest archived run, optionally for one symbol and/or data type.
+
+        Reads one row of the manifest's latest-run index; no segment is opened.
+
+        Args:
+            symbol: Only runs for this symbol
+            data_type: Only runs of this data type
+
+        Returns:
+            Dictionary with symbol, data_type, timestamp, records, path, offset (line of
+            the run's first record in the segment) and head (its first HEAD_SAMPLE_SIZE
+            records), or None if nothing matching is archived
+        """
+        clauses, params = [], []
+        if symbol is not None:
+            clauses.append("symbol = ?")
+            params.append(normalize_symbol(symbol))
+        if data_type is not None:
+            clauses.append("data_type = ?")
+            params.append(data_type)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        conn = self._connect()
+        try:
+            row = conn.execute(f'''
+            SELECT symbol, data_type, timestamp, records, path, line_offset, head
+            FROM latest_segments {where}
+            ORDER BY timestamp DESC, segment_id DESC
+            LIMIT 1
+            ''', params).fetchone()
+        finally:
+            conn.close()
+
+        if row is None:
+            return None
+        columns = ["symbol", "data_type", "timestamp", "records", "path", "offset"]
+        entry = dict(zip(columns, row))
+        entry["head"] = json.loads(row[-1])
+        return entry
+
+    def sample(self, num_records: int = 3, symbol: str = None, data_type: str = None) -> list[dict]:
+        """
+        Get the first records of the newest archived run.
+
+        Samples up to HEAD_SAMPLE_SIZE records come straight from the manifest; larger
+        ones read just that run's lines from its segment.
+
+        Args:
+            num_records: Number of records to return
+            symbol: Only runs for this symbol
+            data_type: Only runs of this data type
+
+        Returns:
+            List of raw record dictionaries (empty if nothing matching is archived)
+        """
+        latest = self.latest(symbol, data_type)
+        if latest is None:
+            return []
+        num_records = min(num_records, latest["records"])
+        if num_records <= len(latest["head"]):
+            return latest["head"][:num_records]
+        start = latest["offset"]
+        return list(islice(self.iter_segment(latest["path"]), start, start + num_records))
+
+    def compact(self, symbol: str = None, data_type: str = None, period: str = "day") -> dict:
+        """
+        Merge small segments into one segment per symbol, data type and period.
+
+        Records keep their run order. The merged segment is registered and the old ones
+        removed from the manifest in one transaction before their files are deleted, so
+        the manifest never lists records twice or loses them.
+
+        Args:
+            symbol: Only compact this symbol
+            data_type: Only compact this data type
+            period: Group runs by "day", "month" or "all"
+
+        Returns:
+            Dictionary with the number of segments merged and written
+        """
+        if period not in COMPACTION_PERIODS:
+            raise ValueError(f"Unknown compaction period {period!r} (use {', '.join(COMPACTION_PERIODS)})")
+        prefix_length = COMPACTION_PERIODS[period]
+
+        groups = {}
+        for segment in self.segments(symbol, data_type):
+            key = (segment["symbol"], segment["data_type"], segment["first_timestamp"][:prefix_length],
+                   segment["last_timestamp"][:prefix_length])
+            groups.setdefault(key, []).append(segment)
+
+        merged = written = 0
+        for (group_symbol, group_type, _, _), group in groups.items():
+            if len(group) < 2:
+                continue
+
+            first, last = group[0]["first_timestamp"], max(s["last_timestamp"] for s in group)
+            path = self._new_segment_path(group_symbol, group_type, first, last)
+            tmp_path = f"{path}.tmp"
+            count = 0
+            offsets = {}
+            with self._open_write(tmp_path) as out:
+                for segment in group:
+                    offsets[segment["path"]] = count
+                    with self._open_read(segment["path"]) as f:
+                        for line in f:
+                            if line.strip():
+                                out.write(line if line.endswith("\n") else line + "\n")
+                                count += 1
+            os.replace(tmp_path, path)
+
+            with self._lock:
+                conn = self._connect()
+                try:
+                    with conn:
+                        conn.executemany("DELETE FROM raw_segments WHERE path = ?", [(s["path"],) for s in group])
+                        self._insert_segment(conn, path, group_symbol, group_type, first, last, count,
+                                             sum(s["runs"] for s in group))
+                        # The newest run now lives in the merged segment, further in
+                        segment_id = conn.execute("SELECT id FROM raw_segments WHERE path = ?", (path,)).fetchone()[0]
+                        conn.executemany('''
+                        UPDATE latest_segments SET path = ?, segment_id = ?, line_offset = line_offset + ?
+                        WHERE path = ?
+                        ''', [(path, segment_id, offset, old_path) for old_path, offset in offsets.items()])
+                finally:
+                    conn.close()
+
+            for segment in group:
+                try:
+                    os.remove(segment["path"])
+                except FileNotFoundError:
+                    pass
+
+            merged += len(group)
+            written += 1
+
+        print(f"Compacted {merged} segments into {written}")
+        return {"segments_merged": merged, "segments_written": written}
+
+    def import_json_files(self, raw_dir: str = "raw_data", delete: bool = False) -> int:
+        """
+        Move legacy per-run JSON files (SYMBOL_data_type_YYYYMMDD_HHMMSS.json) into the archive.
+
+        Args:
+            raw_dir: Directory containing the JSON files
+            delete: Delete each file once it is archived
+
+        Returns:
+            Number of files imported
+        """
+        imported = 0
+        for file_path in sorted(glob.glob(os.path.join(raw_dir, "*.json"))):
+            symbol, data_type, timestamp = parse_raw_filename(os.path.basename(file_path))
+            if timestamp is None:
+                timestamp = datetime.datetime.fromtimestamp(os.path.getmtime(file_path)).strftime(TIMESTAMP_FORMAT)
+
+            # Arrays are streamed into the segment; a file holding a single record is wrapped
+            with open(file_path, "rb") as f:
+                is_array = f.read(1024).lstrip()[:1] == b"["
+            if is_array:
+                records = iter_json_file(file_path)
+            else:
+                with open(file_path, "r") as f:
+                    records = [json.load(f)]
+            self.write_segment(records, symbol, data_type, timestamp)
+
+            if delete:
+                os.remove(file_path)
+            imported += 1
+        return imported
+
+    def stats(self) -> dict:
+        """
+        Summarize the archive.
+
+        Returns:
+            Dictionary with segment, record, run and byte totals
+        """
+        conn = self._connect()
+        try:
+            segments, records, runs, size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(records), 0), COALESCE(SUM(runs), 0), COALESCE(SUM(bytes), 0) FROM raw_segments"
+            ).fetchone()
+        finally:
+            conn.close()
+        return {"segments": segments, "records": records, "runs": runs, "bytes": size}
+
+    def _connect(self):
+        # Reads may come before the first write (e.g. the dashboard on a fresh install)
+        os.makedirs(self.root, exist_ok=True)
+        conn = connect(self.manifest_path)
+        if not self._schema_ready:
+            self._init_manifest(conn)
+        return conn
+
+    def _init_manifest(self, conn):
+        with self._lock:
+            if self._schema_ready:
+                return
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute('''
+            CREATE TABLE IF NOT EXISTS raw_segments (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                path TEXT UNIQUE NOT NULL,
+                symbol TEXT NOT NULL,
+                data_type TEXT NOT NULL,
+                first_timestamp TEXT NOT NULL,
+                last_timestamp TEXT NOT NULL,
+                records INTEGER NOT NULL,
+                bytes INTEGER NOT NULL,
+                runs INTEGER NOT NULL
+            )
+            ''')
+            conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_raw_segments_symbol_type_time
+            ON raw_segments (symbol, data_type, last_timestamp)
+            ''')
+            # Newest run per symbol and data type, with its head sample, maintained on write
+            conn.execute('''
+            CREATE TABLE IF NOT EXISTS latest_segments (
+                symbol TEXT NOT NULL,
+                data_type TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                segment_id INTEGER NOT NULL,
+                path TEXT NOT NULL,
+                line_offset INTEGER NOT NULL,
+                records INTEGER NOT NULL,
+                head TEXT NOT NULL,
+                PRIMARY KEY (symbol, data_type)
+            )
+            ''')
+            conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_latest_segments_time
+            ON latest_segments (timestamp, segment_id)
+            ''')
+            self._backfill_latest(conn)
+            conn.commit()
+            self._schema_ready = True
+
+    def _backfill_latest(self, conn):
+        # Manifests written before latest_segments existed: index each symbol and data
+        # type's newest segment, reading its head from the start of the file
+        if conn.execute("SELECT 1 FROM latest_segments LIMIT 1").fetchone():
+            return
+        rows = conn.execute('''
+        SELECT id, path, symbol, data_type, last_timestamp, records FROM raw_segments AS s
+        WHERE id = (SELECT id FROM raw_segments WHERE symbol = s.symbol AND data_type = s.data_type
+                    ORDER BY last_timestamp DESC, id DESC LIMIT 1)
+        ''').fetchall()
+        for segment_id, path, symbol, data_type, timestamp, count in rows:
+            try:
+                head = list(islice(self.iter_segment(path), HEAD_SAMPLE_SIZE))
+            except OSError:
+                continue
+            self._upsert_latest(conn, symbol, data_type, timestamp, segment_id, path, count,
+                                json.dumps(head, separators=(",", ":")))
+
+    def _register(self, path: str, symbol: str, data_type: str, first: str, last: str, count: int, runs: int,
+                  head: str = None) -> dict:
+        conn = self._connect()
+        try:
+            with conn:
+                entry = self._insert_segment(conn, path, symbol, data_type, first, last, count, runs)
+                if head is not None:
+                    self._upsert_latest(conn, symbol, data_type, last, entry["id"], path, count, head)
+                return entry
+        finally:
+            conn.close()
+
+    def _upsert_latest(self, conn, symbol: str, data_type: str, timestamp: str, segment_id: int, path: str,
+                       count: int, head: str):
+        # Imports of older runs must not displace a newer one
+        conn.execute('''
+        INSERT INTO latest_segments (symbol, data_type, timestamp, segment_id, path, line_offset, records, head)
+        VALUES (?, ?, ?, ?, ?, 0, ?, ?)
+        ON CONFLICT (symbol, data_type) DO UPDATE SET
+            timestamp = excluded.timestamp,
+            segment_id = excluded.segment_id,
+            path = excluded.path,
+            line_offset = 0,
+            records = excluded.records,
+            head = excluded.head
+        WHERE excluded.timestamp > latest_segments.timestamp
+           OR (excluded.timestamp = latest_segments.timestamp AND excluded.segment_id > latest_segments.segment_id)
+        ''', (symbol, data_type, timestamp, segment_id, path, count, head))
+
+    def _insert_segment(self, conn, path: str, symbol: str, data_type: str, first: str, last: str,
+                        count: int, runs: int) -> dict:
+        entry = {"path": path, "symbol": symbol, "data_type": data_type, "first_timestamp": first,
+                 "last_timestamp": last, "records": count, "bytes": os.path.getsize(path), "runs": runs}
+        cursor = conn.execute('''
+        INSERT INTO raw_segments (path, symbol, data_type, first_timestamp, last_timestamp, records, bytes, runs)
+        VALUES (:path, :symbol, :data_type, :first_timestamp, :last_timestamp, :records, :bytes, :runs)
+        ''', entry)
+        entry["id"] = cursor.lastrowid
+        return entry
+
+    def _new_segment_path(self, symbol: str, data_type: str, first: str, last: str = None) -> str:
+        directory = os.path.join(self.root, symbol or "_", data_type.lower().replace(" ", "_"))
+        os.makedirs(directory, exist_ok=True)
+        span = first if last is None or last == first else f"{first}-{last}"
+        return os.path.join(directory, f"{span}_{uuid.uuid4().hex[:8]}{_EXTENSIONS[self.compression]}")
+
+    def _open_write(self, path: str):
+        if self.compression == "zstd":
+            raw = open(path, "wb")
+            stream = zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(raw, closefd=True)
+            return io.TextIOWrapper(stream, encoding="utf-8")
+        return gzip.open(path, "wt", encoding="utf-8", compresslevel=GZIP_LEVEL)
+
+    def _open_read(self, path: str):
+        # Pick the codec from the file, so gzip and zstd segments can be mixed
+        if path.endswith(_EXTENSIONS["zstd"]):
+            if zstandard is None:
+                raise ImportError(f"zstandard is required to read {path} (pip install zstandard)")
+            stream = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+            return io.TextIOWrapper(stream, encoding="utf-8")
+        return gzip.open(path, "rt", encoding="utf-8")
+
+_RAW_FILENAME = re.compile(r"(?P<prefix>.+?)_(?P<timestamp>[0-9]{8}_[0-9]{6})\.json")
+
+# Data type slugs used in raw file names
+_DATA_TYPE_SLUGS = {
+    "historical_prices": "Historical Prices",
+    "income_statement": "Income Statement",
+    "revenue": "Revenue",
+    "expenses": "Expenses"
+}
+
+def parse_raw_filename(filename: str) -> tuple:
+    """
+    Split a legacy raw file name into its symbol, data type and timestamp.
+
+    Args:
+        filename: e.g. "AAPL_income_statement_20250610_195947.json"
+
+    Returns:
+        Tuple of (symbol, data_type, timestamp); symbol is "" and timestamp None when
+        the name doesn't carry them
+    """
+    match = _RAW_FILENAME.fullmatch(filename)
+    prefix = match["prefix"] if match else os.path.splitext(filename)[0]
+    timestamp = match["timestamp"] if match else None
+
+    symbol, _, slug = prefix.partition("_")
+    if not slug or symbol != symbol.upper():
+        # No symbol, e.g. "financial_data_20250608_142111.json"
+        symbol, slug = "", prefix
+
+    data_type = _DATA_TYPE_SLUGS.get(slug, slug.replace("_", " ").title())
+    return symbol, data_type, timestamp
+
+_archives = {}
+_archives_lock = threading.Lock()
+
+def get_archive(root: str = ARCHIVE_DIR) -> RawArchive:
+    """
+    Get the shared archive for a directory, creating it on first use.
+
+    Args:
+        root: Archive directory
+
+    Returns:
+        RawArchive for root (zstd if RAW_ARCHIVE_COMPRESSION=zstd, otherwise gzip)
+    """
+    # A relative root names a different directory after a chdir
+    key = os.path.abspath(root)
+    with _archives_lock:
+        if key not in _archives:
+            _archives[key] = RawArchive(root, os.getenv("RAW_ARCHIVE_COMPRESSION", "gzip"))
+        return _archives[key]
+
+def archive_records(records, symbol: str, data_type: str, timestamp: str = None) -> dict:
+    """
+    Archive one run's raw records in the shared archive.
+
+    Args:
+        records: Iterable of raw record dictionaries
+        symbol: Stock symbol the records belong to
+        data_type: Type of financial data
+        timestamp: Run timestamp (YYYYMMDD_HHMMSS, defaults to now)
+
+    Returns:
+        The segment's manifest entry
+    """
+    return get_archive().write_segment(records, symbol, data_type, timestamp)
+
+def iter_archive_records(records, symbol: str, data_type: str, timestamp: str = None, result: dict = None):
+    """
+    Archive a stream of raw records in the shared archive while passing them through.
+
+    Args:
+        records: Iterable of raw record dictionaries
+        symbol: Stock symbol the records belong to
+        data_type: Type of financial data
+        timestamp: Run timestamp (YYYYMMDD_HHMMSS, defaults to now)
+        result: Dictionary that receives the segment's manifest entry under "segment"
+
+    Yields:
+        The input records, unchanged
+    """
+    return get_archive().iter_write_segment(records, symbol, data_type, timestamp, result)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Manage the raw data archive')
+    parser.add_argument('command', choices=["import", "compact", "stats", "replay"],
+                        help='import legacy JSON files, compact segments, show stats, or replay records as NDJSON')
+    parser.add_argument('--root', type=str, default=ARCHIVE_DIR,
+                        help='Archive directory')
+    parser.add_argument('--symbol', type=str, default=None,
+                        help='Only this symbol (compact/replay)')
+    parser.add_argument('--data_type', type=str, default=None,
+                        help='Only this data type (compact/replay)')
+    parser.add_argument('--since', type=str, default=None,
+                        help='Only runs at or after this timestamp, e.g. 20250701 (replay)')
+    parser.add_argument('--until', type=str, default=None,
+                        help='Only runs at or before this timestamp (replay)')
+    parser.add_argument('--period', type=str, default="day", choices=list(COMPACTION_PERIODS),
+                        help='Merge segments per day, month or all time (compact)')
+    parser.add_argument('--raw_dir', type=str, default="raw_data",
+                        help='Directory of legacy JSON files (import)')
+    parser.add_argument('--delete', action='store_true',
+                        help='Delete JSON files once imported (import)')
+
+    args = parser.parse_args()
+
+    archive = get_archive(args.root)
+    if args.command == "replay":
+        for record in archive.iter_records(args.symbol, args.data_type, args.since, args.until):
+            print(json.dumps(record))
+    else:
+        if args.command == "import":
+            print(f"Imported {archive.import_json_files(args.raw_dir, args.delete)} files")
+        elif args.command == "compact":
+            archive.compact(args.symbol, args.data_type, args.period)
+        print(json.dumps(archive.stats(), indent=2))
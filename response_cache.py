@@ -0,0 +1,62 @@
+import threading
+from collections import OrderedDict
+
+class VersionedCache:
+    """
+    A thread-safe LRU cache whose entries are tied to a data version.
+
+    Each entry remembers the data version it was built from; looking it up with a
+    different version counts as a miss, so bumping the version invalidates everything
+    without having to clear the cache explicitly.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, version: str):
+        """
+        Get a cached value.
+
+        Args:
+            key: Cache key (any hashable value)
+            version: Current data version
+
+        Returns:
+            The cached value, or None if it is missing or was built from another version
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, version: str, value):
+        """
+        Store a value built from the given data version.
+
+        Args:
+            key: Cache key (any hashable value)
+            version: Data version the value was built from
+            value: Value to cache
+        """
+        with self._lock:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Drop every cached entry.
+        """
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,118 @@
+import array
+import base64
+import sys
+import zlib
+from typing import Optional
+
+# Brotli is optional; without it we only negotiate gzip
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Encodings we can produce, in order of preference
+SUPPORTED_ENCODINGS = ["br", "gzip"] if brotli is not None else ["gzip"]
+
+# Minimum number of bytes to buffer before handing a compressed chunk to the server
+STREAM_CHUNK_SIZE = 16 * 1024
+
+def negotiate_encoding(accept_encodings) -> Optional[str]:
+    """
+    Pick the best content encoding the client accepts.
+
+    Args:
+        accept_encodings: werkzeug MIMEAccept-style object (request.accept_encodings)
+
+    Returns:
+        "br", "gzip", or None for an uncompressed response
+    """
+    return accept_encodings.best_match(SUPPORTED_ENCODINGS) if accept_encodings else None
+
+def compress_stream(chunks, encoding: Optional[str]):
+    """
+    Compress an iterable of text/bytes chunks on the fly.
+
+    Small chunks are coalesced so that each yielded piece is roughly STREAM_CHUNK_SIZE
+    bytes, which keeps the compressor efficient without buffering the whole response.
+
+    Args:
+        chunks: Iterable of str or bytes
+        encoding: "br", "gzip", or None to pass chunks through uncompressed
+
+    Yields:
+        Encoded bytes
+    """
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=5)
+        compress, finish = compressor.process, compressor.finish
+    elif encoding == "gzip":
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 writes a gzip header
+        compress, finish = compressor.compress, compressor.flush
+    else:
+        compress, finish = (lambda data: data), (lambda: b"")
+
+    buffer = []
+    buffered = 0
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8")
+        buffer.append(chunk)
+        buffered += len(chunk)
+
+        if buffered >= STREAM_CHUNK_SIZE:
+            data = compress(b"".join(buffer))
+            buffer, buffered = [], 0
+            if data:
+                yield data
+
+    data = compress(b"".join(buffer)) + finish()
+    if data:
+        yield data
+
+def pack_float64(values: array.array) -> bytes:
+    """
+    Pack values as little-endian float64.
+
+    Float64 keeps every stored value exact; float32's ~7 significant digits would drop
+    the cents from prices above 100,000 and round large statement values.
+
+    Args:
+        values: array of numbers
+
+    Returns:
+        Raw little-endian float64 bytes
+    """
+    packed = array.array("d", values)
+    if sys.byteorder != "little":
+        packed.byteswap()
+    return packed.tobytes()
+
+def pack_int32(values: array.array) -> bytes:
+    """
+    Pack values as little-endian int32.
+
+    Args:
+        values: array of integers
+
+    Returns:
+        Raw little-endian int32 bytes
+    """
+    packed = array.array("i", values)
+    if sys.byteorder != "little":
+        packed.byteswap()
+    return packed.tobytes()
+
+def iter_base64(data: bytes, chunk_size: int = 3 * STREAM_CHUNK_SIZE):
+    """
+    Base64-encode bytes in pieces that concatenate to the encoding of the whole.
+
+    Args:
+        data: Bytes to encode
+        chunk_size: Raw bytes per piece (kept a multiple of 3 so no padding is emitted mid-stream)
+
+    Yields:
+        Base64 text pieces
+    """
+    chunk_size -= chunk_size % 3
+    for offset in range(0, len(data), chunk_size):
+        yield base64.b64encode(data[offset:offset + chunk_size]).decode("ascii")
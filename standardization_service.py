@@ -1,27 +1,85 @@
-import json
 import sqlite3
 import datetime
 import re
 import os
+import hashlib
+import pandas as pd
+from itertools import islice
+from financial_db import connect, init_schema, normalize_symbol, description_symbol, bump_data_version, get_row_count
+from date_parser import DEFAULT_DATE, parse_date, parse_date_column
+from value_parser import parse_value, parse_value_column
+from json_stream import iter_json_file
 
-def load_raw_data(filename: str) -> list[dict]:
+# Raw records whose values are parsed together by iter_standardized_records
+STANDARDIZE_CHUNK_SIZE = 5000
+
+def make_record_id(symbol, data_type: str, metric, date, occurrence: int = 0) -> str:
+    """
+    Build a stable, content-derived ID for a standardized record.
+    
+    The same (symbol, data type, metric, date) always maps to the same ID, across runs
+    and processes, so re-loading the same data upserts rows instead of duplicating them.
+    
+    Args:
+        symbol: Stock symbol (normalized before hashing)
+        data_type: Type of financial data
+        metric: What the value measures (the description, or the income statement key)
+        date: Standardized date
+        occurrence: Index among records with the same key in one batch (0 for the first),
+                    so genuine duplicates in an upload are kept apart
+        
+    Returns:
+        32-character hex ID
+    """
+    key = "\x1f".join([normalize_symbol(symbol), str(data_type or ""), str(metric or ""), str(date or "")])
+    if occurrence:
+        key += f"\x1f{occurrence}"
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+
+def content_hash(date, value, description, data_type, symbol) -> str:
+    """
+    Hash the stored content of a standardized record (everything except its ID).
+    
+    Args:
+        date, value, description, data_type, symbol: Record fields as stored
+        
+    Returns:
+        16-character hex digest
+    """
+    content = "\x1f".join([str(date), repr(value), str(description), str(data_type), str(symbol)])
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=8).hexdigest()
+
+def load_raw_data(filename: str, limit: int = None) -> list[dict]:
     """
     Load raw data from a JSON file.
     
     Args:
         filename: Name of the file to load data from
+        limit: Only load the first limit records (reads just the start of the file)
         
     Returns:
         List of dictionaries containing raw financial records
     """
-    file_path = os.path.join("raw_data", filename)
+    data = list(islice(iter_raw_data(filename), limit))
     
-    with open(file_path, 'r') as f:
-        data = json.load(f)
-    
-    print(f"Loaded {len(data)} records from {file_path}")
+    print(f"Loaded {len(data)} records from {os.path.join('raw_data', filename)}")
     return data
 
+def iter_raw_data(filename: str):
+    """
+    Stream raw records from a JSON file one at a time.
+    
+    The file's array is decoded incrementally, so arbitrarily large vendor dumps can be
+    standardized with constant memory.
+    
+    Args:
+        filename: Name of the file in raw_data/ to read
+        
+    Yields:
+        Dictionaries containing raw financial records
+    """
+    yield from iter_json_file(os.path.join("raw_data", filename))
+
 def apply_standardization_rules(raw_records: list[dict], data_type: str = "Historical Prices") -> list[dict]:
     """
     Apply standardization rules to raw financial records.
@@ -33,60 +91,139 @@ def apply_standardization_rules(raw_records: list[dict], data_type: str = "Histo
     Returns:
         List of dictionaries containing standardized financial records
     """
-    standardized_records = []
+    standardized_records = list(iter_standardized_records(raw_records, data_type))
     
+    if data_type == "Income Statement":
+        print(f"Standardized {len(standardized_records)} income statement records")
+    else:
+        print(f"Standardized {len(standardized_records)} records")
+    return standardized_records
+
+def iter_standardized_records(raw_records, data_type: str = "Historical Prices"):
+    """
+    Lazily apply standardization rules to a stream of raw financial records.
+    
+    Args:
+        raw_records: Iterable of dictionaries containing raw financial records
+        data_type: Type of financial data ("Historical Prices" or "Income Statement")
+        
+    Yields:
+        Standardized financial records, one at a time
+    """
     # Handle different data types differently
     if data_type == "Income Statement":
-        return standardize_income_statement(raw_records, data_type)
+        for statement in raw_records:
+            yield from standardize_statement(statement, data_type)
     else:
-        # Default handling for Historical Prices and other types
-        for record in raw_records:
-            standardized_record = record.copy()
-            
-            # Standardize date to YYYY-MM-DD format
-            try:
-                # Try different date formats
-                date_formats = [
-                    "%m/%d/%Y",    # MM/DD/YYYY
-                    "%Y-%m-%d",    # YYYY-MM-DD
-                    "%d-%b-%Y",    # DD-Mon-YYYY
-                    "%b %d, %Y"    # Mon DD, YYYY
-                ]
-                
-                parsed_date = None
-                for fmt in date_formats:
-                    try:
-                        parsed_date = datetime.datetime.strptime(record["date"], fmt)
-                        break
-                    except ValueError:
-                        continue
-                
-                if parsed_date:
-                    standardized_record["date"] = parsed_date.strftime("%Y-%m-%d")
-                else:
-                    print(f"Warning: Could not parse date '{record['date']}' for record {record['id']}")
-                    standardized_record["date"] = "1900-01-01"  # Default date for unparseable dates
-            except Exception as e:
-                print(f"Error standardizing date: {e}")
-                standardized_record["date"] = "1900-01-01"
-            
-            # Standardize value to float
-            try:
-                value_str = record["value"]
-                # Remove currency symbols, commas, etc.
-                cleaned_value = re.sub(r'[^\d.]', '', value_str.replace(',', ''))
-                standardized_record["value"] = float(cleaned_value)
-            except Exception as e:
-                print(f"Error standardizing value: {e}")
-                standardized_record["value"] = 0.0
-            
-            # Add data_type to the record
-            standardized_record["data_type"] = data_type
-            
-            standardized_records.append(standardized_record)
+        # Default handling for Historical Prices and other types. Values are parsed a chunk
+        # at a time with parse_value_column; rows repeating the same key within a chunk are
+        # told apart by occurrence, like a standardize_records_frame batch. Occurrences are
+        # only tracked per chunk, so memory stays bounded however long the stream is.
+        raw_records = iter(raw_records)
+        while chunk := list(islice(raw_records, STANDARDIZE_CHUNK_SIZE)):
+            values = parse_value_column([record.get("value") for record in chunk], default=None).tolist()
+            occurrences = {}
+            for record, value in zip(chunk, values):
+                standardized_record = standardize_record(record, data_type, None if pd.isna(value) else value)
+                record_id = standardized_record["id"]
+                occurrence = occurrences[record_id] = occurrences.get(record_id, -1) + 1
+                if occurrence:
+                    standardized_record["id"] = record_key_id(record, data_type, occurrence)
+                yield standardized_record
+
+def standardize_record(record: dict, data_type: str = "Historical Prices", parsed_value: float = None) -> dict:
+    """
+    Apply standardization rules to a single raw record.
     
-    print(f"Standardized {len(standardized_records)} records")
-    return standardized_records
+    Args:
+        record: Raw financial record with date, value and description keys
+        data_type: Type of financial data to tag the record with
+        parsed_value: The record's value if already parsed (e.g. by parse_value_column)
+        
+    Returns:
+        Standardized copy of the record
+    """
+    standardized_record = record.copy()
+    
+    # Standardize date to YYYY-MM-DD format
+    try:
+        parsed_date = parse_date(record["date"])
+        
+        if parsed_date:
+            standardized_record["date"] = parsed_date
+        else:
+            print(f"Warning: Could not parse date '{record['date']}' for record {record.get('id')}")
+            standardized_record["date"] = DEFAULT_DATE  # Default date for unparseable dates
+    except Exception as e:
+        print(f"Error standardizing date: {e}")
+        standardized_record["date"] = DEFAULT_DATE
+        parsed_date = None
+    
+    standardized_record["id"] = record_key_id(record, data_type, parsed_date=parsed_date)
+    
+    # Standardize value to float (currency symbols, commas, signs, parentheses, K/M/B/T)
+    try:
+        value = parse_value(record["value"]) if parsed_value is None else parsed_value
+        
+        if value is not None:
+            standardized_record["value"] = value
+        else:
+            print(f"Error standardizing value: could not parse {record['value']!r}")
+            standardized_record["value"] = 0.0
+    except Exception as e:
+        print(f"Error standardizing value: {e}")
+        standardized_record["value"] = 0.0
+    
+    # Add data_type to the record
+    standardized_record["data_type"] = data_type
+    
+    return standardized_record
+
+def record_key_id(record: dict, data_type: str, occurrence: int = 0, parsed_date=None) -> str:
+    """
+    Build the content-derived ID of a raw record.
+    
+    Every writer keys records through this function (standardize_records_frame passes
+    the upload's symbol), so the same record gets the same ID on every path. Records
+    without a symbol are keyed by their description, and unparseable dates by their raw
+    text so they don't all collapse onto the fallback date.
+    
+    Args:
+        record: Raw financial record with date, description and optional symbol keys
+        data_type: Type of financial data
+        occurrence: Index among records with the same key in one batch
+        parsed_date: The record's standardized date, if already parsed
+        
+    Returns:
+        32-character hex ID
+    """
+    if parsed_date is None and isinstance(record.get("date"), str):
+        parsed_date = parse_date(record["date"])
+    description = record.get("description")
+    return make_record_id(
+        record.get("symbol") or description,
+        data_type,
+        description,
+        parsed_date or f"raw:{record.get('date')}",
+        occurrence
+    )
+
+def record_symbol(record: dict):
+    """
+    Get the symbol a standardized record belongs to.
+    
+    Pipeline records carry the ticker in the description field when they have no
+    explicit symbol; free-text descriptions (e.g. "Travel expense") are not symbols.
+    
+    Args:
+        record: Standardized financial record
+        
+    Returns:
+        Normalized symbol, or None if the record has none
+    """
+    if record.get("symbol"):
+        return normalize_symbol(record["symbol"])
+    return description_symbol(record.get("description"))
 
 def standardize_income_statement(raw_records: list[dict], data_type: str) -> list[dict]:
     """
@@ -100,6 +237,24 @@ def standardize_income_statement(raw_records: list[dict], data_type: str) -> lis
         List of dictionaries containing standardized income statement records
     """
     standardized_records = []
+    for statement in raw_records:
+        standardized_records.extend(standardize_statement(statement, data_type))
+    
+    print(f"Standardized {len(standardized_records)} income statement records")
+    return standardized_records
+
+def standardize_statement(statement: dict, data_type: str = "Income Statement") -> list[dict]:
+    """
+    Split one income statement into standardized records, one per key metric.
+    
+    Args:
+        statement: Raw income statement record
+        data_type: Type of financial data (should be "Income Statement")
+        
+    Returns:
+        List of standardized records for the metrics present in the statement
+    """
+    standardized_records = []
     
     # Income statement data from Financial Modeling Prep has a different structure
     # We need to extract key metrics and create individual records for each
@@ -112,106 +267,288 @@ def standardize_income_statement(raw_records: list[dict], data_type: str) -> lis
         {"key": "netIncome", "description": "Net Income"}
     ]
     
-    # Process each income statement record
-    for statement in raw_records:
-        # Extract date (usually in format YYYY-MM-DD)
+    # Extract date (usually in format YYYY-MM-DD)
+    try:
+        date_str = statement.get("date", statement.get("fillingDate", statement.get("calendarYear", "1900-01-01")))
+        # Try to parse the date
         try:
-            date_str = statement.get("date", statement.get("fillingDate", statement.get("calendarYear", "1900-01-01")))
-            # Try to parse the date
-            try:
-                parsed_date = datetime.datetime.strptime(date_str, "%Y-%m-%d")
-            except ValueError:
-                # If it's just a year, convert to YYYY-01-01 format
-                if re.match(r'^\d{4}$', date_str):
-                    parsed_date = datetime.datetime.strptime(f"{date_str}-01-01", "%Y-%m-%d")
-                else:
-                    print(f"Warning: Could not parse date '{date_str}' for income statement")
-                    parsed_date = datetime.datetime.strptime("1900-01-01", "%Y-%m-%d")
-                    
-            date = parsed_date.strftime("%Y-%m-%d")
-        except Exception as e:
-            print(f"Error standardizing income statement date: {e}")
-            date = "1900-01-01"
+            parsed_date = datetime.datetime.strptime(date_str, "%Y-%m-%d")
+        except ValueError:
+            # If it's just a year, convert to YYYY-01-01 format
+            if re.match(r'^\d{4}$', date_str):
+                parsed_date = datetime.datetime.strptime(f"{date_str}-01-01", "%Y-%m-%d")
+            else:
+                print(f"Warning: Could not parse date '{date_str}' for income statement")
+                parsed_date = datetime.datetime.strptime("1900-01-01", "%Y-%m-%d")
+                
+        date = parsed_date.strftime("%Y-%m-%d")
+    except Exception as e:
+        print(f"Error standardizing income statement date: {e}")
+        date = "1900-01-01"
+    
+    # Extract each metric and create a standardized record
+    for metric in income_metrics:
+        key = metric["key"]
+        description = metric["description"]
         
-        # Extract each metric and create a standardized record
-        for metric in income_metrics:
-            key = metric["key"]
-            description = metric["description"]
+        # Skip if the metric doesn't exist in this statement
+        if key not in statement:
+            continue
             
-            # Skip if the metric doesn't exist in this statement
-            if key not in statement:
-                continue
-                
-            try:
-                # Get the value and convert to float
-                value = float(statement[key])
-                
-                # Create a unique ID for this record
-                record_id = f"income_{key}_{date}_{hash(str(statement.get('symbol', '')))}"
-                
-                # Create standardized record
-                standardized_record = {
-                    "id": record_id,
-                    "date": date,
-                    "value": value,
-                    "description": description,
-                    "data_type": data_type
-                }
-                
-                standardized_records.append(standardized_record)
-                
-            except Exception as e:
-                print(f"Error standardizing income statement value for {key}: {e}")
+        try:
+            # Get the value and convert to float
+            value = float(statement[key])
+            
+            # Create a stable ID for this record
+            record_id = make_record_id(statement.get("symbol", ""), data_type, key, date)
+            
+            # Create standardized record
+            standardized_record = {
+                "id": record_id,
+                "date": date,
+                "value": value,
+                "description": description,
+                "data_type": data_type,
+                "symbol": statement.get("symbol", "")
+            }
+            
+            standardized_records.append(standardized_record)
+            
+        except Exception as e:
+            print(f"Error standardizing income statement value for {key}: {e}")
     
-    print(f"Standardized {len(standardized_records)} income statement records")
     return standardized_records
 
-def load_standardized_data_to_db(standardized_records: list[dict], db_path: str = 'data.db'):
+def standardize_date_column(dates) -> pd.Series:
+    """
+    Standardize a whole column of raw dates to YYYY-MM-DD.
+    
+    Args:
+        dates: Sequence or Series of raw date values
+        
+    Returns:
+        Series of YYYY-MM-DD strings (DEFAULT_DATE where no format matched)
+    """
+    return parse_date_column(dates, DEFAULT_DATE)
+
+def standardize_value_column(values) -> pd.Series:
+    """
+    Standardize a whole column of raw values to floats.
+    
+    Args:
+        values: Sequence or Series of raw values
+        
+    Returns:
+        Series of floats (0.0 where a value couldn't be parsed)
+    """
+    return parse_value_column(values, default=0.0)
+
+def standardize_records_frame(raw_records: list[dict], data_type: str, symbol: str) -> pd.DataFrame:
+    """
+    Standardize a batch of raw records column-wise.
+    
+    Args:
+        raw_records: List of dictionaries with date, value and optional description keys
+        data_type: Type of financial data to tag the records with
+        symbol: Stock symbol the records belong to (also the default description)
+        
+    Returns:
+        DataFrame with id, date, value, description, data_type and symbol columns
+    """
+    frame = pd.DataFrame.from_records(raw_records)
+    num_records = len(frame)
+    
+    def column(name, default):
+        return frame[name] if name in frame else pd.Series([default] * num_records, dtype=object)
+    
+    raw_dates = column("date", "").astype(object)
+    raw_dates = raw_dates.where(raw_dates.notna(), None)  # missing dates key like absent ones
+    parsed_dates = parse_date_column(raw_dates, default=None)
+    standardized = pd.DataFrame({
+        "date": parsed_dates.fillna(DEFAULT_DATE).to_numpy(),
+        "value": standardize_value_column(column("value", "0")).to_numpy(),
+        "description": column("description", symbol).fillna(symbol).to_numpy(),
+        "data_type": data_type,
+        "symbol": normalize_symbol(symbol)
+    })
+    
+    # Stable IDs from the same key as the streaming path; rows repeating a key are told
+    # apart by occurrence
+    keyed = [
+        ({"symbol": symbol, "description": description, "date": raw_date}, parsed_date)
+        for description, raw_date, parsed_date in zip(standardized["description"], raw_dates, parsed_dates)
+    ]
+    ids = pd.Series([record_key_id(record, data_type, parsed_date=parsed_date) for record, parsed_date in keyed])
+    occurrences = ids.groupby(ids, sort=False).cumcount().to_numpy()
+    standardized.insert(0, "id", [
+        record_key_id(record, data_type, occurrence, parsed_date) if occurrence else record_id
+        for (record, parsed_date), record_id, occurrence in zip(keyed, ids, occurrences)
+    ])
+    return standardized
+
+# Upsert used by every writer of standardized_financial_data. Unlike INSERT OR REPLACE it
+# updates conflicting rows in place, so the row count triggers only see real inserts.
+STANDARDIZED_COLUMNS = ["id", "date", "value", "description", "data_type", "symbol", "content_hash"]
+UPSERT_STANDARDIZED_SQL = '''
+INSERT INTO standardized_financial_data (id, date, value, description, data_type, symbol, content_hash)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET
+    date = excluded.date,
+    value = excluded.value,
+    description = excluded.description,
+    data_type = excluded.data_type,
+    symbol = excluded.symbol,
+    content_hash = excluded.content_hash
+'''
+
+# Incremental loads leave rows whose content hasn't changed untouched
+INCREMENTAL_UPSERT_STANDARDIZED_SQL = UPSERT_STANDARDIZED_SQL + '''WHERE standardized_financial_data.content_hash IS NOT excluded.content_hash
+'''
+
+def insert_standardized_frame(conn: sqlite3.Connection, frame: pd.DataFrame) -> int:
+    """
+    Insert standardized records in one bulk transaction.
+    
+    Args:
+        conn: Open database connection (committed on success, rolled back on error)
+        frame: DataFrame from standardize_records_frame
+        
+    Returns:
+        Number of records written
+    """
+    frame = frame.assign(content_hash=[
+        content_hash(*row) for row in frame[STANDARDIZED_COLUMNS[1:6]].itertuples(index=False, name=None)
+    ])
+    
+    with conn:
+        conn.executemany(UPSERT_STANDARDIZED_SQL, frame[STANDARDIZED_COLUMNS].itertuples(index=False, name=None))
+        
+        # Register any new symbols in the symbol dimension
+        conn.executemany("INSERT OR IGNORE INTO financial_symbols (symbol) VALUES (?)",
+                         [(symbol,) for symbol in frame["symbol"].unique()])
+    
+    return len(frame)
+
+def standardized_row(record: dict) -> tuple:
+    """
+    Convert a standardized record to a row tuple in STANDARDIZED_COLUMNS order.
+    
+    Args:
+        record: Standardized financial record
+        
+    Returns:
+        Tuple of (id, date, value, description, data_type, symbol, content_hash)
+    """
+    row = (
+        record["date"],
+        record["value"],
+        record["description"],
+        record.get("data_type", "Historical Prices"),  # Default to Historical Prices if not specified
+        record_symbol(record)
+    )
+    return (record["id"], *row, content_hash(*row))
+
+def load_standardized_data_to_db(standardized_records, db_path: str = 'data.db', chunk_size: int = None,
+                                 staging: bool = False, incremental: bool = False) -> int:
     """
     Load standardized data into a SQLite database.
     
+    Records are written in bulk with executemany, one transaction per chunk. With
+    staging=True each chunk is first bulk-inserted into a temporary table (no indexes
+    or triggers to maintain) and then merged into the main table with a single
+    INSERT ... SELECT ... ON CONFLICT upsert, which is faster for large loads.
+    
+    Record IDs are derived from content keys, so re-loading the same data updates rows
+    in place. With incremental=True, rows whose stored content hash matches are skipped
+    entirely, so re-running a load over unchanged data writes (almost) nothing.
+    
     Args:
-        standardized_records: List of dictionaries containing standardized financial records
+        standardized_records: List (or any iterable, e.g. a generator) of dictionaries
+                              containing standardized financial records
         db_path: Path to the SQLite database file
+        chunk_size: Commit every chunk_size records so a streamed load never holds a
+                    large transaction open (None commits once at the end)
+        staging: Merge each chunk through a temporary staging table
+        incremental: Only write records that are new or whose content changed
+        
+    Returns:
+        Number of records loaded
     """
-    # Connect to SQLite database (creates it if it doesn't exist)
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
-    # Create table if it doesn't exist
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS standardized_financial_data (
-        id TEXT PRIMARY KEY,
-        date TEXT,
-        value REAL,
-        description TEXT,
-        data_type TEXT
-    )
-    ''')
+    # Create tables and indexes if they don't exist (and switch the database to WAL)
+    init_schema(db_path)
+    
+    conn = connect(db_path)
+    if staging:
+        conn.execute('''
+        CREATE TEMP TABLE IF NOT EXISTS staged_financial_data (
+            id TEXT, date TEXT, value REAL, description TEXT, data_type TEXT, symbol TEXT, content_hash TEXT
+        )
+        ''')
+    
+    upsert_sql = INCREMENTAL_UPSERT_STANDARDIZED_SQL if incremental else UPSERT_STANDARDIZED_SQL
+    rows = map(standardized_row, standardized_records)
+    loaded = 0
+    written = 0
+    committed = 0
+    rows_before = get_row_count(conn)
+    try:
+        while True:
+            chunk = list(islice(rows, chunk_size)) if chunk_size else list(rows)
+            if not chunk:
+                break
+            
+            with conn:
+                if staging:
+                    written += _merge_staged_chunk(conn, chunk, incremental)
+                else:
+                    written += conn.executemany(upsert_sql, chunk).rowcount
+                    
+                    # Register any new symbols in the symbol dimension
+                    conn.executemany("INSERT OR IGNORE INTO financial_symbols (symbol) VALUES (?)",
+                                     [(symbol,) for symbol in {row[5] for row in chunk} if symbol])
+            
+            loaded += len(chunk)
+            committed = written
+            if not chunk_size:
+                break
+        
+        rows_after = get_row_count(conn)
+        print(f"Loaded {loaded} records into database {db_path} "
+              f"({rows_after - rows_before} new, {written - (rows_after - rows_before)} updated, "
+              f"{loaded - written} unchanged)")
+        print(f"Database now contains {rows_after} records")
+    finally:
+        # Invalidate cached chart responses for whatever made it into the database
+        # (an incremental load that changed nothing keeps them valid)
+        if committed:
+            bump_data_version(db_path)
+        conn.close()
     
-    # Insert records
-    for record in standardized_records:
-        cursor.execute('''
-        INSERT OR REPLACE INTO standardized_financial_data (id, date, value, description, data_type)
-        VALUES (?, ?, ?, ?, ?)
-        ''', (
-            record["id"],
-            record["date"],
-            record["value"],
-            record["description"],
-            record.get("data_type", "Historical Prices")  # Default to Historical Prices if not specified
-        ))
-    
-    # Commit changes and close connection
-    conn.commit()
-    print(f"Loaded {len(standardized_records)} records into database {db_path}")
-    
-    # Verify data was inserted
-    cursor.execute("SELECT COUNT(*) FROM standardized_financial_data")
-    count = cursor.fetchone()[0]
-    print(f"Database now contains {count} records")
-    
-    conn.close()
+    return loaded
+
+def _merge_staged_chunk(conn: sqlite3.Connection, chunk: list[tuple], incremental: bool = False) -> int:
+    # Bulk insert into the unindexed temp table, then merge with one upsert; ORDER BY
+    # rowid keeps "last record wins" for duplicate IDs within the chunk. Returns the
+    # number of rows written to the main table.
+    conn.executemany("INSERT INTO staged_financial_data VALUES (?, ?, ?, ?, ?, ?, ?)", chunk)
+    written = conn.execute(f'''
+    INSERT INTO standardized_financial_data (id, date, value, description, data_type, symbol, content_hash)
+    SELECT id, date, value, description, data_type, symbol, content_hash FROM staged_financial_data ORDER BY rowid
+    ON CONFLICT(id) DO UPDATE SET
+        date = excluded.date,
+        value = excluded.value,
+        description = excluded.description,
+        data_type = excluded.data_type,
+        symbol = excluded.symbol,
+        content_hash = excluded.content_hash
+    {"WHERE standardized_financial_data.content_hash IS NOT excluded.content_hash" if incremental else ""}
+    ''').rowcount
+    conn.execute('''
+    INSERT OR IGNORE INTO financial_symbols (symbol)
+    SELECT DISTINCT symbol FROM staged_financial_data WHERE symbol IS NOT NULL
+    ''')
+    conn.execute("DELETE FROM staged_financial_data")
+    return written
 
 if __name__ == "__main__":
     # Test the functions
@@ -216,6 +216,45 @@ function initCharts() {
     }
 }
 
+/**
+ * Decodes a base64 string into an ArrayBuffer
+ * @param {string} base64 - Base64 encoded bytes
+ * @returns {ArrayBuffer} - The decoded bytes
+ */
+function base64ToArrayBuffer(base64) {
+    const binary = atob(base64 || '');
+    const bytes = new Uint8Array(binary.length);
+    for (let i = 0; i < binary.length; i++) {
+        bytes[i] = binary.charCodeAt(i);
+    }
+    return bytes.buffer;
+}
+
+/**
+ * Expands a columnar chart response into the usual dates/values arrays.
+ * Columnar responses carry dates as little-endian int32 days since 1970-01-01
+ * and values as little-endian float64, both base64 encoded.
+ * @param {Object} data - Response from /api/historical_chart_data
+ * @returns {Object} - The same response with dates and values arrays filled in
+ */
+function decodeColumnarChartData(data) {
+    if (!data || data.encoding !== 'columnar') return data;
+    
+    const dayView = new DataView(base64ToArrayBuffer(data.dates_b64));
+    const valueView = new DataView(base64ToArrayBuffer(data.values_b64));
+    const count = dayView.byteLength / 4;
+    
+    data.dates = new Array(count);
+    data.values = new Array(count);
+    for (let i = 0; i < count; i++) {
+        const day = dayView.getInt32(i * 4, true);
+        data.dates[i] = new Date(day * 86400000).toISOString().slice(0, 10);
+        data.values[i] = valueView.getFloat64(i * 8, true);
+    }
+    
+    return data;
+}
+
 /**
  * Updates charts with data for the selected company and category
  * @param {string} symbol - The company symbol
@@ -233,11 +272,11 @@ function updateCharts(symbol, category) {
         </div>
     `;
     
-    // Fetch data from API
-    fetchAPI(`/api/historical_chart_data/${symbol}?data_type=${encodeURIComponent(category)}`)
+    // Fetch data from API (columnar encoding keeps long series compact)
+    fetchAPI(`/api/historical_chart_data/${symbol}?data_type=${encodeURIComponent(category)}&format=columnar`)
         .then(data => {
             // Store the data globally
-            chartData = data;
+            chartData = decodeColumnarChartData(data);
             
             // Check if there's an error in the response
             if (data.error) {
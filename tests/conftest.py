@@ -0,0 +1,40 @@
+import os
+import sys
+import pytest
+
+# The modules under test live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mock_fmp_server
+
+@pytest.fixture
+def start_server():
+    # Starts mock FMP servers on free ports and shuts them all down after the test
+    servers = []
+
+    def start(**options):
+        server = mock_fmp_server.start_server(**options)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    # Flask test client on a fresh data.db in a temporary working directory
+    monkeypatch.chdir(tmp_path)
+    import app
+    from financial_db import ConnectionPool, init_schema
+
+    db_path = str(tmp_path / "data.db")
+    init_schema(db_path)
+    pool = ConnectionPool(db_path)
+    monkeypatch.setattr(app, "DB_PATH", db_path)
+    monkeypatch.setattr(app, "db_pool", pool)
+    app.chart_data_cache.clear()
+
+    yield app.app.test_client()
+    pool.close_all()
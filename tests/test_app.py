@@ -0,0 +1,198 @@
+import base64
+import datetime
+import json
+import sqlite3
+import struct
+from financial_db import connect, bump_data_version
+from standardization_service import standardize_records_frame, insert_standardized_frame
+
+def load_upload(tmp_path, records, symbol="AAPL", data_type="Historical Prices"):
+    conn = connect(str(tmp_path / "data.db"))
+    insert_standardized_frame(conn, standardize_records_frame(records, data_type, symbol))
+    conn.close()
+    bump_data_version(str(tmp_path / "data.db"))
+
+def test_columnar_chart_data_keeps_full_precision(client, tmp_path):
+    values = [123456.78, 394328000000.0, 0.1]
+    load_upload(tmp_path, [{"date": f"2025-06-0{day}", "value": value} for day, value in enumerate(values, 1)])
+
+    data = client.get("/api/historical_chart_data/AAPL?format=columnar").get_json()
+
+    assert data["encoding"] == "columnar"
+    days = struct.unpack("<3i", base64.b64decode(data["dates_b64"]))
+    assert [str(datetime.date(1970, 1, 1) + datetime.timedelta(days=day)) for day in days] == [
+        "2025-06-01", "2025-06-02", "2025-06-03"]
+    assert list(struct.unpack("<3d", base64.b64decode(data["values_b64"]))) == values
+
+def test_chart_data_revalidates_with_etags(client, tmp_path):
+    load_upload(tmp_path, [{"date": "2025-06-02", "value": "10"}])
+
+    first = client.get("/api/chart_data")
+    assert first.status_code == 200 and first.get_json()["values"] == [10.0]
+    assert first.headers["Cache-Control"] == "no-cache"
+
+    # Unchanged data: the client's copy is still current
+    revalidated = client.get("/api/chart_data", headers={"If-None-Match": first.headers["ETag"]})
+    assert revalidated.status_code == 304 and revalidated.data == b""
+    assert revalidated.headers["ETag"] == first.headers["ETag"]
+
+    # Other parameters are cached separately
+    other = client.get("/api/chart_data?data_type=Revenue", headers={"If-None-Match": first.headers["ETag"]})
+    assert other.status_code == 200 and other.headers["ETag"] != first.headers["ETag"]
+
+    # A load bumps the data version, which invalidates the ETag and the cached payload
+    load_upload(tmp_path, [{"date": "2025-06-03", "value": "20"}])
+    refreshed = client.get("/api/chart_data", headers={"If-None-Match": first.headers["ETag"]})
+    assert refreshed.status_code == 200 and refreshed.get_json()["values"] == [10.0, 20.0]
+    assert refreshed.headers["ETag"] != first.headers["ETag"]
+
+def test_historical_chart_data_picks_the_best_symbol_match(client, tmp_path):
+    load_upload(tmp_path, [{"date": "2025-06-02", "value": "1"}], "AAPL", "Historical Prices")
+    load_upload(tmp_path, [{"date": "2024-12-31", "value": "2"}], "AAPL", "Revenue")
+    load_upload(tmp_path, [{"date": "2025-06-02", "value": "3"}], "AA", "Historical Prices")
+
+    def series(symbol, data_type="Historical Prices"):
+        data = client.get(f"/api/historical_chart_data/{symbol}?data_type={data_type}").get_json()
+        return data["values"], data["data_type"]
+
+    # 1. exact symbol and data type, ahead of the partial match AA -> AAPL
+    assert series("AAPL") == ([1.0], "Historical Prices")
+    assert series("aa") == ([3.0], "Historical Prices")
+    # 2. exact symbol, any data type
+    assert series("AA", "Revenue") == ([3.0], "Historical Prices")
+    # 3. partial symbol match, every data type, by date
+    assert series("APL", "Revenue") == ([2.0, 1.0], "Historical Prices")
+    assert series("ZZZ") == ([], "Historical Prices")
+
+def test_bucketed_series_aggregates_ohlc(client, tmp_path):
+    load_upload(tmp_path, [{"date": date, "value": value} for date, value in [
+        ("2025-06-02", "10"), ("2025-06-04", "5"), ("2025-06-06", "7"), ("2025-06-08", "8"),  # week of Mon 06-02
+        ("2025-06-09", "20"), ("2025-08-15", "3")
+    ]])
+
+    weekly = client.get("/api/historical_chart_data/AAPL?bucket=week&agg=max").get_json()
+    assert weekly["dates"] == ["2025-06-02", "2025-06-09", "2025-08-11"]
+    assert weekly["values"] == weekly["high"] == [10.0, 20.0, 3.0]
+    assert weekly["open"] == [10.0, 20.0, 3.0] and weekly["close"] == [8.0, 20.0, 3.0]
+    assert weekly["low"] == [5.0, 20.0, 3.0]
+    assert weekly["sum"] == [30.0, 20.0, 3.0] and weekly["mean"] == [7.5, 20.0, 3.0]
+    assert weekly["count"] == [4, 1, 1]
+    assert weekly["stats"] == {"count": 6, "min": 3.0, "max": 20.0, "avg": 53 / 6,
+                               "first_date": "2025-06-02", "last_date": "2025-08-15"}
+
+    quarterly = client.get("/api/historical_chart_data/AAPL?bucket=quarter&agg=last").get_json()
+    assert quarterly["dates"] == ["2025-04-01", "2025-07-01"]
+    assert quarterly["values"] == [20.0, 3.0]
+
+    monthly = client.get("/api/chart_data?bucket=month").get_json()
+    assert monthly["dates"] == ["2025-06-01", "2025-08-01"]
+    assert monthly["opens"] == [10.0, 3.0] and monthly["closes"] == [20.0, 3.0]
+    assert monthly["mins"] == [5.0, 3.0] and monthly["maxs"] == [20.0, 3.0]
+
+    assert client.get("/api/historical_chart_data/AAPL?bucket=year").status_code == 400
+    assert client.get("/api/chart_data?bucket=year").status_code == 400
+
+def test_upload_standardizes_and_loads_records(client, tmp_path):
+    records = [
+        {"date": "06/02/2025", "value": "$1,234.50", "description": "Travel"},
+        {"date": "Jun 03, 2025", "value": "(250)"},
+        {"date": "not a date", "value": "1.2K", "description": "Travel"},
+        {"date": "2025-06-04", "value": "n/a", "description": "Travel"},
+        {"date": "2025-06-04", "value": "n/a", "description": "Travel"}  # a genuine repeat is kept
+    ]
+
+    response = client.post("/process_uploaded_data", data={
+        "data": json.dumps(records), "symbol": "acme", "category": "Expenses"})
+
+    assert response.get_json()["records_processed"] == response.get_json()["total_records"] == 5
+    with sqlite3.connect(tmp_path / "data.db") as conn:
+        rows = conn.execute("SELECT date, value, description, data_type, symbol FROM standardized_financial_data "
+                            "ORDER BY rowid").fetchall()
+        run = conn.execute("SELECT status, run_type, symbol, data_type, records_processed, source_bytes "
+                           "FROM pipeline_runs_history").fetchone()
+    assert rows == [
+        ("2025-06-02", 1234.5, "Travel", "Expenses", "ACME"),
+        ("2025-06-03", -250.0, "ACME", "Expenses", "ACME"),
+        ("1900-01-01", 1200.0, "Travel", "Expenses", "ACME"),
+        ("2025-06-04", 0.0, "Travel", "Expenses", "ACME"),
+        ("2025-06-04", 0.0, "Travel", "Expenses", "ACME")
+    ]
+    assert run[:5] == ("SUCCESS", "upload", "ACME", "Expenses", 5) and run[5] > 0
+
+    # Uploading the same rows again updates them in place
+    client.post("/process_uploaded_data", data={"data": json.dumps(records), "symbol": "ACME", "category": "Expenses"})
+    with sqlite3.connect(tmp_path / "data.db") as conn:
+        assert conn.execute("SELECT COUNT(*) FROM standardized_financial_data").fetchone() == (5,)
+
+def test_upload_rejects_missing_data(client):
+    assert client.post("/process_uploaded_data", data={"symbol": "ACME"}).status_code == 400
+    assert client.post("/process_uploaded_data", data={"data": "[]", "symbol": "ACME"}).status_code == 400
+
+def add_runs(tmp_path, runs):
+    now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    conn = connect(str(tmp_path / "data.db"))
+    with conn:
+        for run in runs:
+            run = dict({"timestamp": now, "status": "SUCCESS", "run_type": "single", "symbol": "AAPL",
+                        "data_type": "Historical Prices", "records_processed": 10}, **run)
+            conn.execute(f"INSERT INTO pipeline_runs_history ({', '.join(run)}) VALUES ({', '.join('?' * len(run))})",
+                         list(run.values()))
+    conn.close()
+
+def test_pipeline_runs_are_paged_newest_first(client, tmp_path):
+    add_runs(tmp_path, [{"records_processed": i} for i in range(5)])
+
+    pages, before = [], ""
+    while before is not None:
+        data = client.get(f"/api/pipeline_runs?limit=2&before={before}").get_json()
+        pages.append([run["records_processed"] for run in data["runs"]])
+        before = data["next_before"]
+
+    assert pages == [[4, 3], [2, 1], [0]]
+
+def test_pipeline_runs_filters(client, tmp_path):
+    add_runs(tmp_path, [{"symbol": "AAPL"}, {"symbol": "MSFT", "status": "FAILURE"},
+                        {"symbol": "MSFT"}, {"symbol": None, "run_type": "batch", "status": "PARTIAL"}])
+
+    def symbols(query):
+        return [run["symbol"] for run in client.get(f"/api/pipeline_runs?{query}").get_json()["runs"]]
+
+    assert symbols("symbol=msft") == ["MSFT", "MSFT"]
+    assert symbols("symbol=MSFT&status=SUCCESS") == ["MSFT"]
+    assert symbols("status=PARTIAL") == [None]
+    assert symbols("run_type=single&status=SUCCESS") == ["MSFT", "AAPL"]
+
+def test_pipeline_runs_tolerates_invalid_paging_input(client, tmp_path):
+    add_runs(tmp_path, [{} for _ in range(3)])
+
+    def count(query):
+        response = client.get(f"/api/pipeline_runs?{query}")
+        assert response.status_code == 200
+        return len(response.get_json()["runs"])
+
+    # Unparseable values fall back to the defaults; limits are clamped to 1-500
+    assert count("limit=abc&before=xyz") == 3
+    assert count("limit=0") == 1
+    assert count("limit=-5") == 1
+    assert count("limit=100000") == 3
+    assert count("before=1") == 0
+
+def test_pipeline_run_trends_percentiles(client, tmp_path):
+    add_runs(tmp_path, [{"duration_seconds": seconds, "rows_per_second": 100.0} for seconds in (4, 1, 10, 3, 2)]
+             + [{"duration_seconds": 100, "status": "FAILURE"}, {"data_type": "Income Statement", "duration_seconds": 7}])
+    conn = connect(str(tmp_path / "data.db"))
+    with conn:
+        conn.executemany("INSERT INTO pipeline_stage_metrics (run_id, stage, seconds) VALUES (?, 'load', ?)",
+                         [(1, 0.5), (2, 1.5)])
+    conn.close()
+
+    data = client.get("/api/pipeline_runs/trends?days=7").get_json()
+
+    prices, income = data["data_types"]
+    assert (prices["data_type"], prices["runs"], prices["failures"], prices["errors"]) == ("Historical Prices", 6, 1, 0)
+    # Failed runs are left out of the durations: p50 of 1-4 and 10 is 3, p95 interpolates 4 -> 10
+    assert (prices["duration_p50"], prices["duration_p95"]) == (3, 8.8)
+    assert (prices["rows_per_second_p50"], prices["rows_per_second_p95"]) == (100.0, 100.0)
+    assert prices["stages"] == {"load": {"seconds_p50": 1.0, "seconds_p95": 1.45}}
+    assert [(day["runs"], day["duration_p50"]) for day in prices["daily"]] == [(5, 3)]
+    assert (income["runs"], income["duration_p50"], income["duration_p95"]) == (1, 7, 7)
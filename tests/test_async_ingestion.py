@@ -0,0 +1,119 @@
+import asyncio
+import json
+import types
+import pytest
+import requests
+import async_ingestion
+from async_ingestion import AsyncIngestionClient, RateLimiter, iter_ingested
+
+SYMBOLS = [f"SYM{i}" for i in range(12)]
+
+class FakeClock:
+    # Stands in for time.monotonic and asyncio.sleep; sleeping just advances the clock
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+def fetch_all(server, pairs, **options):
+    options = {"base_url": server.base_url, "api_key": "test", "rate_limits": {}, "backoff_factor": 0.01,
+               **options}
+    return list(iter_ingested(pairs, num_records=30, **options))
+
+def test_semaphore_bounds_requests_in_flight(start_server):
+    server = start_server(latency=0.05)
+    results = fetch_all(server, [(symbol, "Income Statement") for symbol in SYMBOLS], max_concurrency=3)
+
+    assert len(results) == len(SYMBOLS)
+    assert all(error is None and records for _, _, records, error, _ in results)
+    assert server.max_in_flight == 3
+
+def test_rate_limiter_refills_at_its_rate(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(async_ingestion, "time", types.SimpleNamespace(monotonic=clock.monotonic))
+    monkeypatch.setattr(asyncio, "sleep", clock.sleep)
+
+    async def acquire_all(limiter, count):
+        for _ in range(count):
+            await limiter.acquire()
+
+    # The burst is free
+    limiter = RateLimiter(rate=20, burst=5)
+    asyncio.run(acquire_all(limiter, 5))
+    assert clock.sleeps == [] and limiter._tokens == 0
+
+    # The remaining 10 tokens arrive at 20 per second
+    asyncio.run(acquire_all(limiter, 10))
+    assert clock.now == pytest.approx(0.5)
+    assert len(clock.sleeps) == 10
+
+    # Idle time refills the bucket, but never beyond the burst
+    clock.now += 10
+    asyncio.run(acquire_all(limiter, 5))
+    assert clock.now == pytest.approx(10.5) and limiter._tokens == pytest.approx(0)
+
+def test_client_holds_requests_to_the_host_rate_limit(start_server, monkeypatch):
+    limiters = []
+
+    class RecordingRateLimiter(RateLimiter):
+        def __init__(self, rate, burst=None):
+            super().__init__(rate, burst)
+            self.acquired = 0
+            limiters.append(self)
+
+        async def acquire(self):
+            self.acquired += 1
+            await super().acquire()
+
+    monkeypatch.setattr(async_ingestion, "RateLimiter", RecordingRateLimiter)
+    server = start_server()
+    results = fetch_all(server, [(symbol, "Income Statement") for symbol in SYMBOLS[:8]],
+                        rate_limits={"127.0.0.1": 4})
+
+    # Every request waits on the one limiter for the host, at the configured rate
+    assert len(results) == 8
+    assert [(limiter.rate, limiter.burst, limiter.acquired) for limiter in limiters] == [(4, 4, 8)]
+
+def test_retries_transient_failures(start_server):
+    server = start_server(fail_every=3, fail_status=429)
+    results = fetch_all(server, [(symbol, "Income Statement") for symbol in SYMBOLS[:6]])
+
+    assert all(error is None for _, _, _, error, _ in results)
+    assert server.requests_served[429] >= 2
+
+@pytest.mark.parametrize("read_size", [1, 3, 7, 64])
+def test_decodes_responses_split_into_small_reads(start_server, read_size):
+    server = start_server()
+    expected = {}
+    for data_type, url in [("Income Statement", f"{server.base_url}/income-statement/AAPL?apikey=test"),
+                           ("Historical Prices", f"{server.base_url}/historical-price-full/AAPL?timeseries=30&apikey=test")]:
+        body = json.loads(requests.get(url, timeout=10).content)
+        expected[data_type] = body if data_type == "Income Statement" else [
+            {"date": day["date"], "value": day["close"], "description": "AAPL"} for day in body["historical"]]
+
+    async def fetch(data_type):
+        async with AsyncIngestionClient(base_url=server.base_url, api_key="test", rate_limits={},
+                                        read_size=read_size) as client:
+            return await client.fetch("AAPL", data_type, num_records=30)
+
+    for data_type, records in expected.items():
+        assert asyncio.run(fetch(data_type)) == records
+
+def test_falls_back_to_mock_data_on_fmp_error_messages(start_server):
+    # FMP reports an exhausted quota as HTTP 200 with an error object
+    server = start_server(error_every=1)
+    fallback_records = [{"date": "2025-06-27", "value": 1.0, "description": "AAPL"}]
+    results = fetch_all(server, [("AAPL", "Income Statement"), ("AAPL", "Historical Prices")],
+                        fallback=lambda symbol, data_type, num_records: fallback_records)
+
+    records = {data_type: records for _, data_type, records, error, _ in results if error is None}
+    assert len(records["Income Statement"]) == 5
+    assert all(statement["symbol"] == "AAPL" for statement in records["Income Statement"])
+    assert records["Historical Prices"] == fallback_records
+    assert server.requests_served == {200: 2}
@@ -0,0 +1,40 @@
+import pytest
+from database_manager import DatabaseManager
+
+def test_schema_is_initialized_once_per_database(tmp_path, monkeypatch):
+    monkeypatch.setattr(DatabaseManager, "_initialized_paths", set())
+    calls = []
+    init_database = DatabaseManager.init_database
+
+    def counting_init_database(self):
+        calls.append(self.db_path)
+        init_database(self)
+
+    monkeypatch.setattr(DatabaseManager, "init_database", counting_init_database)
+
+    first, second = tmp_path / "first", tmp_path / "second"
+    first.mkdir()
+    second.mkdir()
+    monkeypatch.chdir(first)
+    DatabaseManager()
+    DatabaseManager(str(first / "feedback.db"))
+    assert len(calls) == 1
+
+    # The same relative path in another directory is another database
+    monkeypatch.chdir(second)
+    manager = DatabaseManager()
+    assert len(calls) == 2
+    assert len(manager.get_strategic_goals()) == 5
+
+def test_sessions_share_one_database_manager(tmp_path, monkeypatch):
+    pytest.importorskip("streamlit")
+    pytest.importorskip("textblob")
+    monkeypatch.chdir(tmp_path)
+    import feedback_app
+
+    feedback_app.get_db_manager.clear()
+    try:
+        assert feedback_app.get_db_manager() is feedback_app.get_db_manager()
+        assert feedback_app.get_feedback_processor() is feedback_app.get_feedback_processor()
+    finally:
+        feedback_app.get_db_manager.clear()
@@ -0,0 +1,56 @@
+import datetime
+import pytest
+from date_parser import DATE_FORMATS, DEFAULT_DATE, parse_date, parse_date_column
+
+def parse_date_strptime(value):
+    # The original try-each-format parser the regex dispatch must agree with
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(value, fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    return None
+
+@pytest.mark.parametrize("value, expected", [
+    ("11/28/2024", "2024-11-28"),
+    ("1/5/2025", "2025-01-05"),
+    ("2025-06-09", "2025-06-09"),
+    ("2025-6-9", "2025-06-09"),
+    ("16-Jan-2025", "2025-01-16"),
+    ("16-jan-2025", "2025-01-16"),
+    ("Jun 09, 2025", "2025-06-09"),
+    ("Jun 9, 2025", "2025-06-09"),
+    ("02/29/2024", "2024-02-29"),
+    ("02/29/2025", None),
+    ("13/01/2025", None),
+    ("16-Foo-2025", None),
+    ("2025/06/09", None),
+    ("June 9, 2025", None),
+    ("", None),
+    ("not a date", None)
+])
+def test_parse_date(value, expected):
+    assert parse_date(value) == expected
+
+def test_parse_date_agrees_with_strptime():
+    day = datetime.date(1999, 12, 25)
+    samples = []
+    for _ in range(400):
+        day += datetime.timedelta(days=37)
+        samples += [day.strftime(fmt) for fmt in DATE_FORMATS]
+        samples += [f"{day.month}/{day.day}/{day.year}", f"{day:%b} {day.day:>2}, {day.year}", f"{day:%d-%B-%Y}"]
+    samples += ["00/10/2025", "10/00/2025", "0999-01-01", " 2025-01-01", "2025-01-01 "]
+
+    for value in samples:
+        assert parse_date(value) == parse_date_strptime(value), value
+
+def test_parse_date_rejects_non_strings():
+    with pytest.raises(TypeError):
+        parse_date(20250609)
+
+def test_parse_date_column():
+    dates = ["Jun 09, 2025", "bad", None, 20250609, "Jun 09, 2025", float("nan")]
+    assert parse_date_column(dates).tolist() == ["2025-06-09", DEFAULT_DATE, DEFAULT_DATE, DEFAULT_DATE,
+                                                 "2025-06-09", DEFAULT_DATE]
+    assert parse_date_column(dates, default=None).tolist() == ["2025-06-09", None, None, None, "2025-06-09", None]
+    assert parse_date_column([]).tolist() == []
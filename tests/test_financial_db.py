@@ -0,0 +1,54 @@
+import sqlite3
+from financial_db import connect, get_row_count, init_schema
+from standardization_service import UPSERT_STANDARDIZED_SQL
+
+def test_symbol_backfill_only_takes_ticker_descriptions(tmp_path):
+    db_path = str(tmp_path / "data.db")
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE standardized_financial_data (id TEXT PRIMARY KEY, date TEXT, value REAL, "
+                     "description TEXT, data_type TEXT)")
+        conn.executemany("INSERT INTO standardized_financial_data VALUES (?, '2025-06-27', 1.0, ?, 'Income Statement')",
+                         [("1", " MSFT "), ("2", "Revenue"), ("3", "Net Income"), ("4", "BRK.B"), ("5", None)])
+
+    init_schema(db_path, force=True)
+
+    with sqlite3.connect(db_path) as conn:
+        symbols = conn.execute("SELECT id, symbol FROM standardized_financial_data ORDER BY id").fetchall()
+        registered = conn.execute("SELECT symbol FROM financial_symbols ORDER BY symbol").fetchall()
+    assert symbols == [("1", "MSFT"), ("2", None), ("3", None), ("4", "BRK.B"), ("5", None)]
+    assert registered == [("BRK.B",), ("MSFT",)]
+
+def test_schema_is_created_for_a_relative_path_in_each_directory(tmp_path, monkeypatch):
+    for directory in ["first", "second"]:
+        (tmp_path / directory).mkdir()
+        monkeypatch.chdir(tmp_path / directory)
+        init_schema("data.db")
+
+        with sqlite3.connect("data.db") as conn:
+            assert conn.execute("SELECT COUNT(*) FROM table_stats").fetchone() == (1,)
+
+def test_table_stats_triggers_track_the_row_count(tmp_path):
+    db_path = str(tmp_path / "data.db")
+    init_schema(db_path)
+    conn = connect(db_path)
+
+    def counts():
+        return get_row_count(conn), conn.execute("SELECT COUNT(*) FROM standardized_financial_data").fetchone()[0]
+
+    with conn:
+        conn.executemany("INSERT INTO standardized_financial_data (id, value) VALUES (?, 1.0)",
+                         [(str(i),) for i in range(5)])
+    assert counts() == (5, 5)
+
+    with conn:
+        conn.execute(UPSERT_STANDARDIZED_SQL, ("1", "2025-06-02", 2.0, "AAPL", "Historical Prices", "AAPL", "x"))
+        conn.execute("INSERT OR REPLACE INTO standardized_financial_data (id, value) VALUES ('2', 3.0)")
+        conn.execute("DELETE FROM standardized_financial_data WHERE id IN ('3', '4')")
+    assert counts() == (3, 3)
+    conn.close()
+
+    # Seeded from the table only once, when the stats table is created
+    init_schema(db_path, force=True)
+    conn = connect(db_path)
+    assert counts() == (3, 3)
+    conn.close()
@@ -0,0 +1,97 @@
+import os
+import pytest
+import requests
+import ingestion_service
+from http_client import HttpClient
+
+PATH = "income-statement/AAPL"
+PARAMS = {"period": "annual", "apikey": "test"}
+
+def make_client(server, tmp_path, retries: int = 3) -> HttpClient:
+    return HttpClient(base_url=server.base_url, cache_dir=str(tmp_path / "cache"), retries=retries,
+                      backoff_factor=0.01)
+
+def cache_files(client: HttpClient) -> list:
+    if not os.path.isdir(client.cache_dir):
+        return []
+    return [name for name in os.listdir(client.cache_dir) if name.endswith(".json")]
+
+@pytest.mark.parametrize("fail_status", [429, 500, 503])
+def test_retries_injected_failures(start_server, tmp_path, fail_status):
+    # Every other request fails, so each call needs exactly one retry
+    server = start_server(fail_every=2, fail_status=fail_status)
+    client = make_client(server, tmp_path)
+
+    assert client.get_json(PATH, params=PARAMS, ttl=0)
+    assert client.get_json(PATH, params={**PARAMS, "period": "quarter"}, ttl=0)
+
+    assert server.requests_served[fail_status] == 1
+    assert server.requests_served[200] == 2
+
+def test_gives_up_after_retries_without_caching(start_server, tmp_path):
+    server = start_server(fail_every=1, fail_status=503)
+    client = make_client(server, tmp_path, retries=2)
+
+    with pytest.raises(requests.HTTPError):
+        client.get_json(PATH, params=PARAMS)
+
+    assert server.requests_served == {503: 3}
+    assert cache_files(client) == []
+
+def test_serves_fresh_entries_from_cache(start_server, tmp_path):
+    server = start_server()
+    client = make_client(server, tmp_path)
+
+    first = client.get_json(PATH, params=PARAMS)
+    assert client.get_json(PATH, params=PARAMS) == first
+
+    assert server.requests_served == {200: 1}
+    assert (client.misses, client.hits) == (1, 1)
+
+def test_revalidates_stale_entries_with_304(start_server, tmp_path):
+    server = start_server()
+    client = make_client(server, tmp_path)
+    first = client.get_json(PATH, params=PARAMS, ttl=0)
+
+    # A new client (e.g. the next pipeline run) revalidates the entry left on disk
+    client = make_client(server, tmp_path)
+    assert client.get_json(PATH, params=PARAMS, ttl=0) == first
+
+    assert server.requests_served == {200: 1, 304: 1}
+    assert client.revalidated == 1
+
+def test_does_not_cache_http_errors(start_server, tmp_path):
+    server = start_server()
+    client = make_client(server, tmp_path)
+
+    with pytest.raises(requests.HTTPError):
+        client.get_json(PATH, params={"period": "annual"})  # no apikey: 401
+    with pytest.raises(requests.HTTPError):
+        client.get_json("unknown-endpoint/AAPL", params=PARAMS)  # 404
+
+    assert cache_files(client) == []
+
+def test_does_not_cache_fmp_error_messages(start_server, tmp_path):
+    # FMP reports an exhausted quota as HTTP 200 with an error object
+    server = start_server(error_every=1)
+    client = make_client(server, tmp_path)
+
+    assert "Error Message" in client.get_json(PATH, params=PARAMS)
+    assert cache_files(client) == []
+
+    server.error_every = 0
+    statements = client.get_json(PATH, params=PARAMS)
+    assert isinstance(statements, list) and statements
+    assert server.requests_served == {200: 2}
+
+def test_income_statement_falls_back_to_mock_data_on_fmp_error_messages(start_server, tmp_path, monkeypatch):
+    server = start_server(error_every=1)
+    client = make_client(server, tmp_path)
+    monkeypatch.setenv("FMP_API_KEY", "test")
+    monkeypatch.setattr(ingestion_service, "get_client", lambda: client)
+
+    statements = ingestion_service.fetch_income_statement_from_fmp("AAPL")
+
+    assert isinstance(statements, list) and len(statements) == 5
+    assert all(statement["symbol"] == "AAPL" for statement in statements)
+    assert server.requests_served == {200: 1}
@@ -0,0 +1,90 @@
+import os
+import sqlite3
+import threading
+import pytest
+import job_queue as job_queue_module
+from financial_db import connect
+from job_queue import PipelineJobQueue
+
+@pytest.fixture
+def make_queue(tmp_path):
+    # Queues sharing one database, standing in for separate gunicorn workers
+    db_path = str(tmp_path / "data.db")
+    queues = []
+
+    def make(run_func):
+        job_queue = PipelineJobQueue(run_func, db_path)
+        queues.append(job_queue)
+        return job_queue
+
+    yield make
+    for job_queue in queues:
+        job_queue.shutdown()
+
+def test_jobs_are_visible_and_deduplicated_across_queues(make_queue):
+    release = threading.Event()
+
+    def run(symbol, data_type):
+        release.wait(10)
+        return {"status": "SUCCESS", "symbol": symbol}
+
+    first, second = make_queue(run), make_queue(run)
+    job, deduplicated = first.submit("aapl ", "Income Statement")
+    assert not deduplicated and job["symbol"] == "AAPL"
+
+    # Another worker attaches to the in-flight job and can poll it
+    same_job, deduplicated = second.submit("AAPL", "Income Statement")
+    assert deduplicated and same_job["job_id"] == job["job_id"]
+    assert second.get(job["job_id"])["status"] in ("queued", "running")
+
+    release.set()
+    first.shutdown()
+    finished = second.get(job["job_id"])
+    assert finished["status"] == "succeeded"
+    assert finished["result"] == {"status": "SUCCESS", "symbol": "AAPL"}
+
+    # Once finished, the same request starts a new job
+    new_job, deduplicated = second.submit("AAPL", "Income Statement")
+    assert not deduplicated and new_job["job_id"] != job["job_id"]
+    assert [listed["job_id"] for listed in second.list_jobs()] == [new_job["job_id"], job["job_id"]]
+
+def test_jobs_of_exited_workers_are_failed(make_queue, tmp_path):
+    job_queue = make_queue(lambda symbol, data_type: {"status": "SUCCESS"})
+    with connect(str(tmp_path / "data.db")) as conn:
+        # PIDs are capped well below this, so no process has it
+        conn.execute("INSERT INTO pipeline_jobs (job_id, symbol, data_type, status, worker_pid) "
+                     "VALUES ('orphan', 'MSFT', 'Income Statement', 'running', 2147483647)")
+
+    assert job_queue.get("orphan")["status"] == "failed"
+    job, deduplicated = job_queue.submit("MSFT", "Income Statement")
+    assert not deduplicated and job["job_id"] != "orphan"
+
+def test_stale_jobs_with_this_process_pid_are_failed(make_queue, tmp_path):
+    # Left by an earlier process with the same PID, e.g. PID 1 in a restarted container
+    job_queue = make_queue(lambda symbol, data_type: {"status": "SUCCESS"})
+    with connect(str(tmp_path / "data.db")) as conn:
+        conn.execute("INSERT INTO pipeline_jobs (job_id, symbol, data_type, status, worker_pid) "
+                     "VALUES ('stale', 'MSFT', 'Income Statement', 'running', ?)", (os.getpid(),))
+
+    job, deduplicated = job_queue.submit("MSFT", "Income Statement")
+    assert not deduplicated and job["job_id"] != "stale"
+    assert job_queue.get("stale")["status"] == "failed"
+    job_queue.shutdown()
+    assert job_queue.get(job["job_id"])["status"] == "succeeded"
+
+@pytest.mark.parametrize("failing_status", ["running", "succeeded"])
+def test_jobs_end_failed_when_updates_fail(make_queue, monkeypatch, failing_status):
+    monkeypatch.setattr(job_queue_module, "FINISH_ATTEMPTS", 1)
+    job_queue = make_queue(lambda symbol, data_type: {"status": "SUCCESS"})
+    update = job_queue._update
+
+    def flaky_update(job_id, **fields):
+        if fields.get("status") == failing_status:
+            raise sqlite3.OperationalError("database is locked")
+        update(job_id, **fields)
+
+    monkeypatch.setattr(job_queue, "_update", flaky_update)
+    job, _ = job_queue.submit("AAPL", "Income Statement")
+    job_queue.shutdown()
+
+    assert job_queue.get(job["job_id"])["status"] == "failed"
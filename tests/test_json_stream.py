@@ -0,0 +1,60 @@
+import json
+import pytest
+from json_stream import JsonArrayDecoder, iter_json_array, iter_json_file
+
+DOCUMENTS = [
+    b'[456.7]',
+    b'[1.5e3]',
+    b'[1.5E+3, -2.25e-2, 0, -7]',
+    b'[-0.5, 12345678901234567890, 3.0]',
+    b'[true, false, null, "a.b", 1]',
+    b' [ {"value": 189.84, "nested": [1.5e3, 2]} , 394328000000 , "x" ] ',
+    '["café", 1.25, "€"]'.encode("utf-8"),
+    b'[]'
+]
+
+def split_every_offset(document: bytes):
+    for offset in range(len(document) + 1):
+        yield [document[:offset], document[offset:]]
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+def test_two_chunks_split_at_every_offset(document):
+    expected = json.loads(document)
+    for chunks in split_every_offset(document):
+        assert list(iter_json_array(chunks)) == expected, chunks
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+def test_one_byte_chunks(document):
+    chunks = [document[i:i + 1] for i in range(len(document))]
+    assert list(iter_json_array(chunks)) == json.loads(document)
+
+def test_keyed_array_split_at_every_offset():
+    document = b'{"symbol": "AAPL", "historical": [{"close": 189.84}, 1.5e3, 456.7], "count": 2.5e1}'
+    for chunks in split_every_offset(document):
+        decoder = JsonArrayDecoder("historical")
+        elements = []
+        for chunk in chunks:
+            elements.extend(decoder.feed(chunk))
+        elements.extend(decoder.close())
+        assert elements == [{"close": 189.84}, 1500.0, 456.7], chunks
+        assert decoder.extra == {"symbol": "AAPL", "count": 25.0}
+
+def test_number_is_not_emitted_until_it_is_complete():
+    decoder = JsonArrayDecoder()
+    assert decoder.feed(b'[456.') == []
+    assert decoder.feed(b'7') == []
+    assert decoder.feed(b', 1') == [456.7]
+    assert decoder.feed(b'e2]') == [100.0]
+    assert decoder.close() == []
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7])
+def test_iter_json_file_small_chunks(tmp_path, chunk_size):
+    records = [{"date": "2024-01-02", "value": 189.84}, 456.7, 1.5e3, -2.25e-2]
+    path = tmp_path / "raw.json"
+    path.write_text(json.dumps(records))
+    assert list(iter_json_file(str(path), chunk_size=chunk_size)) == records
+
+@pytest.mark.parametrize("document", [b'[1, 2', b'[1,, 2]', b'[456.7.1]', b'[1] 2'])
+def test_invalid_documents_raise(document):
+    with pytest.raises(ValueError):
+        list(iter_json_array([document]))
@@ -0,0 +1,56 @@
+import json
+import sqlite3
+import pytest
+import main_pipeline
+import raw_archive
+import standardization_service
+from raw_archive import get_archive
+
+def test_run_pipeline_hands_raw_records_to_standardization_in_memory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    read_back = lambda *args, **kwargs: pytest.fail("raw records were read back from disk")
+    monkeypatch.setattr(standardization_service, "load_raw_data", read_back)
+    monkeypatch.setattr(standardization_service, "iter_raw_data", read_back)
+    monkeypatch.setattr(raw_archive.RawArchive, "iter_segment", read_back)
+
+    result = main_pipeline.run_pipeline(num_records=50, symbol="MSFT", chunk_size=20)
+
+    assert result["status"] == "SUCCESS" and result["records_processed"] == 50
+    assert result["stages"]["standardize"]["records_out"] == 50
+    with sqlite3.connect(tmp_path / "data.db") as conn:
+        assert conn.execute("SELECT COUNT(*) FROM standardized_financial_data WHERE symbol = 'MSFT'").fetchone() == (50,)
+    # The raw records were still archived on their way through
+    assert get_archive().latest("MSFT")["records"] == 50
+
+def test_batch_with_a_failing_symbol_logs_one_partial_run(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    ingest_data = main_pipeline.ingest_data
+
+    def flaky_ingest_data(symbol, data_type, num_records=100):
+        if symbol == "BAD":
+            raise ConnectionError("symbol not found")
+        return ingest_data(symbol, data_type, num_records)
+
+    monkeypatch.setattr(main_pipeline, "ingest_data", flaky_ingest_data)
+    db_path = str(tmp_path / "data.db")
+
+    result = main_pipeline.run_batch_pipeline(["AAPL", "BAD", "MSFT"], ["Historical Prices", "Revenue"], num_records=20,
+                                              standardize_workers=2, db_path=db_path, save_raw=False)
+
+    assert result["status"] == "PARTIAL"
+    with sqlite3.connect(db_path) as conn:
+        loaded = dict(conn.execute("SELECT symbol, COUNT(*) FROM standardized_financial_data GROUP BY symbol"))
+        runs = conn.execute("SELECT status, records_processed, run_type, error_count, details "
+                            "FROM pipeline_runs_history").fetchall()
+    assert loaded == {"AAPL": 40, "MSFT": 40}
+
+    assert len(runs) == 1
+    status, records_processed, run_type, error_count, details = runs[0]
+    assert (status, records_processed, run_type, error_count) == ("PARTIAL", 80, "batch", 2)
+    symbols = json.loads(details)["symbols"]
+    assert symbols["BAD"] == {data_type: {"error": "ingestion: symbol not found"}
+                              for data_type in ("Historical Prices", "Revenue")}
+    for symbol in ("AAPL", "MSFT"):
+        for entry in symbols[symbol].values():
+            assert "error" not in entry
+            assert entry["raw_records"] == entry["standardized_records"] == 20
@@ -0,0 +1,90 @@
+import os
+import threading
+import pytest
+import main_pipeline
+import pipeline_metrics
+from pipeline_metrics import PipelineMetrics, PipelineProfiler, StageMetrics
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_stage_seconds_exclude_waits_and_upstream_time():
+    ingest, standardize = StageMetrics("ingest"), StageMetrics("standardize")
+    ingest.seconds, ingest.records_out = 2.0, 100
+    standardize.seconds, standardize.wait_seconds, standardize.records_out = 5.0, 0.5, 100
+    standardize.upstream = ingest
+
+    assert standardize.busy_seconds == 2.5
+    stats = standardize.as_dict()
+    assert (stats["seconds"], stats["records_in"], stats["rows_per_second"]) == (2.5, 100, 40.0)
+
+    # Timer noise never makes a stage's own time negative
+    ingest.seconds = 6.0
+    assert standardize.busy_seconds == 0.0
+    assert standardize.as_dict()["rows_per_second"] is None
+
+def test_streaming_stage_timings(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(pipeline_metrics.time, "perf_counter", clock)
+    metrics = PipelineMetrics()
+
+    def ingest():
+        for i in range(4):
+            clock.now += 1.0
+            yield i
+
+    def standardize(records):
+        for record in records:
+            clock.now += 0.5
+            yield record
+
+    raw = metrics.iter_stage("ingest", ingest())
+    standardized = metrics.iter_stage("standardize", standardize(raw), upstream="ingest")
+    with metrics.stage("load") as load:
+        for _ in metrics.iter_input("load", standardized):
+            clock.now += 0.25
+            load.records_out += 1
+
+    stages = metrics.as_dict()
+    assert list(stages) == ["ingest", "standardize", "load"]
+    assert [stages[name]["seconds"] for name in stages] == [4.0, 2.0, 1.0]
+    assert stages["load"]["wait_seconds"] == 6.0
+    assert [(stages[name]["records_in"], stages[name]["records_out"]) for name in stages] == [(0, 4), (4, 4), (4, 4)]
+    assert stages["standardize"]["rows_per_second"] == 2.0
+    assert metrics.elapsed_seconds == 7.0
+
+def test_profiler_writes_reports_for_every_thread(tmp_path):
+    with PipelineProfiler("run", directory=str(tmp_path)) as profiler:
+        worker = threading.Thread(target=sorted, args=(range(1000),))
+        worker.start()
+        worker.join()
+
+    assert profiler.paths == [str(tmp_path / name) for name in ("run.prof", "run_cpu.txt", "run_memory.txt")]
+    assert (tmp_path / "run_cpu.txt").read_text().startswith("2 threads profiled")
+    assert (tmp_path / "run_memory.txt").read_text().startswith("Peak traced memory")
+
+def test_profiler_rejects_a_concurrent_profile(tmp_path):
+    with PipelineProfiler("first", directory=str(tmp_path)):
+        with pytest.raises(RuntimeError):
+            with PipelineProfiler("second", directory=str(tmp_path)):
+                pass
+
+    # Released once the first profile is written
+    with PipelineProfiler("third", directory=str(tmp_path)):
+        pass
+    assert sorted(os.listdir(tmp_path)) == ["first.prof", "first_cpu.txt", "first_memory.txt",
+                                            "third.prof", "third_cpu.txt", "third_memory.txt"]
+
+def test_profiled_pipeline_run_writes_profiles(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    result = main_pipeline.run_pipeline(num_records=20, symbol="MSFT", save_raw=False, profile=True)
+
+    assert result["status"] == "SUCCESS" and result["records_processed"] == 20
+    names = os.listdir(tmp_path / "profiles")
+    assert sorted(name.split("_MSFT_")[1] for name in names) == [
+        "historical_prices.prof", "historical_prices_cpu.txt", "historical_prices_memory.txt"]
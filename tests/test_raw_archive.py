@@ -0,0 +1,103 @@
+import gzip
+import os
+import pytest
+from raw_archive import HEAD_SAMPLE_SIZE, RawArchive, get_archive
+
+def make_records(count, start=0):
+    return [{"date": f"2025-06-{day % 28 + 1:02d}", "value": str(day), "description": "AAPL"}
+            for day in range(start, start + count)]
+
+@pytest.fixture
+def archive(tmp_path):
+    return RawArchive(str(tmp_path / "archive"))
+
+def test_segments_round_trip_as_compressed_ndjson(archive):
+    first, second = make_records(5), make_records(3, start=5)
+    archive.write_segment(first, "aapl", "Historical Prices", "20250601_090000")
+    entry = archive.write_segment(second, "AAPL", "Historical Prices", "20250602_090000")
+
+    assert entry["symbol"] == "AAPL" and entry["records"] == 3 and entry["runs"] == 1
+    with gzip.open(entry["path"], "rt") as f:
+        assert len(f.read().splitlines()) == 3
+    assert list(archive.iter_records("AAPL", "Historical Prices")) == first + second
+    assert list(archive.iter_records(since="20250602")) == second
+    assert list(archive.iter_records(until="20250601")) == first
+    assert archive.stats() == {"segments": 2, "records": 8, "runs": 2,
+                               "bytes": sum(s["bytes"] for s in archive.segments())}
+
+def test_stream_closed_early_archives_nothing(archive):
+    stream = archive.iter_write_segment(make_records(5), "AAPL", "Historical Prices", "20250601_090000")
+    assert next(stream)["value"] == "0"
+    stream.close()
+
+    assert archive.segments() == []
+    assert [name for _, _, names in os.walk(archive.root) for name in names if name.endswith(".tmp")] == []
+
+def test_compaction_merges_segments_in_run_order(archive):
+    runs = [make_records(2, start=2 * run) for run in range(3)]
+    for run, records in enumerate(runs):
+        archive.write_segment(records, "AAPL", "Historical Prices", f"2025060{run + 1}_090000")
+    old_paths = [segment["path"] for segment in archive.segments()]
+
+    assert archive.compact(period="month") == {"segments_merged": 3, "segments_written": 1}
+
+    [segment] = archive.segments()
+    assert (segment["first_timestamp"], segment["last_timestamp"], segment["runs"]) == (
+        "20250601_090000", "20250603_090000", 3)
+    assert list(archive.iter_records()) == runs[0] + runs[1] + runs[2]
+    assert not any(os.path.exists(path) for path in old_paths)
+
+def test_get_archive_follows_the_working_directory(tmp_path, monkeypatch):
+    for directory in ["first", "second"]:
+        (tmp_path / directory).mkdir()
+        monkeypatch.chdir(tmp_path / directory)
+        get_archive().write_segment(make_records(1), "AAPL", "Historical Prices")
+
+        assert get_archive().stats()["segments"] == 1
+
+def test_latest_run_is_indexed_with_its_head(archive, monkeypatch):
+    archive.write_segment(make_records(3), "AAPL", "Historical Prices", "20250601_090000")
+    newest = make_records(HEAD_SAMPLE_SIZE + 5, start=3)
+    archive.write_segment(newest, "AAPL", "Historical Prices", "20250602_090000")
+    archive.write_segment(make_records(2), "MSFT", "Revenue", "20250601_120000")
+    # Importing an older run doesn't displace the newest one
+    archive.write_segment(make_records(1), "AAPL", "Historical Prices", "20250501_090000")
+
+    latest = archive.latest()
+    assert (latest["symbol"], latest["timestamp"], latest["records"], latest["offset"]) == (
+        "AAPL", "20250602_090000", HEAD_SAMPLE_SIZE + 5, 0)
+    assert latest["head"] == newest[:HEAD_SAMPLE_SIZE]
+    assert archive.latest(data_type="Revenue")["symbol"] == "MSFT"
+    assert archive.latest("GOOG") is None
+    assert archive.sample(symbol="GOOG") == []
+
+    # Small samples come from the manifest alone; larger ones read just that run
+    with monkeypatch.context() as patch:
+        patch.setattr(archive, "iter_segment", lambda path: pytest.fail("opened a segment"))
+        assert archive.sample(3) == newest[:3]
+    assert archive.sample(HEAD_SAMPLE_SIZE + 2) == newest[:HEAD_SAMPLE_SIZE + 2]
+    assert archive.sample(100) == newest
+
+def test_latest_run_is_found_in_compacted_segments(archive):
+    runs = [make_records(HEAD_SAMPLE_SIZE + 2, start=run * 20) for run in range(3)]
+    for run, records in enumerate(runs):
+        archive.write_segment(records, "AAPL", "Historical Prices", f"2025060{run + 1}_090000")
+    archive.compact(period="all")
+
+    latest = archive.latest("AAPL")
+    assert latest["path"] == archive.segments()[0]["path"]
+    assert latest["offset"] == 2 * (HEAD_SAMPLE_SIZE + 2)
+    assert archive.sample(HEAD_SAMPLE_SIZE + 2) == runs[2]
+
+def test_latest_index_is_backfilled_for_older_manifests(archive):
+    records = make_records(4)
+    archive.write_segment(make_records(2), "AAPL", "Historical Prices", "20250601_090000")
+    archive.write_segment(records, "AAPL", "Historical Prices", "20250602_090000")
+    conn = archive._connect()
+    with conn:
+        conn.execute("DELETE FROM latest_segments")
+    conn.close()
+
+    reopened = RawArchive(archive.root)
+    assert reopened.latest()["timestamp"] == "20250602_090000"
+    assert reopened.sample(4) == records
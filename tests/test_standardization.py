@@ -0,0 +1,156 @@
+import sqlite3
+import pytest
+import main_pipeline
+import standardization_service
+from financial_db import connect, get_data_version, get_row_count
+from standardization_service import (apply_standardization_rules, iter_standardized_records, standardized_row,
+                                     standardize_records_frame, insert_standardized_frame,
+                                     load_standardized_data_to_db)
+
+def test_run_pipeline_keeps_rows_repeating_description_and_date(tmp_path, monkeypatch):
+    # Two prints on the same day, as in MSFT_historical_prices_20250628.json
+    records = [
+        {"date": "2025-06-27", "value": "495.94", "description": "MSFT"},
+        {"date": "2025-06-27", "value": "497.45", "description": "MSFT"},
+        {"date": "2025-06-26", "value": "497.41", "description": "MSFT"}
+    ]
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(main_pipeline, "iter_mock_financial_data",
+                        lambda num_records, category="Historical Prices": (dict(record) for record in records))
+
+    result = main_pipeline.run_pipeline(num_records=len(records), symbol="MSFT", save_raw=False)
+
+    assert result["status"] == "SUCCESS"
+    with sqlite3.connect(tmp_path / "data.db") as conn:
+        rows = conn.execute("SELECT date, value, symbol FROM standardized_financial_data ORDER BY value").fetchall()
+    assert rows == [("2025-06-27", 495.94, "MSFT"), ("2025-06-26", 497.41, "MSFT"), ("2025-06-27", 497.45, "MSFT")]
+
+def test_free_text_descriptions_are_not_stored_as_symbols():
+    records = apply_standardization_rules([
+        {"date": "2025-06-08", "value": "120.50", "description": "Travel expense"},
+        {"date": "2025-06-08", "value": "99.00", "description": "BRK.B"}
+    ], "Expenses")
+
+    assert [standardized_row(record)[5] for record in records] == [None, "BRK.B"]
+
+def test_pipeline_and_upload_paths_share_record_ids(tmp_path):
+    records = [
+        {"date": "2025-06-27", "value": "495.94", "description": "MSFT"},
+        {"date": "2025-06-27", "value": "497.45", "description": "MSFT"},
+        {"date": "06/26/2025", "value": "$497.41", "description": "MSFT"},
+        {"date": "not a date", "value": "1.5", "description": "MSFT"},
+        {"date": "also not a date", "value": "2.5", "description": "MSFT"}
+    ]
+    db_path = str(tmp_path / "data.db")
+
+    load_standardized_data_to_db(apply_standardization_rules([dict(record) for record in records]), db_path)
+    conn = connect(db_path)
+    assert get_row_count(conn) == len(records)
+
+    # Loading the same rows as an upload updates them in place
+    frame = standardize_records_frame(records, "Historical Prices", "msft")
+    assert frame["id"].is_unique
+    insert_standardized_frame(conn, frame)
+    assert get_row_count(conn) == len(records)
+    conn.close()
+
+def test_stream_tracks_repeats_per_chunk(monkeypatch):
+    monkeypatch.setattr(standardization_service, "STANDARDIZE_CHUNK_SIZE", 10)
+    records = [{"date": "2025-06-27", "value": str(i), "description": "MSFT"} for i in range(35)]
+
+    ids = [record["id"] for record in iter_standardized_records(records)]
+
+    # Occurrences restart with each chunk, so no state outlives it
+    assert ids[:10] == ids[10:20] == ids[20:30]
+    assert ids[30:] == ids[:5]
+    assert len(set(ids[:10])) == 10
+
+@pytest.mark.parametrize("staging", [False, True])
+def test_incremental_loads_skip_unchanged_records(tmp_path, staging):
+    db_path = str(tmp_path / "data.db")
+    records = [{"date": f"2025-06-{day:02d}", "value": str(day), "description": "MSFT"} for day in range(1, 11)]
+
+    def load(records):
+        standardized = apply_standardization_rules([dict(record) for record in records])
+        return load_standardized_data_to_db(standardized, db_path, chunk_size=4, staging=staging, incremental=True)
+
+    assert load(records) == 10
+    version = get_data_version(db_path)
+
+    # Nothing changed: nothing is written, so cached chart responses stay valid
+    assert load(records) == 10
+    assert get_data_version(db_path) == version
+
+    # One changed value is rewritten in place
+    records[3]["value"] = "400"
+    load(records)
+    assert get_data_version(db_path) != version
+    conn = connect(db_path)
+    assert get_row_count(conn) == 10
+    assert conn.execute("SELECT value FROM standardized_financial_data WHERE date = '2025-06-04'").fetchone() == (400.0,)
+    hashes = conn.execute("SELECT COUNT(*) FROM standardized_financial_data WHERE content_hash IS NOT NULL").fetchone()
+    assert hashes == (10,)
+    conn.close()
+
+def price_records(count):
+    return apply_standardization_rules([{"date": f"2025-06-{day:02d}", "value": str(day), "description": "MSFT"}
+                                        for day in range(1, count + 1)])
+
+@pytest.mark.parametrize("staging", [False, True])
+@pytest.mark.parametrize("incremental", [False, True])
+def test_failed_chunk_rolls_back_only_that_chunk(tmp_path, staging, incremental):
+    db_path = str(tmp_path / "data.db")
+
+    def load(records):
+        return load_standardized_data_to_db(records, db_path, chunk_size=4, staging=staging, incremental=incremental)
+
+    # A value SQLite can't bind fails the first chunk: nothing is committed or invalidated
+    records = price_records(10)
+    records[1]["value"] = ["not", "a", "number"]
+    with pytest.raises(sqlite3.Error):
+        load(records)
+    conn = connect(db_path)
+    assert get_row_count(conn) == 0
+    assert get_data_version(db_path) == "0"
+
+    # Failing the second chunk keeps the first one, and bumps the version for it
+    records = price_records(10)
+    records[6]["value"] = ["not", "a", "number"]
+    with pytest.raises(sqlite3.Error):
+        load(records)
+    assert get_row_count(conn) == 4
+    assert conn.execute("SELECT MAX(date) FROM standardized_financial_data").fetchone() == ("2025-06-04",)
+    assert get_data_version(db_path) != "0"
+    conn.close()
+
+@pytest.mark.parametrize("staging", [False, True])
+@pytest.mark.parametrize("incremental", [False, True])
+def test_stream_failing_mid_load_keeps_committed_chunks(tmp_path, staging, incremental):
+    db_path = str(tmp_path / "data.db")
+
+    def stream(count, fail_after=None):
+        for i, record in enumerate(price_records(count)):
+            if i == fail_after:
+                raise ConnectionError("source went away")
+            yield record
+
+    load_standardized_data_to_db(stream(4), db_path, chunk_size=4, staging=staging, incremental=incremental)
+    version = get_data_version(db_path)
+
+    # Chunks before the failure are committed; the partial chunk being read is not
+    with pytest.raises(ConnectionError):
+        load_standardized_data_to_db(stream(10, fail_after=9), db_path, chunk_size=4, staging=staging,
+                                     incremental=incremental)
+    conn = connect(db_path)
+    assert get_row_count(conn) == 8
+    assert get_data_version(db_path) != version
+    version = get_data_version(db_path)
+
+    # A stream that fails before anything new is committed leaves cached responses valid
+    # when the load is incremental (the unchanged first chunk writes nothing)
+    with pytest.raises(ConnectionError):
+        load_standardized_data_to_db(stream(10, fail_after=6), db_path, chunk_size=4, staging=staging,
+                                     incremental=incremental)
+    assert get_row_count(conn) == 8
+    assert (get_data_version(db_path) == version) is incremental
+    conn.close()
@@ -0,0 +1,58 @@
+import math
+import numpy as np
+import pytest
+from value_parser import parse_value, parse_value_column
+
+@pytest.mark.parametrize("value, expected", [
+    ("1234.56", 1234.56),
+    ("$1,234.56", 1234.56),
+    ("-2,500", -2500.0),
+    ("$-12.50", -12.5),
+    ("+7", 7.0),
+    ("(1,234.56)", -1234.56),
+    ("($300)", -300.0),
+    ("(-5)", -5.0),
+    ("1.2M", 1.2e6),
+    ("$3.5b", 3.5e9),
+    ("2k", 2000.0),
+    ("1T", 1e12),
+    ("1.5e3", 1500.0),
+    ("2E-2", 0.02),
+    (".5", 0.5),
+    ("5.", 5.0),
+    ("12%", 12.0),
+    ("USD 1,000", 1000.0),
+    ("€1.234", 1.234),
+    ("−42", -42.0),
+    ("  1 000  ", 1000.0),
+    (42, 42.0),
+    (np.float32(1.5), 1.5),
+    ("", None),
+    ("n/a", None),
+    ("nan", None),
+    ("inf", None),
+    ("1.2.3", None),
+    ("12X", None),
+    ("((1))", None),
+    (None, None),
+    (True, None)
+])
+def test_parse_value(value, expected):
+    assert parse_value(value) == expected
+
+def test_parse_value_column_agrees_with_parse_value():
+    values = ["1234.56", "$1,234.56", "-2,500", "(1,234.56)", "1.2M", "1.5e3", "USD 1,000", "€1.234", "−42",
+              "  7 ", "12%", "", "n/a", "1.2.3", "(5", "5)", "+", "-.5", "0.1", "123456789012345",
+              "1234567890123456789", "9" * 40, "$" + "1" * 31 + "K", "  (  250  )  ", "(-5)", "3b", "1_000",
+              42, -1.5, np.int64(7), None, True, float("nan")]
+
+    for default in (0.0, None):
+        expected = [parse_value(value) for value in values]
+        expected = [default if value is None or math.isnan(value) else value for value in expected]
+        parsed = parse_value_column(values, default=default).tolist()
+        assert [None if isinstance(value, float) and math.isnan(value) else value for value in parsed] == expected
+
+def test_parse_value_column_uniform_columns():
+    assert parse_value_column(["1", "2,000", "(3)"]).tolist() == [1.0, 2000.0, -3.0]
+    assert parse_value_column([1, 2.5]).tolist() == [1.0, 2.5]
+    assert parse_value_column([]).tolist() == []
@@ -0,0 +1,224 @@
+import re
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+# Magnitude suffixes accepted after a number, e.g. "1.2M" or "$3.5b"
+MAGNITUDE_SUFFIXES = {"K": 1e3, "M": 1e6, "B": 1e9, "T": 1e12}
+
+# Characters that never change a value: thousands separators, whitespace, percent signs
+# and currency symbols/codes
+_NOISE_PATTERN = r"[,\s_%$€£¥₹]|USD|EUR|GBP|JPY"
+
+# Optional sign, the number itself, optional exponent and optional magnitude suffix
+_NUMBER_PATTERN = r"([-+−]?)([0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE]([-+]?[0-9]+))?([KMBTkmbt]?)"
+
+# Accounting-style negatives: the whole value wrapped in parentheses
+_PARENTHESES_PATTERN = r"\((.*)\)"
+
+_NOISE = re.compile(_NOISE_PATTERN, re.IGNORECASE)
+_NUMBER = re.compile(_NUMBER_PATTERN)
+_PARENTHESES = re.compile(_PARENTHESES_PATTERN, re.DOTALL)
+
+# Deleted by the scalar fast path before trying float() directly
+_FAST_PATH_TABLE = str.maketrans({",": None, "_": None, "%": None, "$": None, " ": None, "\t": None})
+
+# Character classes for the column fast path, indexed by code point (128 = any non-ASCII).
+# Whitespace matches str.strip/\s for ASCII, and classes up to _CHAR_NOISE are dropped
+# when cleaning a string; strings with anything non-ASCII or a currency code are left for
+# the scalar path.
+_CHAR_NUL, _CHAR_WHITESPACE, _CHAR_NOISE, _CHAR_DIGIT, _CHAR_DOT, _CHAR_SIGN, _CHAR_OPEN, _CHAR_CLOSE, _CHAR_SUFFIX, _CHAR_OTHER, _CHAR_NON_ASCII = range(11)
+_CHARACTER_CLASSES = np.full(129, _CHAR_OTHER, dtype=np.int8)
+_CHARACTER_CLASSES[0] = _CHAR_NUL
+_CHARACTER_CLASSES[ord("0"):ord("9") + 1] = _CHAR_DIGIT
+_CHARACTER_CLASSES[ord(".")] = _CHAR_DOT
+_CHARACTER_CLASSES[[ord("+"), ord("-")]] = _CHAR_SIGN
+_CHARACTER_CLASSES[[9, 10, 11, 12, 13, 28, 29, 30, 31, 32]] = _CHAR_WHITESPACE
+_CHARACTER_CLASSES[[ord(c) for c in ",_%$"]] = _CHAR_NOISE
+_CHARACTER_CLASSES[ord("(")] = _CHAR_OPEN
+_CHARACTER_CLASSES[ord(")")] = _CHAR_CLOSE
+_CHARACTER_CLASSES[128] = _CHAR_NON_ASCII
+
+_SUFFIX_SCALE = np.ones(129)
+for _suffix, _factor in MAGNITUDE_SUFFIXES.items():
+    _CHARACTER_CLASSES[[ord(_suffix), ord(_suffix.lower())]] = _CHAR_SUFFIX
+    _SUFFIX_SCALE[[ord(_suffix), ord(_suffix.lower())]] = _factor
+
+# Classes allowed in a number once its sign and suffix are removed
+_NUMBER_BODY_CLASSES = np.zeros(11, dtype=bool)
+_NUMBER_BODY_CLASSES[[_CHAR_NUL, _CHAR_DIGIT, _CHAR_DOT]] = True
+
+_POWERS_OF_TEN = 10.0 ** np.arange(23)
+
+# Longer strings skip the NumPy path so one stray value can't blow up the fixed-width array
+_COLUMN_MAX_LENGTH = 32
+
+def parse_value(value) -> Optional[float]:
+    """
+    Parse a raw financial value to a float.
+
+    Handles currency symbols and codes, thousands separators, leading signs (including
+    after the currency symbol, e.g. "$-12.50"), parentheses negatives ("(1,234.56)"),
+    exponents and K/M/B/T magnitude suffixes ("1.2M"). Numbers are returned as floats.
+
+    Args:
+        value: Raw value, e.g. "$1,234.56", "-2,500", "(300)" or "4.5B"
+
+    Returns:
+        Parsed float, or None if the value isn't a number
+    """
+    if _is_number(value):
+        return float(value)
+    if not isinstance(value, str):
+        return None
+
+    # Fast path: plain numbers, "$1,234.56", "-2,500", "1.2M" and the like
+    if value.isascii():
+        text = value.translate(_FAST_PATH_TABLE)
+        scale = MAGNITUDE_SUFFIXES.get(text[-1:].upper(), 1.0)
+        try:
+            result = float(text[:-1] if scale != 1.0 else text)
+            if result - result == 0:  # rejects "nan" and "inf", which aren't values here
+                return result * scale
+        except ValueError:
+            pass
+
+    return _parse_value_text(value)
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, (bool, np.bool_))
+
+def _parse_value_text(value: str) -> Optional[float]:
+    text = value.strip()
+    match = _PARENTHESES.fullmatch(text)
+    negative = match is not None
+    if negative:
+        text = match[1]
+
+    match = _NUMBER.fullmatch(_NOISE.sub("", text))
+    if match is None:
+        return None
+
+    sign, number, exponent, suffix = match.groups()
+    result = float(f"{number}e{exponent}" if exponent else number)
+    if suffix:
+        result *= MAGNITUDE_SUFFIXES[suffix.upper()]
+
+    if negative:
+        return -abs(result)
+    return -result if sign in ("-", "−") else result
+
+def parse_value_column(values, default: Optional[float] = 0.0) -> pd.Series:
+    """
+    Parse a whole column of raw financial values to floats.
+
+    Vectorized equivalent of parse_value. Strings are classified, cleaned and converted
+    as a NumPy array of code points; the few that need the full grammar (exponents,
+    currency codes, non-ASCII text, more than 15 digits) are handed to parse_value, so
+    both modes always agree.
+
+    Args:
+        values: Sequence or Series of raw values
+        default: Value used where parsing fails (None leaves NaN)
+
+    Returns:
+        Series of floats
+    """
+    values = pd.Series(values, dtype=object)
+    result = np.full(len(values), np.nan)
+
+    raw = values.to_numpy()
+
+    # Classify values per element only when the column isn't uniformly typed
+    inferred = pd.api.types.infer_dtype(raw, skipna=False)
+    if inferred == "string":
+        kinds = np.ones(len(raw), dtype=np.int8)
+    elif inferred in ("floating", "integer", "mixed-integer-float"):
+        kinds = np.full(len(raw), 2, dtype=np.int8)
+    else:
+        kinds = values.map(lambda value: 1 if isinstance(value, str) else 2 if _is_number(value) else 0).to_numpy()
+
+    is_number = kinds == 2
+    result[is_number] = raw[is_number].astype(float)
+
+    text_positions = np.flatnonzero(kinds == 1)
+    text_values = raw[text_positions].tolist()
+    if text_values and max(map(len, text_values)) > _COLUMN_MAX_LENGTH:
+        lengths = np.fromiter(map(len, text_values), dtype=np.int64, count=len(text_values))
+        short = text_positions[lengths <= _COLUMN_MAX_LENGTH]
+        slow = [text_positions[lengths > _COLUMN_MAX_LENGTH]]
+        text_values = raw[short].tolist()
+    else:
+        short = text_positions
+        slow = []
+
+    if len(short):
+        parsed, ok = _parse_text_array(np.array(text_values, dtype=str))
+        result[short[ok]] = parsed[ok]
+        slow.append(short[~ok])
+
+    slow = np.concatenate(slow) if slow else slow
+    if len(slow):
+        result[slow] = [np.nan if (value := parse_value(raw[i])) is None else value for i in slow]
+
+    result = pd.Series(result, index=values.index, dtype=float)
+    if default is not None:
+        result = result.fillna(default)
+    return result
+
+def _parse_text_array(text: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # Works on the code points of a fixed-width unicode array (one row per string,
+    # NUL-padded), classifying every character and parsing all rows at once. Returns
+    # (values, mask of entries parsed here); unmasked entries need the scalar grammar.
+    count, width = len(text), max(text.dtype.itemsize // 4, 1)
+    rows = np.arange(count)
+    code_points = np.minimum(np.ascontiguousarray(text).view(np.uint32).reshape(count, width), 128).astype(np.uint8)
+    classes = _CHARACTER_CLASSES[code_points]
+
+    # Accounting negatives: "(" and ")" are the first and last characters after
+    # stripping whitespace, and appear nowhere else
+    content = classes > _CHAR_WHITESPACE
+    first = content.argmax(axis=1)
+    last = width - 1 - content[:, ::-1].argmax(axis=1)
+    is_open, is_close = classes == _CHAR_OPEN, classes == _CHAR_CLOSE
+    negative = (content.any(axis=1) & is_open[rows, first] & is_close[rows, last]
+                & (is_open.sum(axis=1) == 1) & (is_close.sum(axis=1) == 1))
+
+    # Ignore whitespace/noise (and the parentheses of negatives) from here on
+    classes = np.where(classes > _CHAR_NOISE, classes, _CHAR_NUL)
+    classes[negative[:, None] & (is_open | is_close)] = _CHAR_NUL
+    kept = classes != _CHAR_NUL
+    first = kept.argmax(axis=1)
+    last = width - 1 - kept[:, ::-1].argmax(axis=1)
+
+    # Optional leading sign and trailing magnitude suffix
+    has_sign = classes[rows, first] == _CHAR_SIGN
+    minus = has_sign & (code_points[rows, first] == ord("-"))
+    classes[rows[has_sign], first[has_sign]] = _CHAR_NUL
+
+    has_suffix = classes[rows, last] == _CHAR_SUFFIX
+    scale = np.where(has_suffix, _SUFFIX_SCALE[code_points[rows, last]], 1.0)
+    classes[rows[has_suffix], last[has_suffix]] = _CHAR_NUL
+
+    # What's left must be digits with at most one "."; up to 15 digits the mantissa is
+    # an exact integer in float64, and dividing it by an exact power of ten rounds the
+    # same way float() does. Anything else goes to the scalar grammar.
+    is_digit = classes == _CHAR_DIGIT
+    is_dot = classes == _CHAR_DOT
+    digit_count = is_digit.sum(axis=1)
+    ok = (_NUMBER_BODY_CLASSES[classes].all(axis=1) & (digit_count > 0) & (digit_count <= 15)
+          & (is_dot.sum(axis=1) <= 1))
+
+    mantissa = np.zeros(count)
+    fraction_digits = np.zeros(count, dtype=np.int64)
+    seen_dot = np.zeros(count, dtype=bool)
+    for column in range(width):
+        digit = is_digit[:, column]
+        mantissa = np.where(digit, mantissa * 10 + (code_points[:, column] - ord("0")), mantissa)
+        seen_dot |= is_dot[:, column]
+        fraction_digits += digit & seen_dot
+
+    parsed = np.where(ok, mantissa / _POWERS_OF_TEN[np.minimum(fraction_digits, 22)], np.nan)
+    parsed = np.where(minus, -parsed, parsed) * scale
+    parsed = np.where(negative, -np.abs(parsed), parsed)
+    return parsed, ok
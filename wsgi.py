@@ -0,0 +1,5 @@
+from app import app
+
+# WSGI entry point, e.g. `gunicorn -c gunicorn.conf.py wsgi:app`
+if __name__ == "__main__":
+    app.run(threaded=True)